@@ -0,0 +1,289 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date as date_cls
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Columnar draw history (.lotc), generated from data/florida_*.json by
+# scripts/build_columnar.py. Layout, all little-endian:
+#
+#   header   "LOTC", u16 version, u16 reserved, u32 meta_len
+#   meta     JSON: game-level fields, draw count, column offsets and the
+#            size and SHA-1 of the JSON file it was built from
+#   dates    int32[n]       day ordinals
+#   times    uint8[n]       index into meta["draw_time_codes"]
+#   balls    uint8[n * k]   row-major, k = meta["balls_per_draw"]
+#   extras   uint8[n] each  optional per-draw balls (fireball, cashball);
+#                           255 marks a draw without the field
+#
+# Columns start on 8-byte boundaries so they can be cast in place.
+
+MAGIC = b"LOTC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+MISSING = 255
+EXTRA_FIELDS = ("fireball", "cashball")
+COLUMNAR_SUFFIX = ".lotc"
+# Meta keys that describe the file rather than the game
+LAYOUT_KEYS = ("draw_count", "balls_per_draw", "draw_time_codes", "extras", "columns", "source")
+
+
+class ColumnarFormatError(ValueError):
+    pass
+
+
+def columnar_path(json_path: str) -> str:
+    return os.path.splitext(json_path)[0] + COLUMNAR_SUFFIX
+
+
+def _file_sha1(json_path: str) -> str:
+    digest = hashlib.sha1()
+    with open(json_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_signature(json_path: str) -> dict:
+    """Size, mtime and SHA-1 of a JSON data file, recorded in the .lotc built from it."""
+    st = os.stat(json_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": _file_sha1(json_path)}
+
+
+def content_signature(content: bytes) -> dict:
+    """Size and SHA-1 of a data file whose bytes are already in memory."""
+    return {"size": len(content), "sha1": hashlib.sha1(content).hexdigest()}
+
+
+def _stamped(json_path: str, source: dict) -> dict:
+    # The writer just put the file in place: record its mtime alongside
+    return dict(source, mtime_ns=os.stat(json_path).st_mtime_ns)
+
+
+def same_content(a: Optional[dict], b: Optional[dict]) -> bool:
+    """Whether two signatures describe the same bytes, whatever their mtimes."""
+    return bool(a and b) and a.get("size") == b.get("size") and a.get("sha1") == b.get("sha1")
+
+
+def source_matches(source: Optional[dict], json_path: str) -> bool:
+    """
+    Whether `source`, a .lotc's recorded signature, still describes the JSON
+    file at `json_path`. The file is only hashed when its size matches but
+    its mtime differs from the recorded one (a fresh checkout, a touch).
+    """
+    if not source:
+        return False
+    st = os.stat(json_path)
+    if st.st_size != source.get("size"):
+        return False
+    if st.st_mtime_ns == source.get("mtime_ns"):
+        return True
+    return _file_sha1(json_path) == source.get("sha1")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _ball(value: str) -> int:
+    n = int(value)
+    if not 0 <= n < MISSING or str(n) != value:
+        raise ColumnarFormatError(f"Ball {value!r} does not round-trip as uint8")
+    return n
+
+
+def _encode_rows(draws: Sequence[dict], k: int, time_codes: List[str], extras: List[str]) -> Dict[str, bytes]:
+    """Column blobs for `draws`; draw times not in `time_codes` are appended to it."""
+    dates = array("i")
+    times = bytearray()
+    balls = bytearray()
+    extra_cols = {f: bytearray() for f in extras}
+    for draw in draws:
+        if len(draw["numbers"]) != k:
+            raise ColumnarFormatError(f"Draw {draw['date']} has {len(draw['numbers'])} balls, expected {k}")
+        dates.append(date_cls.fromisoformat(draw["date"]).toordinal())
+        draw_time = draw.get("draw_time", "evening")
+        if draw_time not in time_codes:
+            time_codes.append(draw_time)
+        times.append(time_codes.index(draw_time))
+        balls.extend(_ball(v) for v in draw["numbers"])
+        for f in extras:
+            extra_cols[f].append(_ball(draw[f]) if f in draw else MISSING)
+    if dates.itemsize != 4 or sys.byteorder != "little":
+        raise ColumnarFormatError("Columnar files are written as little-endian int32")
+    blobs = {"dates": dates.tobytes(), "times": bytes(times), "balls": bytes(balls)}
+    blobs.update((f, bytes(extra_cols[f])) for f in extras)
+    return blobs
+
+
+def _assemble(meta: dict, columns: List[Tuple[str, bytes]]) -> bytes:
+    # Offsets depend on the meta length, which depends on the offsets:
+    # reserve the final digits by iterating until the layout is stable.
+    offsets: Dict[str, int] = {name: 0 for name, _ in columns}
+    while True:
+        meta["columns"] = offsets
+        meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+        pos = _align(HEADER.size + len(meta_bytes))
+        new_offsets = {}
+        for name, blob in columns:
+            new_offsets[name] = pos
+            pos = _align(pos + len(blob))
+        if new_offsets == offsets:
+            break
+        offsets = new_offsets
+
+    out = bytearray(HEADER.pack(MAGIC, VERSION, 0, len(meta_bytes)))
+    out += meta_bytes
+    for name, blob in columns:
+        out += b"\0" * (offsets[name] - len(out))
+        out += blob
+    return bytes(out)
+
+
+def _column_names(extras: List[str]) -> List[str]:
+    return ["dates", "times", "balls"] + list(extras)
+
+
+def encode(data: dict, source: Optional[dict] = None) -> bytes:
+    """
+    Serialize a parsed data/florida_*.json document to the columnar format.
+    `source` is the JSON file's source_signature(); readers use it to tell
+    whether the JSON has changed since.
+    """
+    draws = data.get("draws", [])
+    k = len(draws[0]["numbers"]) if draws else 0
+    time_codes: List[str] = []
+    extras = [f for f in EXTRA_FIELDS if any(f in d for d in draws)]
+    blobs = _encode_rows(draws, k, time_codes, extras)
+
+    meta = {k_: v for k_, v in data.items() if k_ != "draws"}
+    meta.update({"draw_count": len(draws), "balls_per_draw": k, "draw_time_codes": time_codes, "extras": extras})
+    if source is not None:
+        meta["source"] = source
+    return _assemble(meta, [(name, blobs[name]) for name in _column_names(extras)])
+
+
+def _write_atomic(path: str, blob: bytes):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+
+def write(json_path: str, data: dict, source: Optional[dict] = None) -> int:
+    """
+    Build the .lotc next to a JSON data file from its parsed contents
+    (`data` must be what is on disk; `source` its signature, when the
+    caller already has it). Returns the size written.
+    """
+    blob = encode(data, _stamped(json_path, source) if source else source_signature(json_path))
+    _write_atomic(columnar_path(json_path), blob)
+    return len(blob)
+
+
+def prepend(json_path: str, rows: Sequence[dict], replaced: int, updates: dict,
+            old_source: dict, source: dict) -> bool:
+    """
+    Update a .lotc after draws were spliced into the head of its JSON file,
+    without re-reading the JSON: its first `replaced` draws become `rows`,
+    the rest of every column is copied through, and `updates` (e.g.
+    total_draws, last_updated) is applied to the game fields. Returns False,
+    leaving the file alone, when the .lotc was not built from `old_source`
+    or the rows need a different layout (a new extra column).
+    """
+    path = columnar_path(json_path)
+    if not os.path.exists(path):
+        return False
+    try:
+        draws = load(path)["draws"]
+    except (OSError, ValueError):
+        return False
+    meta = dict(draws.meta)
+    if not same_content(meta.get("source"), old_source) or not 0 <= replaced <= len(draws):
+        return False
+    k = meta["balls_per_draw"]
+    extras = meta["extras"]
+    if any(f in row and f not in extras for row in rows for f in EXTRA_FIELDS):
+        return False
+    time_codes = list(meta["draw_time_codes"])
+    try:
+        head = _encode_rows(rows, k, time_codes, extras)
+    except ColumnarFormatError:
+        return False
+
+    tails = {"dates": draws.ordinals[replaced:], "times": draws._times[replaced:],
+             "balls": draws._balls[replaced * k:]}
+    tails.update((f, column[replaced:]) for f, column in draws._extras)
+    columns = [(name, head[name] + tails[name].tobytes()) for name in _column_names(extras)]
+
+    meta.update(updates)
+    meta.update({"draw_count": len(draws) - replaced + len(rows), "draw_time_codes": time_codes,
+                 "source": _stamped(json_path, source)})
+    _write_atomic(path, _assemble(meta, columns))
+    return True
+
+
+class ColumnarDraws(Sequence):
+    """
+    Read-only draw list over a memory-mapped .lotc file. Items are built as
+    the same dicts the JSON files hold, only when accessed.
+    """
+
+    def __init__(self, buf, meta: dict):
+        self.meta = meta
+        n = meta["draw_count"]
+        self._n = n
+        self._k = meta["balls_per_draw"]
+        cols = meta["columns"]
+        view = memoryview(buf)
+        self.ordinals = view[cols["dates"]:cols["dates"] + 4 * n].cast("i")
+        self._times = view[cols["times"]:cols["times"] + n]
+        self._balls = view[cols["balls"]:cols["balls"] + n * self._k]
+        self._extras = [(f, view[cols[f]:cols[f] + n]) for f in meta["extras"]]
+        self._time_codes = meta["draw_time_codes"]
+
+    def __len__(self):
+        return self._n
+
+    def numbers(self, slot: int) -> List[int]:
+        start = slot * self._k
+        return list(self._balls[start:start + self._k])
+
+    def __getitem__(self, slot):
+        if isinstance(slot, slice):
+            return [self[i] for i in range(*slot.indices(self._n))]
+        if slot < 0:
+            slot += self._n
+        if not 0 <= slot < self._n:
+            raise IndexError(slot)
+        draw = {
+            "date": date_cls.fromordinal(self.ordinals[slot]).isoformat(),
+            "draw_time": self._time_codes[self._times[slot]],
+            "numbers": [str(n) for n in self.numbers(slot)],
+        }
+        for field, column in self._extras:
+            if column[slot] != MISSING:
+                draw[field] = str(column[slot])
+        return draw
+
+
+def load(path: str) -> dict:
+    """
+    Memory-map a .lotc file and return a data dict shaped like the JSON
+    document, with `draws` as a ColumnarDraws view. Pages are shared between
+    processes mapping the same file.
+    """
+    with open(path, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, _, meta_len = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION or sys.byteorder != "little":
+        buf.close()
+        raise ColumnarFormatError(f"{path}: not a version {VERSION} columnar file")
+    meta = json.loads(bytes(buf[HEADER.size:HEADER.size + meta_len]))
+    data = {k: v for k, v in meta.items() if k not in LAYOUT_KEYS}
+    data["draws"] = ColumnarDraws(buf, meta)
+    return data
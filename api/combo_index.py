@@ -0,0 +1,66 @@
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from api.ticket_check import draw_matrix, iter_bits
+
+
+class ComboIndex:
+    """
+    "Has this set ever been drawn?" for one game.
+
+    `combos` maps each draw's canonical (sorted) main-ball combination to
+    its slots, for O(1) exact lookups. `postings` holds, per (ball, k), a
+    bitset over the draw slots where that ball came up at least k times
+    (k > 1 only in digits games); intersecting the bitsets of the requested
+    balls and their counts gives every draw containing all of them. Slot 0
+    is the newest draw, so walking the set bits low to high returns matches
+    newest first.
+    """
+
+    def __init__(self, game):
+        matrix = draw_matrix(game)
+        self.rules = matrix.rules
+        self.specials = matrix.specials
+        self.combos: Dict[Tuple[int, ...], List[int]] = {}
+        size = (len(matrix.mains) + 7) // 8
+        ball_maps: Dict[Tuple[int, int], bytearray] = {}
+        special_maps: Dict[int, bytearray] = {}
+        for slot, balls in enumerate(matrix.mains):
+            self.combos.setdefault(tuple(sorted(balls)), []).append(slot)
+            byte, bit = slot >> 3, 1 << (slot & 7)
+            for n, count in Counter(balls).items():
+                for k in range(1, count + 1):
+                    ball_maps.setdefault((n, k), bytearray(size))[byte] |= bit
+            special = self.specials[slot]
+            if special is not None:
+                special_maps.setdefault(special, bytearray(size))[byte] |= bit
+        # Built as byte bitmaps, then converted once: OR-ing into Python
+        # ints per draw would copy the whole bitset every time
+        self.postings = {n: int.from_bytes(m, "little") for n, m in ball_maps.items()}
+        self.special_postings = {n: int.from_bytes(m, "little") for n, m in special_maps.items()}
+        self.all_slots = (1 << len(matrix.mains)) - 1
+
+    def exact(self, numbers: Sequence[int], special: Optional[int] = None) -> List[int]:
+        slots = self.combos.get(tuple(sorted(numbers)), [])
+        if special is not None:
+            slots = [s for s in slots if self.specials[s] == special]
+        return slots
+
+    def containing(self, numbers: Sequence[int], special: Optional[int] = None) -> int:
+        """
+        Bitset of the slots whose main balls include every one of `numbers`,
+        repeats included: 7,7 only matches digits draws with two 7s.
+        """
+        bits = -1
+        for n, count in Counter(numbers).items():
+            bits &= self.postings.get((n, count), 0)
+            if not bits:
+                return 0
+        bits &= self.all_slots
+        if special is not None:
+            bits &= self.special_postings.get(special, 0)
+        return bits
+
+
+def combo_index(game) -> ComboIndex:
+    return game.derived("combos", ComboIndex)
@@ -0,0 +1,142 @@
+from bisect import bisect_left, bisect_right
+from datetime import date as date_cls
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def date_to_ordinal(date_str: str) -> Optional[int]:
+    """Parse 'YYYY-MM-DD' into a day ordinal, or None if it is not a real date."""
+    try:
+        return date_cls.fromisoformat(date_str).toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def ordinal_to_date(ordinal: int) -> str:
+    return date_cls.fromordinal(ordinal).isoformat()
+
+
+class DrawIndex:
+    """
+    Date -> draw-slot index for one game's draw list.
+
+    Draw files are stored newest first; the index keeps the distinct draw
+    dates as ascending day ordinals so exact, previous and next lookups are
+    a single bisect. Each date maps to the slots (positions in `draws`) drawn
+    that day, in file order, with draw_time as a secondary key.
+
+    `ordinals` may be passed when the loader already has each draw's day
+    ordinal (the columnar format stores them), skipping date parsing.
+    """
+
+    def __init__(self, draws: Sequence[Dict], ordinals: Optional[Sequence[int]] = None):
+        self.draws = draws
+        if ordinals is None:
+            ordinals = [date_to_ordinal(draw["date"]) for draw in draws]
+        slots_by_ordinal: Dict[int, List[int]] = {}
+        for slot, ordinal in enumerate(ordinals):
+            if ordinal is None:
+                continue
+            slots_by_ordinal.setdefault(ordinal, []).append(slot)
+
+        self.ordinals: List[int] = sorted(slots_by_ordinal)
+        self.slots: List[List[int]] = [slots_by_ordinal[o] for o in self.ordinals]
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def _position(self, ordinal: int) -> Optional[int]:
+        i = bisect_left(self.ordinals, ordinal)
+        if i < len(self.ordinals) and self.ordinals[i] == ordinal:
+            return i
+        return None
+
+    def lookup(self, date_str: str, draw_time: Optional[str] = None) -> List[Dict]:
+        """
+        Draws on `date_str` in file order. With `draw_time`, only the draws at
+        that time are returned, falling back to every draw on the date when
+        none match (same behaviour as the original linear scan).
+        """
+        ordinal = date_to_ordinal(date_str)
+        if ordinal is None:
+            return []
+        i = self._position(ordinal)
+        if i is None:
+            return []
+        matching = [self.draws[slot] for slot in self.slots[i]]
+        if draw_time:
+            filtered = [d for d in matching if d.get("draw_time") == draw_time]
+            if filtered:
+                return filtered
+        return matching
+
+    def previous_date(self, date_str: str) -> Optional[str]:
+        """Nearest draw date strictly before `date_str`."""
+        ordinal = date_to_ordinal(date_str)
+        if ordinal is None:
+            return None
+        i = bisect_left(self.ordinals, ordinal)
+        return ordinal_to_date(self.ordinals[i - 1]) if i > 0 else None
+
+    def next_date(self, date_str: str) -> Optional[str]:
+        """Nearest draw date strictly after `date_str`."""
+        ordinal = date_to_ordinal(date_str)
+        if ordinal is None:
+            return None
+        i = bisect_right(self.ordinals, ordinal)
+        return ordinal_to_date(self.ordinals[i]) if i < len(self.ordinals) else None
+
+    def closest_dates(self, date_str: str, count: int = 5) -> List[str]:
+        """
+        Up to `count` draw dates nearest to `date_str`, newest first. Walks
+        outwards from the bisect point, so the cost is O(log n + count).
+        """
+        ordinal = date_to_ordinal(date_str)
+        if ordinal is None:
+            return self.latest_dates(count)
+
+        hi = bisect_left(self.ordinals, ordinal)
+        lo = hi - 1
+        picked = []
+        while len(picked) < count and (lo >= 0 or hi < len(self.ordinals)):
+            if hi >= len(self.ordinals) or (
+                lo >= 0 and ordinal - self.ordinals[lo] <= self.ordinals[hi] - ordinal
+            ):
+                picked.append(self.ordinals[lo])
+                lo -= 1
+            else:
+                picked.append(self.ordinals[hi])
+                hi += 1
+        return [ordinal_to_date(o) for o in sorted(picked, reverse=True)]
+
+    def latest_dates(self, count: int = 5) -> List[str]:
+        return [ordinal_to_date(o) for o in reversed(self.ordinals[-count:])]
+
+    def iter_range(self, start: Optional[int] = None, end: Optional[int] = None,
+                   after: Optional[Tuple[int, str]] = None) -> Iterator[Tuple[int, int]]:
+        """
+        Yield (ordinal, slot) for draws dated start..end (inclusive ordinals,
+        either may be None), newest first and in file order within a date.
+
+        `after` resumes a previous walk: it is the (ordinal, draw_time) of the
+        last draw already returned. Resuming by key rather than slot keeps
+        pages stable when new draws are prepended to the file. Finding the
+        start is one bisect, so a page costs O(log n + k).
+        """
+        lo = 0 if start is None else bisect_left(self.ordinals, start)
+        hi = len(self.ordinals) if end is None else bisect_right(self.ordinals, end)
+        skip_through = None
+        if after is not None:
+            hi = min(hi, bisect_right(self.ordinals, after[0]))
+            if hi > lo and self.ordinals[hi - 1] == after[0]:
+                skip_through = after[1]
+
+        for i in range(hi - 1, lo - 1, -1):
+            ordinal = self.ordinals[i]
+            slots = self.slots[i]
+            if skip_through is not None:
+                times = [self.draws[slot].get("draw_time", "evening") for slot in slots]
+                skip = times.index(skip_through) + 1 if skip_through in times else len(slots)
+                slots = slots[skip:]
+                skip_through = None
+            for slot in slots:
+                yield ordinal, slot
@@ -0,0 +1,48 @@
+from typing import Dict, Optional
+
+# How each game's "numbers" list is laid out.
+#   main     count of main balls at the start of "numbers"
+#   special  name of the extra ball, if the game has one
+#   field    draw field holding the special ball; None means it is the
+#            ball after the main ones in "numbers"
+#   ordered  digits games: position matters and repeats are allowed
+#   max      highest main ball (digits games run from 0, the others from 1)
+#   special_max  highest special ball
+# Ranges are the widest a game has used, so tickets for older draws fit.
+GAME_RULES: Dict[str, dict] = {
+    "powerball": {"main": 5, "special": "powerball", "field": None, "ordered": False,
+                  "max": 69, "special_max": 39},
+    "powerball-double-play": {"main": 5, "special": "powerball", "field": None, "ordered": False,
+                              "max": 69, "special_max": 26},
+    "mega-millions": {"main": 5, "special": "mega_ball", "field": None, "ordered": False,
+                      "max": 70, "special_max": 25},
+    "cash4life": {"main": 5, "special": "cash_ball", "field": "cashball", "ordered": False,
+                  "max": 60, "special_max": 4},
+    "florida-lotto": {"main": 6, "special": None, "field": None, "ordered": False,
+                      "max": 53, "special_max": None},
+    "jackpot-triple-play": {"main": 6, "special": None, "field": None, "ordered": False,
+                            "max": 46, "special_max": None},
+    "fantasy-5": {"main": 5, "special": None, "field": None, "ordered": False,
+                  "max": 36, "special_max": None},
+    "pick-2": {"main": 2, "special": "fireball", "field": "fireball", "ordered": True,
+               "max": 9, "special_max": 9},
+    "pick-3": {"main": 3, "special": "fireball", "field": "fireball", "ordered": True,
+               "max": 9, "special_max": 9},
+    "pick-4": {"main": 4, "special": "fireball", "field": "fireball", "ordered": True,
+               "max": 9, "special_max": 9},
+    "pick-5": {"main": 5, "special": "fireball", "field": "fireball", "ordered": True,
+               "max": 9, "special_max": 9},
+}
+
+
+def rules_for(game_id: str, meta: Optional[dict] = None) -> dict:
+    """Rules for a game, guessing from its metadata when it isn't listed."""
+    rules = GAME_RULES.get(game_id)
+    if rules:
+        return rules
+    meta = meta or {}
+    if meta.get("has_fireball"):
+        return {"main": meta.get("numbers_count", 3), "special": "fireball", "field": "fireball", "ordered": True,
+                 "max": 9, "special_max": 9}
+    return {"main": meta.get("numbers_count", 6), "special": None, "field": None, "ordered": False,
+            "max": 99, "special_max": None}
@@ -0,0 +1,63 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional
+
+from api.draw_index import date_to_ordinal
+from api.schedule import next_draw, previous_draw
+
+# Past dates never change once drawn
+IMMUTABLE = "public, max-age=86400, s-maxage=31536000, immutable"
+# A scheduled draw has happened but isn't in the data files yet
+PENDING_TTL = 300
+# Clients revalidate at least this often; the CDN holds until the next draw
+MAX_CLIENT_TTL = 3600
+
+
+def make_etag(version: str, *parts) -> str:
+    key = "|".join([version] + [str(p) for p in parts])
+    return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+def is_pending(game, now: Optional[datetime] = None) -> bool:
+    """True if the most recent scheduled draw is missing from the game's history."""
+    prev = previous_draw(game.id, game.meta.get("draw_times"), now)
+    if prev is None:
+        return False
+    at, draw_time = prev
+    on_date = game.index.lookup(at.date().isoformat())
+    return not any(d.get("draw_time", "evening") == draw_time for d in on_date)
+
+
+def cache_control(game, date: Optional[str] = None, now: Optional[datetime] = None,
+                  range_end: bool = False) -> str:
+    """
+    Cache-Control for a results response. A stored draw dated before the
+    newest one is immutable, as is a range ending before the newest date
+    (range_end=True); "latest", the newest date itself and dates without a
+    draw (404s) are cached by shared caches until the next scheduled draw.
+    """
+    latest_date = game.draws[0]["date"] if len(game.draws) else None
+    if date and latest_date and date < latest_date and date_to_ordinal(date) is not None:
+        if range_end or game.index.lookup(date):
+            return IMMUTABLE
+
+    if is_pending(game, now):
+        ttl = PENDING_TTL
+    else:
+        upcoming = next_draw(game.id, game.meta.get("draw_times"), now)
+        current = now or datetime.now(timezone.utc)
+        if current.tzinfo is None:
+            current = current.replace(tzinfo=timezone.utc)
+        ttl = int((upcoming[0] - current).total_seconds()) if upcoming else PENDING_TTL
+        ttl = max(ttl, 60)
+    return f"public, max-age={min(ttl, MAX_CLIENT_TTL)}, s-maxage={ttl}, stale-while-revalidate=60"
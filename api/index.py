@@ -1,39 +1,54 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
+import base64
+import binascii
 import json
 import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.combo_index import combo_index, iter_bits
+from api.draw_index import date_to_ordinal
+from api.http_cache import cache_control, etag_matches, make_etag
+from api.registry import GameRegistry
+from api.stats import frequency_report, stats_index
+from api.ticket_check import TicketError, check_tickets, popcount
+
 app = FastAPI(title="Florida Lottery API", version="2.0.0")
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
-    allow_methods=["GET"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+MAX_RANGE_LIMIT = 20000
+# Draws serialized per chunk of a streamed range response
+STREAM_BATCH = 256
+MAX_TICKETS = 5000
+# Matching draws returned per check request, across all its tickets
+MAX_CHECK_DRAWS = int(os.environ.get("MAX_CHECK_DRAWS", "10000"))
+MAX_LOOKUPS = 1000
+
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
-GAME_DATA = {}
-
-def load_game_data():
-    global GAME_DATA
-    if not os.path.exists(DATA_DIR):
-        return
-    for filename in os.listdir(DATA_DIR):
-        if filename.endswith('.json'):
-            filepath = os.path.join(DATA_DIR, filename)
-            try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                    game_id = data.get('game')
-                    if game_id:
-                        GAME_DATA[game_id] = data
-            except Exception as e:
-                print(f"Error loading {filename}: {e}")
-
-load_game_data()
+
+# Games are listed from data/manifest.json and loaded on first request.
+# Set LOTTO_EAGER_LOAD=1 to load everything at import (long-running servers).
+REGISTRY = GameRegistry(DATA_DIR)
+
+if os.environ.get("LOTTO_EAGER_LOAD") == "1":
+    REGISTRY.load_all()
+
+# Long-running deployments: LOTTO_HOT_RELOAD=<seconds> polls data/ for changes
+if os.environ.get("LOTTO_HOT_RELOAD"):
+    REGISTRY.start_reloader(float(os.environ["LOTTO_HOT_RELOAD"]))
 
 
 @app.get("/")
@@ -41,11 +56,16 @@ async def root():
     return {
         "name": "Florida Lottery API",
         "version": "2.0.0",
-        "games_loaded": list(GAME_DATA.keys()),
+        "games_loaded": REGISTRY.game_ids(),
         "endpoints": {
             "list_games": "GET /api/games",
             "get_results": "GET /api/florida/{game}",
             "get_historical": "GET /api/florida/{game}?date=YYYY-MM-DD",
+            "get_range": "GET /api/florida/{game}/draws?from=YYYY-MM-DD&to=YYYY-MM-DD&limit=N&cursor=...",
+            "check_tickets": "POST /api/florida/{game}/check",
+            "bulk_lookup": "POST /api/florida/lookup",
+            "stats": "GET /api/florida/{game}/stats?last=N|from=&to=&draw_time=",
+            "search": "GET /api/florida/{game}/search?numbers=1,2,3",
             "health": "GET /api/health"
         }
     }
@@ -55,8 +75,11 @@ async def root():
 async def health():
     return {
         "status": "healthy",
-        "games_loaded": len(GAME_DATA),
-        "games": list(GAME_DATA.keys()),
+        "games_loaded": len(REGISTRY.game_ids()),
+        "games": REGISTRY.game_ids(),
+        "games_in_memory": REGISTRY.loaded_ids(),
+        "versions": REGISTRY.versions(),
+        "reload": REGISTRY.reload_status,
         "timestamp": datetime.now().isoformat()
     }
 
@@ -64,7 +87,8 @@ async def health():
 @app.get("/api/games")
 async def list_games():
     games = []
-    for game_id, data in GAME_DATA.items():
+    for game_id in REGISTRY.game_ids():
+        data = REGISTRY.meta(game_id)
         games.append({
             "id": game_id,
             "name": data.get("game_name", game_id),
@@ -76,25 +100,10 @@ async def list_games():
     return {"games": games}
 
 
-@app.get("/api/florida/{game}")
-async def get_florida_results(
-    game: str,
-    date: Optional[str] = Query(None, regex=r"^\d{4}-\d{2}-\d{2}$"),
-    draw_time: Optional[str] = Query(None, regex=r"^(midday|evening)$")
-):
-    game = game.lower()
-    
-    if game not in GAME_DATA:
-        raise HTTPException(
-            status_code=404,
-            detail={"error": f"Game not found: {game}", "available": list(GAME_DATA.keys())}
-        )
-    
-    game_data = GAME_DATA[game]
-    draws = game_data.get("draws", [])
-    
-    if not draws:
-        raise HTTPException(status_code=404, detail={"error": "No draw data available"})
+def results_body(loaded, game: str, date: Optional[str] = None,
+                 draw_time: Optional[str] = None, headers: Optional[dict] = None) -> dict:
+    """Body of a single results lookup; raises a 404 HTTPException on a miss."""
+    draws = loaded.draws
     
     # Latest result
     if not date:
@@ -102,7 +111,7 @@ async def get_florida_results(
         return {
             "state": "FLORIDA",
             "game": game,
-            "game_name": game_data.get("game_name"),
+            "game_name": loaded.data.get("game_name"),
             "date_requested": "latest",
             "date_drawn": latest["date"],
             "draw_time": latest.get("draw_time", "evening"),
@@ -110,31 +119,28 @@ async def get_florida_results(
             "winning_numbers": latest["numbers"]
         }
     
-    # Historical lookup
-    matching = [d for d in draws if d["date"] == date]
+    # Historical lookup (falls back to all draws on the date if draw_time misses)
+    index = loaded.index
+    matching = index.lookup(date, draw_time)
     
     if not matching:
-        all_dates = sorted(set(d["date"] for d in draws), reverse=True)[:5]
         raise HTTPException(
             status_code=404,
             detail={
                 "error": f"No results for {game} on {date}",
-                "closest_dates": all_dates
-            }
+                "closest_dates": index.closest_dates(date),
+                "previous_date": index.previous_date(date),
+                "next_date": index.next_date(date)
+            },
+            headers=headers
         )
     
-    # Filter by draw_time if specified
-    if draw_time:
-        filtered = [d for d in matching if d.get("draw_time") == draw_time]
-        if filtered:
-            matching = filtered
-    
     result = matching[0]
     
     response = {
         "state": "FLORIDA",
         "game": game,
-        "game_name": game_data.get("game_name"),
+        "game_name": loaded.data.get("game_name"),
         "date_requested": date,
         "date_drawn": result["date"],
         "draw_time": result.get("draw_time", "evening"),
@@ -149,8 +155,297 @@ async def get_florida_results(
     return response
 
 
+@app.get("/api/florida/{game}")
+async def get_florida_results(
+    request: Request,
+    game: str,
+    date: Optional[str] = Query(None, pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    draw_time: Optional[str] = Query(None, pattern=r"^(midday|evening)$")
+):
+    game = game.lower()
+    
+    loaded = REGISTRY.get(game)
+    if loaded is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": f"Game not found: {game}", "available": REGISTRY.game_ids()}
+        )
+    
+    if not loaded.draws:
+        raise HTTPException(status_code=404, detail={"error": "No draw data available"})
+    
+    # Responses only change when the game's data does: revalidate by version
+    etag = make_etag(loaded.version, date or "latest", draw_time)
+    headers = {"ETag": etag, "Cache-Control": cache_control(loaded, date)}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    return JSONResponse(content=results_body(loaded, game, date, draw_time, headers), headers=headers)
+
+
+def encode_cursor(ordinal: int, draw_time: str) -> str:
+    raw = f"{ordinal}:{draw_time}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        ordinal, draw_time = raw.split(":", 1)
+        return int(ordinal), draw_time
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail={"error": "Invalid cursor"})
+
+
+@app.get("/api/florida/{game}/draws")
+async def get_florida_draws(
+    request: Request,
+    game: str,
+    date_from: Optional[str] = Query(None, alias="from", pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    date_to: Optional[str] = Query(None, alias="to", pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    draw_time: Optional[str] = Query(None, pattern=r"^(midday|evening)$"),
+    limit: int = Query(100, ge=1, le=MAX_RANGE_LIMIT),
+    cursor: Optional[str] = Query(None)
+):
+    game = game.lower()
+    loaded = REGISTRY.get(game)
+    if loaded is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": f"Game not found: {game}", "available": REGISTRY.game_ids()}
+        )
+    
+    start = date_to_ordinal(date_from) if date_from else None
+    end = date_to_ordinal(date_to) if date_to else None
+    if (date_from and start is None) or (date_to and end is None):
+        raise HTTPException(status_code=400, detail={"error": "Invalid date"})
+    after = decode_cursor(cursor) if cursor else None
+    
+    etag = make_etag(loaded.version, "draws", date_from, date_to, draw_time, limit, cursor)
+    headers = {"ETag": etag, "Cache-Control": cache_control(loaded, date_to, range_end=True)}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    draws = loaded.draws
+    
+    def body():
+        # Walk the index lazily and emit the page in batches, so even a
+        # 20-year range is never materialized as one response object
+        head = {
+            "state": "FLORIDA",
+            "game": game,
+            "game_name": loaded.data.get("game_name"),
+            "from": date_from,
+            "to": date_to,
+            "draw_time": draw_time,
+            "source": "history.json",
+        }
+        yield json.dumps(head, separators=(",", ":"))[:-1] + ',"draws":['
+        
+        count = 0
+        last = None
+        next_cursor = None
+        batch = []
+        for ordinal, slot in loaded.index.iter_range(start, end, after):
+            draw = draws[slot]
+            if draw_time and draw.get("draw_time", "evening") != draw_time:
+                continue
+            if count == limit:
+                next_cursor = encode_cursor(*last)
+                break
+            batch.append(json.dumps(draw, separators=(",", ":")))
+            count += 1
+            last = (ordinal, draw.get("draw_time", "evening"))
+            if len(batch) == STREAM_BATCH:
+                yield ("," if count > STREAM_BATCH else "") + ",".join(batch)
+                batch = []
+        if batch:
+            yield ("," if count > len(batch) else "") + ",".join(batch)
+        
+        yield '],"count":%d,"next_cursor":%s}' % (count, json.dumps(next_cursor))
+    
+    return StreamingResponse(body(), media_type="application/json", headers=headers)
+
+
+@app.get("/api/florida/{game}/stats")
+async def get_florida_stats(
+    request: Request,
+    game: str,
+    last: Optional[int] = Query(None, ge=1),
+    date_from: Optional[str] = Query(None, alias="from", pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    date_to: Optional[str] = Query(None, alias="to", pattern=r"^\d{4}-\d{2}-\d{2}$"),
+    draw_time: Optional[str] = Query(None, pattern=r"^(midday|evening)$"),
+    top: int = Query(5, ge=1, le=20)
+):
+    game = game.lower()
+    loaded = REGISTRY.get(game)
+    if loaded is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": f"Game not found: {game}", "available": REGISTRY.game_ids()}
+        )
+    if (date_from and date_to_ordinal(date_from) is None) or (date_to and date_to_ordinal(date_to) is None):
+        raise HTTPException(status_code=400, detail={"error": "Invalid date"})
+    
+    # "last N" moves with every new draw; only closed date ranges are immutable
+    etag = make_etag(loaded.version, "stats", last, date_from, date_to, draw_time, top)
+    headers = {"ETag": etag, "Cache-Control": cache_control(loaded, None if last else date_to, range_end=True)}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    index = stats_index(loaded)
+    window = index.window(last, date_from, date_to, draw_time)
+    return JSONResponse(headers=headers, content={
+        "state": "FLORIDA",
+        "game": game,
+        "game_name": loaded.data.get("game_name"),
+        "window": {"last": last, "from": date_from, "to": date_to, "draw_time": draw_time},
+        "source": "history.json",
+        **frequency_report(index, window, top)
+    })
+
+
+@app.get("/api/florida/{game}/search")
+async def search_florida_numbers(
+    request: Request,
+    game: str,
+    numbers: str = Query(..., pattern=r"^\d{1,2}(,\d{1,2})*$"),
+    special: Optional[int] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=1000)
+):
+    game = game.lower()
+    loaded = REGISTRY.get(game)
+    if loaded is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": f"Game not found: {game}", "available": REGISTRY.game_ids()}
+        )
+    
+    index = combo_index(loaded)
+    wanted = [int(n) for n in numbers.split(",")]
+    main = index.rules["main"]
+    if len(wanted) > main:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": f"At most {main} main numbers for {game}, got {len(wanted)}"}
+        )
+    
+    etag = make_etag(loaded.version, "search", numbers, special, limit)
+    headers = {"ETag": etag, "Cache-Control": cache_control(loaded)}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    draws = loaded.draws
+    containing = index.containing(wanted, special)
+    matches = []
+    for slot in iter_bits(containing):
+        if len(matches) == limit:
+            break
+        matches.append(draws[slot])
+    
+    response = {
+        "state": "FLORIDA",
+        "game": game,
+        "game_name": loaded.data.get("game_name"),
+        "numbers": [str(n) for n in wanted],
+        "source": "history.json",
+        "draws_containing": popcount(containing),
+        "draws": matches,
+    }
+    # The full combination: also report whether it was ever the exact draw
+    if len(wanted) == main:
+        exact = index.exact(wanted, special)
+        response["ever_drawn"] = bool(exact)
+        response["exact_matches"] = [draws[slot] for slot in exact[:limit]]
+    
+    return JSONResponse(content=response, headers=headers)
+
+
+class Ticket(BaseModel):
+    numbers: List[int]
+    special: Optional[int] = None
+    date: Optional[str] = Field(None, pattern=r"^\d{4}-\d{2}-\d{2}$")
+    date_from: Optional[str] = Field(None, alias="from", pattern=r"^\d{4}-\d{2}-\d{2}$")
+    date_to: Optional[str] = Field(None, alias="to", pattern=r"^\d{4}-\d{2}-\d{2}$")
+    draw_time: Optional[str] = Field(None, pattern=r"^(midday|evening)$")
+
+
+class CheckRequest(BaseModel):
+    tickets: List[Ticket]
+    min_matches: int = Field(1, ge=0)
+
+
+@app.post("/api/florida/{game}/check")
+async def check_florida_tickets(game: str, body: CheckRequest):
+    game = game.lower()
+    loaded = REGISTRY.get(game)
+    if loaded is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"error": f"Game not found: {game}", "available": REGISTRY.game_ids()}
+        )
+    if len(body.tickets) > MAX_TICKETS:
+        raise HTTPException(
+            status_code=413,
+            detail={"error": f"Too many tickets: {len(body.tickets)} (max {MAX_TICKETS})"}
+        )
+    
+    try:
+        results = check_tickets(loaded, body.tickets, body.min_matches, max_draws=MAX_CHECK_DRAWS)
+    except TicketError as e:
+        raise HTTPException(status_code=400, detail={"error": str(e)})
+    
+    return {
+        "state": "FLORIDA",
+        "game": game,
+        "game_name": loaded.data.get("game_name"),
+        "source": "history.json",
+        "truncated": any(r.get("truncated") for r in results),
+        "results": results
+    }
+
+
+class LookupItem(BaseModel):
+    game: str
+    date: Optional[str] = Field(None, pattern=r"^\d{4}-\d{2}-\d{2}$")
+    draw_time: Optional[str] = Field(None, pattern=r"^(midday|evening)$")
+
+
+class LookupRequest(BaseModel):
+    items: List[LookupItem]
+
+
+@app.post("/api/florida/lookup")
+async def bulk_florida_lookup(body: LookupRequest):
+    if len(body.items) > MAX_LOOKUPS:
+        raise HTTPException(
+            status_code=413,
+            detail={"error": f"Too many items: {len(body.items)} (max {MAX_LOOKUPS})"}
+        )
+    
+    # Same bodies as GET /api/florida/{game}; misses become per-item errors
+    results = []
+    for item in body.items:
+        game = item.game.lower()
+        loaded = REGISTRY.get(game)
+        if loaded is None or not loaded.draws:
+            error = f"Game not found: {game}" if loaded is None else "No draw data available"
+            results.append({"game": game, "date_requested": item.date or "latest", "status": 404, "error": error})
+            continue
+        try:
+            result = results_body(loaded, game, item.date, item.draw_time)
+        except HTTPException as e:
+            result = {"game": game, "date_requested": item.date, "status": e.status_code, **e.detail}
+        else:
+            result["status"] = 200
+        results.append(result)
+    
+    return {"count": len(results), "results": results}
+
+
 @app.get("/api/{state}/{game}")
 async def get_state_results(
+    request: Request,
     state: str,
     game: str,
     date: Optional[str] = Query(None),
@@ -161,4 +456,4 @@ async def get_state_results(
             status_code=400,
             detail={"error": f"State not supported: {state}", "supported": ["florida"]}
         )
-    return await get_florida_results(game, date, draw_time)
+    return await get_florida_results(request, game, date, draw_time)
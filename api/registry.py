@@ -0,0 +1,338 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from api import columnar
+from api.draw_index import DrawIndex
+
+MANIFEST_FILE = "manifest.json"
+
+# "auto" memory-maps a game's .lotc file when it matches the JSON it was
+# built from; "json" always parses the JSON files.
+DATA_FORMAT = os.environ.get("LOTTO_DATA_FORMAT", "auto")
+
+# Game-level fields copied from each data file into the manifest
+MANIFEST_FIELDS = (
+    "game_name", "state", "numbers_count", "draw_times",
+    "has_fireball", "has_cashball", "total_draws", "last_updated",
+)
+
+
+def game_meta(data: dict, filename: str) -> dict:
+    meta = {k: data[k] for k in MANIFEST_FIELDS if k in data}
+    meta["file"] = filename
+    return meta
+
+
+def game_version(data: dict, draws) -> str:
+    """Content version of a game: changes whenever a draw lands or the file is rebuilt."""
+    latest = draws[0] if len(draws) else None
+    blob = json.dumps([latest, data.get("last_updated"), len(draws)], sort_keys=True)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def build_manifest(data_dir: str) -> dict:
+    """Read every data/*.json file once and summarise it without its draws."""
+    games = {}
+    for filename in sorted(os.listdir(data_dir)):
+        if not filename.endswith(".json") or filename == MANIFEST_FILE:
+            continue
+        with open(os.path.join(data_dir, filename), "r") as f:
+            data = json.load(f)
+        game_id = data.get("game")
+        if game_id:
+            games[game_id] = game_meta(data, filename)
+    return {"generated": datetime.now().isoformat() + "Z", "games": games}
+
+
+def _save_manifest(data_dir: str, manifest: dict):
+    path = os.path.join(data_dir, MANIFEST_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def write_manifest(data_dir: str) -> dict:
+    manifest = build_manifest(data_dir)
+    _save_manifest(data_dir, manifest)
+    return manifest
+
+
+def update_manifest(data_dir: str, data: dict, filename: str) -> dict:
+    """Replace one game's manifest entry after its data file was rewritten."""
+    path = os.path.join(data_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return write_manifest(data_dir)
+    with open(path, "r") as f:
+        manifest = json.load(f)
+    manifest.setdefault("games", {})[data["game"]] = game_meta(data, filename)
+    manifest["generated"] = datetime.now().isoformat() + "Z"
+    _save_manifest(data_dir, manifest)
+    return manifest
+
+
+class Game:
+    """A loaded game: its full data file plus the structures built from it."""
+
+    def __init__(self, game_id: str, data: dict, filename: str):
+        self.id = game_id
+        self.data = data
+        self.meta = game_meta(data, filename)
+        self.draws = data.get("draws", [])
+        self.index = DrawIndex(self.draws, getattr(self.draws, "ordinals", None))
+        self.version = game_version(data, self.draws)
+        self._derived: Dict[str, object] = {}
+        self._builders: Dict[str, object] = {}
+        self._derived_lock = threading.RLock()
+
+    def derived(self, name: str, build):
+        """
+        A structure built from this game's draws on first use (e.g. the ticket
+        matrix) and cached with the game, so it is swapped out with it.
+        """
+        value = self._derived.get(name)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(name)
+                if value is None:
+                    value = build(self)
+                    self._derived[name] = value
+                    self._builders[name] = build
+        return value
+
+    def carry_derived(self, old: "Game"):
+        """
+        Rebuild every structure `old` had built, for this newer version of
+        the game. When only new draws were prepended, structures that
+        support it (copy_extended) are updated from the old ones instead.
+        """
+        head = None
+        added = len(self.draws) - len(old.draws)
+        if len(old.draws) and added >= 0 and self.draws[added] == old.draws[0] and self.draws[-1] == old.draws[-1]:
+            head = self.draws[:added]
+        for name, build in list(old._builders.items()):
+            value = None
+            previous = old._derived.get(name)
+            if head is not None and hasattr(previous, "copy_extended"):
+                value = previous.copy_extended(head)
+            if value is None:
+                value = build(self)
+            self._derived[name] = value
+            self._builders[name] = build
+
+
+class GameRegistry:
+    """
+    Lazy per-game registry over the data directory.
+
+    Game listings come from data/manifest.json, so a cold start only reads
+    that small file. A game's draws are loaded and indexed the first time
+    the game is requested; concurrent first requests for the same game
+    block on a per-game lock and share one load.
+    """
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self._games: Dict[str, Game] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._signatures: Dict[str, tuple] = {}
+        self._hashes: Dict[str, str] = {}
+        self._reloader: Optional[threading.Thread] = None
+        self.reload_status = {
+            "enabled": False,
+            "checks": 0,
+            "reloads": 0,
+            "errors": 0,
+            "last_check": None,
+            "last_reload": None,
+        }
+        self.manifest = self._read_manifest()
+        for filename in self._data_files():
+            self._signatures[filename] = self._signature(filename)
+
+    def _read_manifest(self) -> Dict[str, dict]:
+        if not os.path.exists(self.data_dir):
+            return {}
+        path = os.path.join(self.data_dir, MANIFEST_FILE)
+        try:
+            with open(path, "r") as f:
+                games = json.load(f)["games"]
+        except (OSError, ValueError, KeyError):
+            print(f"Manifest missing or unreadable, scanning {self.data_dir}")
+            games = {}
+        # Files the manifest doesn't know about are loaded up front
+        listed = {entry["file"] for entry in games.values()}
+        for filename in os.listdir(self.data_dir):
+            if filename.endswith(".json") and filename != MANIFEST_FILE and filename not in listed:
+                game = self._load_file(filename)
+                if game:
+                    self._games[game.id] = game
+                    games[game.id] = game.meta
+        return games
+
+    def _load_columnar(self, filename: str) -> Optional[Game]:
+        json_path = os.path.join(self.data_dir, filename)
+        path = columnar.columnar_path(json_path)
+        if DATA_FORMAT == "json" or not os.path.exists(path):
+            return None
+        try:
+            data = columnar.load(path)
+            # A .lotc built from any other version of the JSON file is ignored
+            if not columnar.source_matches(data["draws"].meta.get("source"), json_path):
+                return None
+        except (OSError, ValueError) as e:
+            print(f"Error loading {path}: {e}")
+            return None
+        return Game(data["game"], data, filename)
+
+    def _load_file(self, filename: str) -> Optional[Game]:
+        filepath = os.path.join(self.data_dir, filename)
+        try:
+            with open(filepath, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading {filename}: {e}")
+            return None
+        game_id = data.get("game")
+        if not game_id:
+            return None
+        return Game(game_id, data, filename)
+
+    def _data_files(self) -> List[str]:
+        if not os.path.exists(self.data_dir):
+            return []
+        return sorted(f for f in os.listdir(self.data_dir) if f.endswith(".json") and f != MANIFEST_FILE)
+
+    def _signature(self, filename: str) -> Optional[tuple]:
+        try:
+            st = os.stat(os.path.join(self.data_dir, filename))
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _content_hash(self, filename: str) -> str:
+        digest = hashlib.sha1()
+        with open(os.path.join(self.data_dir, filename), "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _lock_for(self, game_id: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(game_id, threading.Lock())
+
+    def game_ids(self) -> List[str]:
+        return list(self.manifest.keys())
+
+    def loaded_ids(self) -> List[str]:
+        return list(self._games.keys())
+
+    def meta(self, game_id: str) -> Optional[dict]:
+        game = self._games.get(game_id)
+        if game:
+            return game.meta
+        return self.manifest.get(game_id)
+
+    def get(self, game_id: str) -> Optional[Game]:
+        game = self._games.get(game_id)
+        if game is not None:
+            return game
+        entry = self.manifest.get(game_id)
+        if entry is None:
+            return None
+        with self._lock_for(game_id):
+            game = self._games.get(game_id)
+            if game is None:
+                game = self._load_columnar(entry["file"]) or self._load_file(entry["file"])
+                if game is None:
+                    return None
+                self._games[game_id] = game
+        return game
+
+    def load_all(self):
+        for game_id in self.game_ids():
+            self.get(game_id)
+
+    def versions(self) -> Dict[str, str]:
+        return {game_id: game.version for game_id, game in self._games.items()}
+
+    # --- Hot reload ---
+
+    def check_for_changes(self) -> List[str]:
+        """
+        Reload every data file whose mtime/size changed and whose content
+        hash differs from the last one seen. Returns the reloaded game ids.
+        """
+        reloaded = []
+        for filename in self._data_files():
+            signature = self._signature(filename)
+            if signature is None or signature == self._signatures.get(filename):
+                continue
+            digest = self._content_hash(filename)
+            self._signatures[filename] = signature
+            if self._hashes.get(filename) == digest:
+                continue
+            self._hashes[filename] = digest
+            game_id = self.reload_file(filename)
+            if game_id:
+                reloaded.append(game_id)
+        self.reload_status["checks"] += 1
+        self.reload_status["last_check"] = datetime.now().isoformat()
+        return reloaded
+
+    def reload_file(self, filename: str) -> Optional[str]:
+        """
+        Build a fresh Game (index and any derived structures) from a data
+        file, then publish it with a single reference swap. Requests already
+        holding the previous Game keep using it untouched.
+        """
+        start = time.perf_counter()
+        game = self._load_file(filename)
+        if game is None:
+            self.reload_status["errors"] += 1
+            return None
+
+        with self._lock_for(game.id):
+            old = self._games.get(game.id)
+            if old is not None:
+                game.carry_derived(old)
+                self._games[game.id] = game
+            # Games not loaded yet only need their listing refreshed
+            manifest = dict(self.manifest)
+            manifest[game.id] = game.meta
+            self.manifest = manifest
+
+        self.reload_status["reloads"] += 1
+        self.reload_status["last_reload"] = {
+            "game": game.id,
+            "version": game.version,
+            "total_draws": len(game.draws),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            "at": datetime.now().isoformat(),
+        }
+        print(f"Reloaded {game.id} from {filename} ({self.reload_status['last_reload']['duration_ms']} ms)")
+        return game.id
+
+    def start_reloader(self, interval: float = 30.0):
+        """Poll the data directory from a daemon thread (long-running servers only)."""
+        if self._reloader is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.check_for_changes()
+                except Exception as e:
+                    self.reload_status["errors"] += 1
+                    print(f"Reload check failed: {e}")
+
+        self.reload_status["enabled"] = True
+        self.reload_status["interval_seconds"] = interval
+        self._reloader = threading.Thread(target=run, name="data-reloader", daemon=True)
+        self._reloader.start()
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+try:
+    from zoneinfo import ZoneInfo
+    EASTERN = ZoneInfo("America/New_York")
+except Exception:
+    # No tz database available: fall back to EST year-round
+    EASTERN = timezone(timedelta(hours=-5), "EST")
+
+DAILY = (0, 1, 2, 3, 4, 5, 6)
+
+# Florida Lottery draw schedule, Eastern time.
+# game -> draw_time -> (weekdays (Mon=0), hour, minute)
+DRAW_SCHEDULE: Dict[str, Dict[str, Tuple[Tuple[int, ...], int, int]]] = {
+    "powerball": {"evening": ((0, 2, 5), 22, 59)},
+    "powerball-double-play": {"evening": ((0, 2, 5), 22, 59)},
+    "mega-millions": {"evening": ((1, 4), 23, 0)},
+    "florida-lotto": {"evening": ((2, 5), 23, 15)},
+    "jackpot-triple-play": {"evening": ((1, 4), 23, 15)},
+    "cash4life": {"evening": (DAILY, 21, 0)},
+    "fantasy-5": {"midday": (DAILY, 13, 5), "evening": (DAILY, 23, 15)},
+    "pick-2": {"midday": (DAILY, 13, 30), "evening": (DAILY, 21, 45)},
+    "pick-3": {"midday": (DAILY, 13, 30), "evening": (DAILY, 21, 45)},
+    "pick-4": {"midday": (DAILY, 13, 30), "evening": (DAILY, 21, 45)},
+    "pick-5": {"midday": (DAILY, 13, 30), "evening": (DAILY, 21, 45)},
+}
+
+# Used for games missing from DRAW_SCHEDULE, from their draw_times
+DEFAULT_TIMES = {"midday": (DAILY, 13, 30), "evening": (DAILY, 23, 59)}
+
+
+def _slots(game_id: str, draw_times: Optional[Iterable[str]] = None):
+    schedule = DRAW_SCHEDULE.get(game_id)
+    if schedule:
+        return list(schedule.items())
+    return [(t, DEFAULT_TIMES[t]) for t in (draw_times or ["evening"]) if t in DEFAULT_TIMES]
+
+
+def _eastern_now(now: Optional[datetime]) -> datetime:
+    if now is None:
+        return datetime.now(EASTERN)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    return now.astimezone(EASTERN)
+
+
+def _scan(game_id, draw_times, now, forward: bool) -> Optional[Tuple[datetime, str]]:
+    now = _eastern_now(now)
+    step = 1 if forward else -1
+    best = None
+    for draw_time, (weekdays, hour, minute) in _slots(game_id, draw_times):
+        for days in range(8):
+            day = now.date() + timedelta(days=step * days)
+            if day.weekday() not in weekdays:
+                continue
+            at = datetime(day.year, day.month, day.day, hour, minute, tzinfo=EASTERN)
+            if (at > now) if forward else (at <= now):
+                if best is None or (at < best[0] if forward else at > best[0]):
+                    best = (at, draw_time)
+                break
+    return best
+
+
+def next_draw(game_id: str, draw_times: Optional[Iterable[str]] = None,
+              now: Optional[datetime] = None) -> Optional[Tuple[datetime, str]]:
+    """First scheduled draw strictly after `now`, as (Eastern datetime, draw_time)."""
+    return _scan(game_id, draw_times, now, forward=True)
+
+
+def previous_draw(game_id: str, draw_times: Optional[Iterable[str]] = None,
+                  now: Optional[datetime] = None) -> Optional[Tuple[datetime, str]]:
+    """Most recent scheduled draw at or before `now`, as (Eastern datetime, draw_time)."""
+    return _scan(game_id, draw_times, now, forward=False)
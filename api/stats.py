@@ -0,0 +1,201 @@
+import copy
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+from api.draw_index import date_to_ordinal, ordinal_to_date
+from api.game_rules import rules_for
+
+# Orders draws within a day; later draw times sort after earlier ones
+TIME_RANK = {"midday": 0, "evening": 1}
+
+
+def _key(ordinal: int, draw_time: str) -> int:
+    return ordinal * 2 + TIME_RANK.get(draw_time, 1)
+
+
+class _Counts:
+    """
+    Prefix-sum count rows for one draw_time: row i holds, for every ball
+    value, how often it was drawn in the group's first i draws. Rows are
+    stored flat so a window count is the difference of two rows.
+    """
+
+    def __init__(self, width: int, columns: int):
+        self.width = width
+        self.rows = 0
+        self.keys: List[int] = []
+        self.columns = [array("I", [0] * width) for _ in range(columns)]
+
+    def append(self, key: int, values: List[Optional[int]]):
+        self.keys.append(key)
+        w = self.width
+        start = self.rows * w
+        for column, value in zip(self.columns, values):
+            column.extend(column[start:start + w])
+            if value is not None:
+                column[start + w + value] += 1
+        self.rows += 1
+
+    def window(self, column: int, lo: int, hi: int) -> List[int]:
+        w = self.width
+        data = self.columns[column]
+        upper = data[hi * w:(hi + 1) * w]
+        lower = data[lo * w:(lo + 1) * w]
+        return [a - b for a, b in zip(upper, lower)]
+
+
+class StatsIndex:
+    """
+    Ball frequency over any window of a game's history.
+
+    Draws are kept in chronological order per draw_time, each group with
+    prefix-sum rows per ball position and for the special ball. `upto`
+    maps a position in the global chronological order to how many draws of
+    each group precede it, so "last N draws", date ranges and midday/evening
+    splits all reduce to a bisect plus one row subtraction per column.
+    """
+
+    def __init__(self, game):
+        self.rules = rules_for(game.id, game.meta)
+        self.main = self.rules["main"]
+        self.width = 0
+        self.universe = set()
+        self.special_universe = set()
+        self.keys: List[int] = []
+        self.groups: Dict[str, _Counts] = {}
+        self.upto: Dict[str, List[int]] = {}
+
+        rows = [self._row(d) for d in reversed(game.draws)]
+        rows = [r for r in rows if r is not None]
+        rows.sort(key=lambda r: r[0])
+        for key, draw_time, values in rows:
+            for v in values[:self.main]:
+                self.universe.add(v)
+            if values[self.main] is not None:
+                self.special_universe.add(values[self.main])
+            self.width = max([self.width] + [v + 1 for v in values if v is not None])
+        for draw_time in sorted({r[1] for r in rows}, key=lambda t: TIME_RANK.get(t, 1)):
+            self.groups[draw_time] = _Counts(self.width, self.main + 1)
+            self.upto[draw_time] = [0]
+        for key, draw_time, values in rows:
+            self._push(key, draw_time, values)
+
+    def _row(self, draw):
+        ordinal = date_to_ordinal(draw["date"])
+        if ordinal is None:
+            return None
+        balls = [int(n) for n in draw["numbers"]]
+        field = self.rules["field"]
+        if field:
+            special = int(draw[field]) if draw.get(field) is not None else None
+        elif self.rules["special"] and len(balls) > self.main:
+            special = balls[self.main]
+        else:
+            special = None
+        draw_time = draw.get("draw_time", "evening")
+        return _key(ordinal, draw_time), draw_time, balls[:self.main] + [special]
+
+    def _push(self, key, draw_time, values):
+        self.keys.append(key)
+        self.groups[draw_time].append(key, values)
+        for name, upto in self.upto.items():
+            upto.append(upto[-1] + (1 if name == draw_time else 0))
+
+    def extend(self, draws) -> bool:
+        """
+        Append draws newer than everything indexed (newest first, as in the
+        data files). Returns False when a draw is older than the index or
+        out of range of its counters, in which case the caller rebuilds.
+        """
+        rows = [self._row(d) for d in reversed(list(draws))]
+        if any(r is None for r in rows):
+            return False
+        rows.sort(key=lambda r: r[0])
+        last = self.keys[-1] if self.keys else -1
+        for key, draw_time, values in rows:
+            if key <= last or draw_time not in self.groups:
+                return False
+            if any(v is not None and v >= self.width for v in values):
+                return False
+            last = key
+        for key, draw_time, values in rows:
+            for v in values[:self.main]:
+                self.universe.add(v)
+            if values[self.main] is not None:
+                self.special_universe.add(values[self.main])
+            self._push(key, draw_time, values)
+        return True
+
+    def copy_extended(self, draws) -> Optional["StatsIndex"]:
+        """A copy of this index with `draws` appended, or None if it needs a rebuild."""
+        updated = copy.deepcopy(self)
+        return updated if updated.extend(draws) else None
+
+    def window(self, last: Optional[int] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None, draw_time: Optional[str] = None) -> dict:
+        total = len(self.keys)
+        lo, hi = 0, total
+        if date_from:
+            lo = bisect_left(self.keys, _key(date_to_ordinal(date_from), "midday"))
+        if date_to:
+            hi = bisect_right(self.keys, _key(date_to_ordinal(date_to), "evening"))
+        if last is not None:
+            # "Last N" counts draws of the requested draw_time only
+            if draw_time in self.upto:
+                upto = self.upto[draw_time]
+                n = min(last, upto[hi] - upto[lo])
+                lo = max(lo, bisect_left(upto, upto[hi] - n) if n else hi)
+            else:
+                lo = max(lo, hi - last)
+        hi = max(lo, hi)
+
+        names = [draw_time] if draw_time else list(self.groups)
+        positions = [[0] * self.width for _ in range(self.main)]
+        special = [0] * self.width
+        draws = 0
+        first_key = last_key = None
+        for name in names:
+            if name not in self.groups:
+                continue
+            group, upto = self.groups[name], self.upto[name]
+            g_lo, g_hi = upto[lo], upto[hi]
+            if g_hi == g_lo:
+                continue
+            draws += g_hi - g_lo
+            first_key = min(k for k in (first_key, group.keys[g_lo]) if k is not None)
+            last_key = max(k for k in (last_key, group.keys[g_hi - 1]) if k is not None)
+            for p in range(self.main):
+                positions[p] = [a + b for a, b in zip(positions[p], group.window(p, g_lo, g_hi))]
+            special = [a + b for a, b in zip(special, group.window(self.main, g_lo, g_hi))]
+
+        return {
+            "draws": draws,
+            "first_date": ordinal_to_date(first_key // 2) if draws else None,
+            "last_date": ordinal_to_date(last_key // 2) if draws else None,
+            "positions": positions,
+            "special": special,
+        }
+
+
+def stats_index(game) -> StatsIndex:
+    return game.derived("stats", StatsIndex)
+
+
+def frequency_report(index: StatsIndex, window: dict, top: int = 5) -> dict:
+    universe = sorted(index.universe)
+    totals = {v: sum(pos[v] for pos in window["positions"]) for v in universe}
+    ranked = sorted(universe, key=lambda v: (-totals[v], v))
+    report = {
+        "draws_counted": window["draws"],
+        "first_date": window["first_date"],
+        "last_date": window["last_date"],
+        "numbers": {str(v): totals[v] for v in universe},
+        "positions": [{str(v): pos[v] for v in universe} for pos in window["positions"]],
+        "hot": [str(v) for v in ranked[:top]],
+        "cold": [str(v) for v in reversed(ranked[-top:])],
+    }
+    if index.rules["special"] and index.special_universe:
+        specials = sorted(index.special_universe)
+        report[index.rules["special"]] = {str(v): window["special"][v] for v in specials}
+    return report
@@ -0,0 +1,266 @@
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from api.draw_index import date_to_ordinal
+from api.game_rules import rules_for
+
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:  # Python < 3.10
+    def popcount(x: int) -> int:
+        return bin(x).count("1")
+
+# Digits games encode each position as its own 10-bit group
+DIGIT_BITS = 10
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Positions of the set bits, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def encode_balls(numbers: Sequence[int], ordered: bool) -> int:
+    """
+    Bitmask of a set of balls. For digits games bit (position*10 + digit)
+    is set instead, so the popcount of two masks ANDed together is the
+    number of positional matches; for everything else it is the number of
+    shared balls.
+    """
+    mask = 0
+    for pos, n in enumerate(numbers):
+        mask |= 1 << (pos * DIGIT_BITS + n if ordered else n)
+    return mask
+
+
+class DrawMatrix:
+    """
+    Integer form of a game's draw history, both ways round: per draw slot
+    its ball bitmask and special ball, and per ball bit a bitset over the
+    draw slots (`postings`), plus one bitset per draw time. Ticket matching
+    works on the slot bitsets, so one set of big-integer operations covers
+    every draw a ticket spans.
+    """
+
+    def __init__(self, game):
+        self.rules = rules_for(game.id, game.meta)
+        main = self.rules["main"]
+        field = self.rules["field"]
+        ordered = self.rules["ordered"]
+        self.mains: List[List[int]] = []
+        self.masks: List[int] = []
+        self.specials: List[Optional[int]] = []
+        size = (len(game.draws) + 7) // 8
+        ball_maps: Dict[int, bytearray] = {}
+        time_maps: Dict[str, bytearray] = {}
+        for slot, draw in enumerate(game.draws):
+            balls = [int(n) for n in draw["numbers"]]
+            mask = encode_balls(balls[:main], ordered)
+            self.mains.append(balls[:main])
+            self.masks.append(mask)
+            if field:
+                special = draw.get(field)
+                self.specials.append(int(special) if special is not None else None)
+            elif self.rules["special"] and len(balls) > main:
+                self.specials.append(balls[main])
+            else:
+                self.specials.append(None)
+            byte, bit = slot >> 3, 1 << (slot & 7)
+            for b in iter_bits(mask):
+                ball_maps.setdefault(b, bytearray(size))[byte] |= bit
+            time_maps.setdefault(draw.get("draw_time", "evening"), bytearray(size))[byte] |= bit
+        # Built as byte bitmaps, then converted once (see ComboIndex)
+        self.postings = {b: int.from_bytes(m, "little") for b, m in ball_maps.items()}
+        self.time_bits = {t: int.from_bytes(m, "little") for t, m in time_maps.items()}
+        self.all_slots = (1 << len(game.draws)) - 1
+        # Newest-first files put every date range on one run of slots
+        by_date = game.index.slots
+        self.contiguous = sum(map(len, by_date)) == len(game.draws) and all(
+            min(by_date[i]) > max(by_date[i + 1]) for i in range(len(by_date) - 1)
+        )
+
+    def at_least(self, ticket_mask: int, matches: int, slots: int) -> int:
+        """
+        Bitset of the draws in `slots` sharing at least `matches` ball bits
+        with `ticket_mask`. The per-draw counts are kept bit-sliced (counts[i]
+        holds bit i of every draw's count), so adding a ball's postings is a
+        few ANDs/XORs over the whole history at once.
+        """
+        if matches <= 0:
+            return slots
+        counts: List[int] = []
+        for b in iter_bits(ticket_mask):
+            carry = self.postings.get(b, 0) & slots
+            for i in range(len(counts)):
+                if not carry:
+                    break
+                counts[i], carry = counts[i] ^ carry, counts[i] & carry
+            if carry:
+                counts.append(carry)
+        # count >= matches, compared bit by bit from the top
+        above, equal = 0, slots
+        for i in range(max(len(counts), matches.bit_length()) - 1, -1, -1):
+            bit = counts[i] if i < len(counts) else 0
+            if matches >> i & 1:
+                equal &= bit
+            else:
+                above |= equal & bit
+                equal &= ~bit
+        return above | equal
+
+
+class TicketError(ValueError):
+    pass
+
+
+def draw_matrix(game) -> DrawMatrix:
+    return game.derived("draw_matrix", DrawMatrix)
+
+
+def range_bits(matrix: DrawMatrix, index, start: Optional[int], end: Optional[int]) -> int:
+    """Bitset of the slots dated start..end (inclusive ordinals, either may be None)."""
+    lo = 0 if start is None else bisect_left(index.ordinals, start)
+    hi = len(index.ordinals) if end is None else bisect_right(index.ordinals, end)
+    if lo >= hi:
+        return 0
+    if matrix.contiguous:
+        first, last = min(index.slots[hi - 1]), max(index.slots[lo])
+        return ((1 << (last + 1)) - 1) ^ ((1 << first) - 1)
+    bits = 0
+    for slots in index.slots[lo:hi]:
+        for slot in slots:
+            bits |= 1 << slot
+    return bits
+
+
+def resolve_slots(game, ticket) -> int:
+    """Bitset of the draw slots a ticket covers: one date, a date range, or the latest draw."""
+    matrix = draw_matrix(game)
+    index = game.index
+    if ticket.date:
+        ordinal = date_to_ordinal(ticket.date)
+        if ordinal is None:
+            raise TicketError(f"Invalid date: {ticket.date}")
+        slots = range_bits(matrix, index, ordinal, ordinal)
+        if not slots:
+            raise TicketError(f"No draw on {ticket.date}")
+    elif ticket.date_from or ticket.date_to:
+        start = date_to_ordinal(ticket.date_from) if ticket.date_from else None
+        end = date_to_ordinal(ticket.date_to) if ticket.date_to else None
+        if (ticket.date_from and start is None) or (ticket.date_to and end is None):
+            raise TicketError("Invalid date range")
+        slots = range_bits(matrix, index, start, end)
+    else:
+        slots = 1 if len(game.draws) else 0
+
+    if ticket.draw_time:
+        slots &= matrix.time_bits.get(ticket.draw_time, 0)
+    if not slots:
+        raise TicketError("No draws match this ticket")
+    return slots
+
+
+def split_ticket(rules: dict, ticket):
+    main = rules["main"]
+    numbers = list(ticket.numbers)
+    special = ticket.special
+    # Accept the special ball appended to the numbers, as the API returns it
+    if special is None and rules["special"] and not rules["field"] and len(numbers) == main + 1:
+        special = numbers.pop()
+    if len(numbers) != main:
+        raise TicketError(f"Expected {main} numbers, got {len(numbers)}")
+    # Range checks keep every ball inside its bit (or 10-bit digit group)
+    low = 0 if rules["ordered"] else 1
+    for n in numbers:
+        if not low <= n <= rules["max"]:
+            raise TicketError(f"Number {n} out of range {low}-{rules['max']}")
+    if not rules["ordered"] and len(set(numbers)) != len(numbers):
+        raise TicketError("Numbers must not repeat")
+    if special is not None and rules["special"]:
+        if not low <= special <= rules["special_max"]:
+            raise TicketError(f"{rules['special']} {special} out of range {low}-{rules['special_max']}")
+    return numbers, special
+
+
+def check_tickets(game, tickets: Sequence, min_matches: int = 1, max_pairs: int = 500000,
+                  max_draws: Optional[int] = None) -> List[dict]:
+    """
+    Check tickets against the draws they cover. Every ticket is resolved to
+    a bitset of draw slots through the date index first, so an oversized
+    request is rejected before any matching. The draws reaching min_matches
+    are then found with DrawMatrix.at_least(): a handful of big-integer
+    operations per ticket ball over all covered draws together, never a
+    loop over the draws. Only the draws that match are visited, to build
+    their entries, and at most max_draws entries are built for the whole
+    request: tickets past that budget report "draws_matched" and
+    "truncated" instead of every entry.
+    """
+    matrix = draw_matrix(game)
+    rules = matrix.rules
+    ordered = rules["ordered"]
+    special_name = rules["special"]
+
+    resolved = []
+    pairs = 0
+    for i, ticket in enumerate(tickets):
+        try:
+            numbers, special = split_ticket(rules, ticket)
+            slots = resolve_slots(game, ticket)
+        except TicketError as e:
+            resolved.append((i, None, None, None, str(e)))
+            continue
+        pairs += popcount(slots)
+        resolved.append((i, numbers, special, slots, None))
+    if pairs > max_pairs:
+        raise TicketError(f"Too many ticket/draw pairs ({pairs} > {max_pairs}); narrow the date ranges")
+
+    masks = matrix.masks
+    matching: Dict[tuple, int] = {}  # tickets repeating numbers and range share the work
+    results = []
+    budget = max_draws
+    for i, numbers, special, slots, error in resolved:
+        if error:
+            results.append({"ticket": i, "error": error})
+            continue
+        ticket_mask = encode_balls(numbers, ordered)
+        key = (ticket_mask, slots)
+        if key not in matching:
+            matching[key] = matrix.at_least(ticket_mask, min_matches, slots)
+
+        matched = popcount(matching[key])
+        shown = matched if budget is None else min(matched, budget)
+        draws = []
+        for slot in islice(iter_bits(matching[key]), shown):
+            shared = ticket_mask & masks[slot]
+            draw = game.draws[slot]
+            entry = {
+                "date": draw["date"],
+                "draw_time": draw.get("draw_time", "evening"),
+                "winning_numbers": draw["numbers"],
+                "matched": popcount(shared),
+            }
+            if ordered:
+                entry["matched_positions"] = [b // DIGIT_BITS for b in iter_bits(shared)]
+            else:
+                entry["matched_numbers"] = list(iter_bits(shared))
+            if special_name:
+                drawn_special = matrix.specials[slot]
+                if ordered:
+                    # Fireball: replacing one digit with it makes a straight match
+                    drawn = matrix.mains[slot]
+                    misses = [p for p in range(len(numbers)) if numbers[p] != drawn[p]]
+                    hit = len(misses) == 1 and numbers[misses[0]] == drawn_special
+                else:
+                    hit = special is not None and special == drawn_special
+                entry[f"{special_name}_hit"] = hit
+            draws.append(entry)
+        result = {"ticket": i, "draws_checked": popcount(slots), "draws_matched": matched, "draws": draws}
+        if shown < matched:
+            result["truncated"] = True
+        if budget is not None:
+            budget -= shown
+        results.append(result)
+    return results
@@ -1,21 +1,33 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from scraper import get_lotto_data
+from scraper import scraper_stats, SUPPORTED_GAMES
+from scraper_async import get_lotto_data, get_all_latest, aclose
 from typing import Optional
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await aclose()
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/")
 def home():
     return {
         "message": "Lottery API V11 (Master Config)",
-        "supported_games": [
-            "powerball", "mega-millions", "florida-lotto", 
-            "cash4life", "jackpot-triple-play", 
-            "pick-2", "pick-3", "pick-4", "pick-5", "fantasy-5"
-        ],
+        "supported_games": SUPPORTED_GAMES,
         "usage": "/api/{state}/{game}?date=YYYY-MM-DD"
     }
 
+@app.get("/api/health")
+def health():
+    return {"status": "ok", **scraper_stats()}
+
+# Must be registered before /api/{state}/{game}
+@app.get("/api/{state}/latest")
+async def read_all_latest(state: str):
+    return await get_all_latest(state)
+
 @app.get("/api/{state}/{game}")
-def read_lotto(state: str, game: str, date: Optional[str] = None):
-    return get_lotto_data(state, game, date)
+async def read_lotto(state: str, game: str, date: Optional[str] = None):
+    return await get_lotto_data(state, game, date)
@@ -1,11 +1,22 @@
+import asyncio
+import json
+import os
 import requests
 import ssl
+import threading
+import time
 from bs4 import BeautifulSoup
+from collections import OrderedDict, deque
+from html.parser import HTMLParser
 import re
-from datetime import datetime
+from datetime import datetime, timezone
 from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from urllib3.poolmanager import PoolManager
 from urllib3.util.ssl_ import create_urllib3_context
+from api.registry import GameRegistry
+from api.schedule import next_draw
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
@@ -13,25 +24,297 @@ HEADERS = {
 
 # --- 1. LEGACY SSL ADAPTER (The Key Fix) ---
 # This allows us to connect to the old Florida Lottery server
-class LegacyAdapter(HTTPAdapter):
-    def init_poolmanager(self, connections, maxsize, block=False):
-        # Create a custom SSL context
-        ctx = create_urllib3_context()
-        ctx.load_default_certs()
-        # LOWER SECURITY LEVEL to allow legacy ciphers (SECLEVEL=1)
-        # This fixes the SSLV3 Handshake Failure
+def build_legacy_context():
+    # Create a custom SSL context
+    ctx = create_urllib3_context()
+    ctx.load_default_certs()
+    # LOWER SECURITY LEVEL to allow legacy ciphers (SECLEVEL=1)
+    # This fixes the SSLV3 Handshake Failure
+    try:
+        ctx.set_ciphers('DEFAULT@SECLEVEL=1')
+    except Exception:
+        # Fallback if system doesn't support SECLEVEL configuration
+        ctx.set_ciphers('DEFAULT')
+    return ctx
+
+# Built once per process; loading the default certs is not free
+LEGACY_SSL_CONTEXT = build_legacy_context()
+
+# --- 2. PERSISTENT SESSIONS ---
+# One keep-alive session per host, created on first use and shared by every
+# request in the process, so the TCP + TLS handshake is paid once per pooled
+# connection instead of once per scrape.
+POOL_SIZE = int(os.environ.get("SCRAPER_POOL_SIZE", "10"))
+
+CONNECTION_STATS = {}  # host -> {"requests": n, "connections": n}
+_STATS_LOCK = threading.Lock()
+
+def _count(host, field):
+    with _STATS_LOCK:
+        stats = CONNECTION_STATS.setdefault(host, {"requests": 0, "connections": 0})
+        stats[field] += 1
+
+class CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _count(self.host, "connections")
+        return super()._new_conn()
+
+class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _count(self.host, "connections")
+        return super()._new_conn()
+
+class PooledAdapter(HTTPAdapter):
+    ssl_context = None
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        if self.ssl_context is not None:
+            pool_kwargs['ssl_context'] = self.ssl_context
+        self.poolmanager = PoolManager(num_pools=connections, maxsize=maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, **kwargs):
+        _count(urlparse(request.url).hostname, "requests")
+        return super().send(request, **kwargs)
+
+class LegacyAdapter(PooledAdapter):
+    ssl_context = LEGACY_SSL_CONTEXT
+
+# Hosts that need the legacy SSL context
+LEGACY_HOSTS = {"www.flalottery.com", "flalottery.com"}
+
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+def get_session(host):
+    session = _SESSIONS.get(host)
+    if session is None:
+        with _SESSIONS_LOCK:
+            session = _SESSIONS.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(HEADERS)
+                adapter_cls = LegacyAdapter if host in LEGACY_HOSTS else PooledAdapter
+                adapter = adapter_cls(pool_connections=1, pool_maxsize=POOL_SIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _SESSIONS[host] = session
+    return session
+
+def fetch(url, timeout=10, headers=None, deadline=None):
+    host = urlparse(url).hostname
+    timeout = budget_timeout(timeout, deadline)
+    breaker = breaker_for(host)
+    breaker.check()
+    start = time.monotonic()
+    try:
+        response = get_session(host).get(url, timeout=timeout, headers=headers)
+    except Exception:
+        breaker.record(False, time.monotonic() - start)
+        raise
+    breaker.record(response.status_code < 500, time.monotonic() - start)
+    return response
+
+def connection_stats():
+    """Per-host request and new-connection counts; reused = requests - connections."""
+    with _STATS_LOCK:
+        hosts = {host: dict(stats, reused=max(0, stats["requests"] - stats["connections"]))
+                 for host, stats in CONNECTION_STATS.items()}
+    return {"pool_size": POOL_SIZE, "hosts": hosts}
+
+# --- 3. CIRCUIT BREAKERS AND LATENCY BUDGET ---
+# Each host gets a breaker over its last BREAKER_WINDOW calls. Errors, 5xx
+# responses and calls slower than BREAKER_SLOW_CALL all count as failures;
+# at BREAKER_FAILURE_RATE the breaker opens and calls fail immediately for
+# BREAKER_COOLDOWN seconds, then one probe call (half-open) decides whether
+# it closes again.
+BREAKER_WINDOW = int(os.environ.get("SCRAPER_BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.environ.get("SCRAPER_BREAKER_MIN_CALLS", "5"))
+BREAKER_FAILURE_RATE = float(os.environ.get("SCRAPER_BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_SLOW_CALL = float(os.environ.get("SCRAPER_BREAKER_SLOW_CALL", "5"))
+BREAKER_COOLDOWN = float(os.environ.get("SCRAPER_BREAKER_COOLDOWN", "30"))
+
+# Default end-to-end budget for one API request; every upstream call gets
+# at most what is left of it
+REQUEST_BUDGET = float(os.environ.get("SCRAPER_REQUEST_BUDGET", "12"))
+
+class CircuitOpenError(Exception):
+    pass
+
+class BudgetExceededError(Exception):
+    pass
+
+def deadline_for(budget=None):
+    return time.monotonic() + (REQUEST_BUDGET if budget is None else budget)
+
+def budget_timeout(timeout, deadline):
+    """The per-call timeout, cut down to what is left of the request's budget."""
+    if deadline is None:
+        return timeout
+    left = deadline - time.monotonic()
+    if left <= 0.05:
+        raise BudgetExceededError("Latency budget exhausted")
+    return min(timeout, left)
+
+class CircuitBreaker:
+    def __init__(self, host):
+        self.host = host
+        self.state = "closed"
+        self.outcomes = deque(maxlen=BREAKER_WINDOW)
+        self.opened_at = 0.0
+        self.probing = False
+        self.lock = threading.Lock()
+        self.stats = {"opened": 0, "rejected": 0, "slow": 0, "failures": 0}
+
+    def check(self):
+        """
+        Raise CircuitOpenError unless a call may go out now. Returns True
+        when the call is the half-open probe, which only its caller may
+        release().
+        """
+        with self.lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= BREAKER_COOLDOWN:
+                self.state = "half_open"
+            if self.state == "closed" or (self.state == "half_open" and not self.probing):
+                self.probing = self.state == "half_open"
+                return self.probing
+            self.stats["rejected"] += 1
+            retry = max(0, BREAKER_COOLDOWN - (time.monotonic() - self.opened_at))
+        raise CircuitOpenError(f"{self.host} circuit open, retry in {retry:.0f}s")
+
+    def record(self, ok, seconds):
+        slow = seconds >= BREAKER_SLOW_CALL
+        with self.lock:
+            self.stats["slow"] += slow
+            self.stats["failures"] += not ok
+            healthy = ok and not slow
+            if self.state == "half_open":
+                self.probing = False
+                if healthy:
+                    self.state = "closed"
+                    self.outcomes.clear()
+                else:
+                    self._open()
+                return
+            self.outcomes.append(healthy)
+            failures = self.outcomes.count(False)
+            if len(self.outcomes) >= BREAKER_MIN_CALLS and failures / len(self.outcomes) >= BREAKER_FAILURE_RATE:
+                self._open()
+
+    def release(self):
+        """Give back a half-open probe whose call never completed."""
+        with self.lock:
+            self.probing = False
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.outcomes.clear()
+        self.stats["opened"] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats, state=self.state, window=len(self.outcomes),
+                        window_failures=self.outcomes.count(False))
+
+_BREAKERS = {}
+_BREAKERS_LOCK = threading.Lock()
+
+def breaker_for(host):
+    breaker = _BREAKERS.get(host)
+    if breaker is None:
+        with _BREAKERS_LOCK:
+            breaker = _BREAKERS.setdefault(host, CircuitBreaker(host))
+    return breaker
+
+def breaker_stats():
+    return {host: breaker.snapshot() for host, breaker in list(_BREAKERS.items())}
+
+# --- 4. SINGLE FLIGHT ---
+# Concurrent callers asking for the same upstream resource (e.g. every app
+# client refreshing /powerball the moment a draw posts) share one fetch:
+# the first caller runs it, the rest wait for its result or exception.
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.tasks = {}
+        self.stats = {"leaders": 0, "coalesced": 0, "by_source": {}}
+
+    def _record(self, key, field):
+        # key[0] names the source: "latest", "national", "legacy"
+        self.stats[field] += 1
+        source = self.stats["by_source"].setdefault(key[0], {"leaders": 0, "coalesced": 0})
+        source[field] += 1
+
+    def do(self, key, fn):
+        """Run fn() once for all threads calling with `key` at the same time."""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+            self._record(key, "leaders" if leader else "coalesced")
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
         try:
-            ctx.set_ciphers('DEFAULT@SECLEVEL=1')
-        except Exception:
-            # Fallback if system doesn't support SECLEVEL configuration
-            ctx.set_ciphers('DEFAULT')
-        
-        self.poolmanager = PoolManager(
-            num_pools=connections,
-            maxsize=maxsize,
-            block=block,
-            ssl_context=ctx
-        )
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.event.set()
+
+    async def do_async(self, key, fn):
+        """
+        Async version: fn() returns a coroutine, run once as a task per event
+        loop. Waiters are shielded, so a caller that is cancelled (timeout,
+        disconnect) doesn't cancel the fetch for the others.
+        """
+        task_key = (id(asyncio.get_running_loop()), key)
+        with self.lock:
+            task = self.tasks.get(task_key)
+            leader = task is None
+            if leader:
+                task = self.tasks[task_key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda t: self._finish_task(task_key, t))
+            self._record(key, "leaders" if leader else "coalesced")
+        return await asyncio.shield(task)
+
+    def _finish_task(self, task_key, task):
+        with self.lock:
+            self.tasks.pop(task_key, None)
+        if not task.cancelled():
+            task.exception()  # retrieved, even if every waiter went away
+
+    def snapshot(self):
+        with self.lock:
+            return {"leaders": self.stats["leaders"], "coalesced": self.stats["coalesced"],
+                    "in_flight": len(self.calls) + len(self.tasks),
+                    "by_source": {k: dict(v) for k, v in self.stats["by_source"].items()}}
+
+FLIGHTS = SingleFlight()
+
+SUPPORTED_GAMES = [
+    "powerball", "mega-millions", "florida-lotto",
+    "cash4life", "jackpot-triple-play",
+    "pick-2", "pick-3", "pick-4", "pick-5", "fantasy-5"
+]
 
 def get_game_config(game_input):
     g = game_input.lower().replace(" ", "").replace("-", "")
@@ -57,140 +340,697 @@ def extract_number(text):
     if match: return match.group(0)
     return None
 
+# Fetching and parsing are split so the async engine (scraper_async.py)
+# can reuse the parse_* functions on bodies fetched with httpx.
+
 # --- SOURCE 1: LOTTERY USA (LATEST) ---
-def scrape_latest(state, game_slug, limit):
-    usa_slug = game_slug
-    # Map legacy codes back to USA slugs
-    legacy_map = {"l6":"lotto", "jtp":"jackpot-triple-play", "ff":"fantasy-5", 
-                  "p2":"pick-2", "p3":"pick-3", "p4":"pick-4", "p5":"pick-5"}
-    if game_slug in legacy_map: usa_slug = legacy_map[game_slug]
-    
+# Map legacy codes back to USA slugs
+USA_SLUGS = {"l6":"lotto", "jtp":"jackpot-triple-play", "ff":"fantasy-5",
+             "p2":"pick-2", "p3":"pick-3", "p4":"pick-4", "p5":"pick-5"}
+
+def latest_url(state, game_slug):
+    usa_slug = USA_SLUGS.get(game_slug, game_slug)
+    return f"https://www.lotteryusa.com/{state.lower()}/{usa_slug}/"
+
+# "stream" stops parsing at the first qualifying row; "soup" builds the
+# full BeautifulSoup tree (the original path, kept for comparison)
+LATEST_PARSER = os.environ.get("SCRAPER_LATEST_PARSER", "stream")
+STREAM_CHUNK = 8192
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+             "meta", "param", "source", "track", "wbr"}
+
+def _first_numbers(row, limit):
+    candidates = re.findall(r'\b\d{1,2}\b', row)
+    return candidates[:limit] if len(candidates) >= limit else []
+
+def parse_latest_soup(content, limit):
+    soup = BeautifulSoup(content, 'html.parser')
+    rows = soup.find_all(['tr', 'ul'])
+    target_row = None
+    for row in rows:
+        if len(re.findall(r'\d', row.text)) >= limit:
+            target_row = row
+            break
+    if target_row:
+        return _first_numbers(target_row.text, limit)
+    return []
+
+class FirstRowScanner(HTMLParser):
+    """
+    Finds the row parse_latest_soup would pick without building a tree: the
+    first <tr>/<ul> (in start-tag order) whose text has `limit` digits.
+
+    An enclosing row holds all of its children's text, so the answer is the
+    first outermost row to close with enough digits. End tags pop the open
+    stack the way BeautifulSoup's html.parser builder does.
+    """
+
+    def __init__(self, limit):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.stack = []   # (tag, text offset for tr/ul, else None)
+        self.rows = 0     # open tr/ul elements
+        self.parts = []   # text since the outermost open row started
+        self.skip = 0     # inside <script>/<style>, which .text leaves out
+        self.found = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        is_row = tag in ('tr', 'ul')
+        if is_row and not self.rows:
+            self.parts = []
+        self.stack.append((tag, len(self.parts) if is_row else None))
+        self.rows += is_row
+        if tag in ('script', 'style'):
+            self.skip += 1
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                break
+        else:
+            return
+        popped = self.stack[i:]
+        del self.stack[i:]
+        for name, offset in popped:
+            if name in ('script', 'style'):
+                self.skip -= 1
+            if offset is not None:
+                self.rows -= 1
+        outer = next((offset for _, offset in popped if offset is not None), None)
+        if outer is not None and not self.rows and self.found is None:
+            text = ''.join(self.parts[outer:])
+            if len(re.findall(r'\d', text)) >= self.limit:
+                self.found = text
+
+    def handle_data(self, data):
+        if self.rows and not self.skip:
+            self.parts.append(data)
+
+def parse_latest_stream(content, limit):
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    scanner = FirstRowScanner(limit)
+    for start in range(0, len(content), STREAM_CHUNK):
+        scanner.feed(content[start:start + STREAM_CHUNK])
+        if scanner.found is not None:
+            break
+    else:
+        # Rows still open at the end are closed like the tree builder does
+        scanner.close()
+        while scanner.stack and scanner.found is None:
+            scanner.handle_endtag(scanner.stack[0][0])
+    return _first_numbers(scanner.found, limit) if scanner.found is not None else []
+
+def parse_latest(content, limit):
+    if LATEST_PARSER == "soup":
+        return parse_latest_soup(content, limit)
+    return parse_latest_stream(content, limit)
+
+def scrape_latest(state, game_slug, limit, deadline=None):
     data = {"source": "lotteryusa.com", "winning_numbers": [], "debug_url": ""}
-    url = f"https://www.lotteryusa.com/{state.lower()}/{usa_slug}/"
+    url = latest_url(state, game_slug)
     data['debug_url'] = url
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        rows = soup.find_all(['tr', 'ul'])
-        target_row = None
-        for row in rows:
-            if len(re.findall(r'\d', row.text)) >= limit:
-                target_row = row
-                break
-        if target_row:
-             candidates = re.findall(r'\b\d{1,2}\b', target_row.text)
-             if len(candidates) >= limit:
-                 data['winning_numbers'] = candidates[:limit]
+        response = fetch(url, timeout=10, deadline=deadline)
+        data['winning_numbers'] = parse_latest(response.content, limit)
     except Exception as e:
         data['error'] = str(e)
     return data
 
 # --- SOURCE 2: LOTTERY.NET (NATIONAL HISTORY) ---
 # Reverted to V14 Logic which worked for Mega Millions
-def scrape_national_history(game_slug, date_obj, limit):
-    data = {"source": "lottery.net", "winning_numbers": [], "debug_url": ""}
-    url = f"https://www.lottery.net/{game_slug}/numbers/{date_obj.year}"
-    data['debug_url'] = url
-    
-    search_terms = [
+def national_url(game_slug, date_obj):
+    return f"https://www.lottery.net/{game_slug}/numbers/{date_obj.year}"
+
+def national_search_terms(date_obj):
+    return [
         date_obj.strftime("%b %-d"),       # Oct 25
         date_obj.strftime("%B %-d"),       # October 25
         date_obj.strftime("%A, %B %-d"),   # Tuesday, October 25
     ]
-    
+
+# "Oct 25", "October 25", "Tuesday, October 25" (the year comes from the URL)
+MONTH_DAY = re.compile(r'\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})\b', re.IGNORECASE)
+MONTHS = {m: i + 1 for i, m in enumerate(["jan", "feb", "mar", "apr", "may", "jun",
+                                          "jul", "aug", "sep", "oct", "nov", "dec"])}
+
+def row_numbers(text):
+    candidates = re.findall(r'\b\d{1,2}\b', text)
+    # Filter candidates: Month/Day often appear first.
+    # But simpler heuristic: Grab all digits, check length.
+    valid_nums = []
+    for num in candidates:
+        # Basic filter: don't add the year
+        if len(num) == 4: continue
+        valid_nums.append(num)
+    # Remove duplicates? National games usually don't repeat numbers
+    return list(dict.fromkeys(valid_nums))
+
+def parse_national_year(content, year):
+    """
+    Parse a lottery.net year page once into {YYYY-MM-DD: numbers}. Each <tr>
+    is keyed by the first month/day in its text; numbers are the row's
+    deduplicated 1-2 digit tokens, so the last `limit` are the winners.
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    dates = {}
+    for row in soup.find_all('tr'):
+        for text in row.stripped_strings:
+            match = MONTH_DAY.search(text)
+            if not match:
+                continue
+            try:
+                key = datetime(year, MONTHS[match.group(1).lower()], int(match.group(2))).strftime("%Y-%m-%d")
+            except ValueError:
+                break
+            dates.setdefault(key, row_numbers(row.text))
+            break
+    return dates
+
+def national_lookup(dates, date_obj, limit):
+    """Returns (winning_numbers, error) for date_obj from a parsed year page."""
+    valid_nums = dates.get(date_obj.strftime("%Y-%m-%d"))
+    if valid_nums is None:
+        return [], f"Date not found. Searched {national_search_terms(date_obj)}"
+    # If we found too many, assume the last 'limit' are the winners
+    if len(valid_nums) >= limit:
+        return valid_nums[-limit:], None
+    return [], None
+
+# Parsed year pages, keyed by (game, year). Past years don't change, so
+# they stay until evicted; the current year is refetched after a short TTL.
+YEAR_CACHE_SIZE = int(os.environ.get("SCRAPER_YEAR_CACHE_SIZE", "32"))
+YEAR_CACHE_DIR = os.environ.get("SCRAPER_CACHE_DIR")  # optional on-disk copy
+CURRENT_YEAR_TTL = int(os.environ.get("SCRAPER_CURRENT_YEAR_TTL", "900"))
+
+class YearPageCache:
+    def __init__(self, size=YEAR_CACHE_SIZE, cache_dir=YEAR_CACHE_DIR, current_ttl=CURRENT_YEAR_TTL):
+        self.size = size
+        self.cache_dir = cache_dir
+        self.current_ttl = current_ttl
+        self.pages = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def _fresh(self, year, fetched_at):
+        # A year is final once the page was fetched after it ended
+        if datetime.fromtimestamp(fetched_at).year > year:
+            return True
+        return time.time() - fetched_at < self.current_ttl
+
+    def _path(self, game_slug, year):
+        return os.path.join(self.cache_dir, f"lottery_net_{game_slug}_{year}.json")
+
+    def _read_disk(self, game_slug, year):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(game_slug, year), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, game_slug, year, entry):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(game_slug, year)
+            with open(path + ".tmp", "w") as f:
+                json.dump(entry, f)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"Year cache write failed: {e}")
+
+    def _remember(self, key, entry):
+        self.pages[key] = entry
+        self.pages.move_to_end(key)
+        while len(self.pages) > self.size:
+            self.pages.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def peek(self, game_slug, year):
+        """The cached page whatever its age (past draws don't change), or None."""
+        with self.lock:
+            entry = self.pages.get((game_slug, year))
+        if entry is None:
+            entry = self._read_disk(game_slug, year)
+        return entry['dates'] if entry else None
+
+    def get(self, game_slug, year):
+        key = (game_slug, year)
+        with self.lock:
+            entry = self.pages.get(key)
+            if entry and self._fresh(year, entry['fetched_at']):
+                self.pages.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry['dates']
+        entry = self._read_disk(game_slug, year)
+        with self.lock:
+            if entry and self._fresh(year, entry['fetched_at']):
+                self._remember(key, entry)
+                self.stats["disk_hits"] += 1
+                return entry['dates']
+            self.stats["misses"] += 1
+        return None
+
+    def put(self, game_slug, year, dates):
+        # Pages without any dated rows are layout failures: don't keep them
+        if not dates:
+            return
+        entry = {'fetched_at': time.time(), 'dates': dates}
+        with self.lock:
+            self._remember((game_slug, year), entry)
+        self._write_disk(game_slug, year, entry)
+
+NATIONAL_PAGES = YearPageCache()
+
+def national_year(game_slug, year, url, deadline=None):
+    response = fetch(url, timeout=10, deadline=deadline)
+    dates = parse_national_year(response.content, year)
+    NATIONAL_PAGES.put(game_slug, year, dates)
+    return dates
+
+def scrape_national_history(game_slug, date_obj, limit, deadline=None):
+    data = {"source": "lottery.net", "winning_numbers": [], "debug_url": ""}
+    url = national_url(game_slug, date_obj)
+    data['debug_url'] = url
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        target_container = None
-        for term in search_terms:
-            el = soup.find(string=re.compile(re.escape(term), re.IGNORECASE))
-            if el:
-                curr = el.parent
-                for _ in range(4):
-                    if curr.name == 'tr': 
-                        target_container = curr
-                        break
-                    if curr.parent: curr = curr.parent
-                if target_container: break
-        
-        if target_container:
-            candidates = re.findall(r'\b\d{1,2}\b', target_container.text)
-            # Filter candidates: Month/Day often appear first.
-            # But simpler heuristic: Grab all digits, check length.
-            valid_nums = []
-            for num in candidates:
-                # Basic filter: don't add the year
-                if len(num) == 4: continue
-                valid_nums.append(num)
-            
-            # Remove duplicates? National games usually don't repeat numbers
-            valid_nums = list(dict.fromkeys(valid_nums))
-            
-            # If we found too many, assume the last 'limit' are the winners
-            if len(valid_nums) >= limit:
-                 data['winning_numbers'] = valid_nums[-limit:]
-        else:
-            data['error'] = f"Date not found. Searched {search_terms}"
+        dates = NATIONAL_PAGES.get(game_slug, date_obj.year)
+        if dates is None:
+            dates = FLIGHTS.do(("national", game_slug, date_obj.year),
+                               lambda: national_year(game_slug, date_obj.year, url, deadline))
+        nums, error = national_lookup(dates, date_obj, limit)
+        data['winning_numbers'] = nums
+        if error: data['error'] = error
     except Exception as e:
         data['error'] = str(e)
     return data
 
 # --- SOURCE 3: FLORIDA LEGACY TEXT (STATE HISTORY) ---
-def scrape_florida_legacy(code, date_obj, limit):
+def legacy_url(code):
+    return f"https://www.flalottery.com/exptkt/{code}.html"
+
+LEGACY_DATE = re.compile(r'\b(\d{2}/\d{2}/\d{2})\b')
+LEGACY_TIME = re.compile(r'\s+([EM])\b')
+LEGACY_FIREBALL = re.compile(r'FB\s*(\d+)')
+
+def parse_florida_file(text):
+    """
+    Index an exptkt text file once: {YYYY-MM-DD: [draw, ...]} in file order,
+    each draw {"draw_time", "numbers", optional "fireball"}. Line format:
+    10/24/23  E  1- 2- 3  FB 4 (the E/M draw code and fireball are optional).
+    """
+    index = {}
+    for line in text.split('\n'):
+        match = LEGACY_DATE.search(line)
+        if not match:
+            continue
+        try:
+            key = datetime.strptime(match.group(1), "%m/%d/%y").strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+        code = LEGACY_TIME.match(line, match.end())
+        # Remove the date, then every 1-2 digit token in order (limit applied on lookup)
+        nums = re.findall(r'\d{1,2}', line.replace(match.group(1), ""))
+        if not nums:
+            continue
+        draw = {"draw_time": "midday" if code and code.group(1) == "M" else "evening", "numbers": nums}
+        fireball = LEGACY_FIREBALL.search(line, match.end())
+        if fireball:
+            draw["fireball"] = fireball.group(1)
+        index.setdefault(key, []).append(draw)
+    return index
+
+# Draws on one date, latest first: the evening draw is the headline result,
+# as it was when the scraper took the first line of the date. Neither the
+# exptkt files nor data/*.json (midday first) are relied on for the order.
+TIME_ORDER = {"evening": 0, "midday": 1}
+
+def legacy_lookup(index, date_obj, limit):
+    """Returns (draws, error); draws are in TIME_ORDER, the first is the headline result."""
+    draws = index.get(date_obj.strftime("%Y-%m-%d"))
+    if not draws:
+        return [], f"Date {date_obj.strftime('%m/%d/%y')} not found in file."
+    found = []
+    for draw in sorted(draws, key=lambda d: TIME_ORDER.get(d["draw_time"], 0)):
+        item = {"draw_time": draw["draw_time"], "winning_numbers": draw["numbers"][:limit]}
+        if "fireball" in draw:
+            item["fireball"] = draw["fireball"]
+        found.append(item)
+    return found, None
+
+# exptkt files are kept (on disk too, with SCRAPER_CACHE_DIR) with their
+# ETag/Last-Modified. Within LEGACY_REVALIDATE seconds the parsed index is
+# used as is; after that a conditional GET either confirms it (304) or
+# downloads and indexes the new file.
+LEGACY_REVALIDATE = int(os.environ.get("SCRAPER_LEGACY_REVALIDATE", "300"))
+
+class LegacyFileCache:
+    def __init__(self, cache_dir=YEAR_CACHE_DIR, revalidate_after=LEGACY_REVALIDATE):
+        self.cache_dir = cache_dir
+        self.revalidate_after = revalidate_after
+        self.files = {}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "not_modified": 0, "downloads": 0, "stale_served": 0}
+
+    def _path(self, code, ext):
+        return os.path.join(self.cache_dir, f"exptkt_{code}.{ext}")
+
+    def _entry(self, code):
+        entry = self.files.get(code)
+        if entry is None and self.cache_dir:
+            try:
+                with open(self._path(code, "json"), "r") as f:
+                    entry = json.load(f)
+                with open(self._path(code, "txt"), "r") as f:
+                    entry['index'] = parse_florida_file(f.read())
+                self.files[code] = entry
+            except (OSError, ValueError):
+                entry = None
+        return entry
+
+    def peek(self, code):
+        """The last indexed file whatever its age, or None."""
+        with self.lock:
+            entry = self._entry(code)
+        return entry['index'] if entry else None
+
+    def fresh(self, code):
+        """The parsed index if it was checked recently, else None."""
+        with self.lock:
+            entry = self._entry(code)
+            if entry and time.time() - entry['checked_at'] < self.revalidate_after:
+                self.stats["hits"] += 1
+                return entry['index']
+        return None
+
+    def conditional_headers(self, code):
+        with self.lock:
+            entry = self._entry(code)
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def apply(self, code, status, headers, text):
+        """Record a (conditional) response and return the index to use."""
+        now = time.time()
+        with self.lock:
+            entry = self._entry(code)
+            if status == 304 and entry:
+                entry['checked_at'] = now
+                self.stats["not_modified"] += 1
+                return entry['index']
+            if status != 200:
+                raise ValueError(f"HTTP {status}")
+            entry = {'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified'),
+                     'checked_at': now, 'index': parse_florida_file(text)}
+            self.files[code] = entry
+            self.stats["downloads"] += 1
+        self._write_disk(code, entry, text)
+        return entry['index']
+
+    def stale(self, code):
+        """Last known index when revalidation fails, or None."""
+        with self.lock:
+            entry = self._entry(code)
+            if entry:
+                self.stats["stale_served"] += 1
+                return entry['index']
+        return None
+
+    def _write_disk(self, code, entry, text):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for ext, write in (("txt", lambda f: f.write(text)),
+                               ("json", lambda f: json.dump({k: v for k, v in entry.items() if k != 'index'}, f))):
+                path = self._path(code, ext)
+                with open(path + ".tmp", "w") as f:
+                    write(f)
+                os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"Legacy cache write failed: {e}")
+
+FLORIDA_FILES = LegacyFileCache()
+
+def revalidate_florida_file(code, deadline=None):
+    # Pooled session with the legacy SSL adapter
+    response = fetch(legacy_url(code), timeout=15, headers=FLORIDA_FILES.conditional_headers(code),
+                     deadline=deadline)
+    return FLORIDA_FILES.apply(code, response.status_code, response.headers, response.text)
+
+def florida_index(code, deadline=None):
+    index = FLORIDA_FILES.fresh(code)
+    if index is not None:
+        return index
+    try:
+        return FLIGHTS.do(("legacy", code), lambda: revalidate_florida_file(code, deadline))
+    except Exception:
+        index = FLORIDA_FILES.stale(code)
+        if index is None:
+            raise
+        return index
+
+def legacy_result(data, draws, error):
+    if draws:
+        data['winning_numbers'] = draws[0]['winning_numbers']
+        data['draws'] = draws
+    if error: data['error'] = error
+    return data
+
+def scrape_florida_legacy(code, date_obj, limit, deadline=None):
     data = {"source": "flalottery.com (Text)", "winning_numbers": [], "debug_url": ""}
-    url = f"https://www.flalottery.com/exptkt/{code}.html"
+    url = legacy_url(code)
     data['debug_url'] = url
-    
-    # Format: 10/24/23 (Two digit year)
-    search_date = date_obj.strftime("%m/%d/%y")
-    
     try:
-        # USE CUSTOM SSL ADAPTER
-        session = requests.Session()
-        session.mount('https://', LegacyAdapter())
-        
-        response = session.get(url, headers=HEADERS, timeout=15)
-        lines = response.text.split('\n')
-        
-        target_line = None
-        for line in lines:
-            if search_date in line:
-                target_line = line
-                break # Takes the first match (usually Evening draw)
-        
-        if target_line:
-            # Line format: 10/24/23  1-2-3-4
-            # Remove the date
-            clean_line = line.replace(search_date, "")
-            # Extract numbers
-            nums = re.findall(r'\d{1,2}', clean_line)
-            if nums:
-                data['winning_numbers'] = nums[:limit]
-        else:
-            data['error'] = f"Date {search_date} not found in file."
-            
+        draws, error = legacy_lookup(florida_index(code, deadline), date_obj, limit)
+        legacy_result(data, draws, error)
     except Exception as e:
         data['error'] = f"Legacy Error: {str(e)}"
     return data
 
+# --- LATEST RESULTS CACHE ---
+# Latest results only change after a draw, so cache them per (state, game)
+# until the game's next scheduled draw. Expired entries are still served
+# (stale-while-revalidate) while one background refresh runs.
+
+# Draw schedule ids for the codes get_game_config returns
+SCHEDULE_IDS = {"l6": "florida-lotto", "jtp": "jackpot-triple-play", "ff": "fantasy-5",
+                "p2": "pick-2", "p3": "pick-3", "p4": "pick-4", "p5": "pick-5"}
+PENDING_TTL = 300          # draw happened but the page still shows the old numbers
+PENDING_WINDOW = 3 * 3600  # how long after a draw we keep polling for it
+ERROR_TTL = 60             # failed fetches are retried after this
+MAX_STALE = 6 * 3600       # older entries are refetched before answering
+
+class LatestCache:
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self.entries = {}
+        self.refreshing = set()
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
+
+    def _next_draw(self, game_slug, now):
+        game_id = SCHEDULE_IDS.get(game_slug, game_slug)
+        upcoming = next_draw(game_id, now=datetime.fromtimestamp(now, timezone.utc))
+        return upcoming[0].timestamp() if upcoming else now + PENDING_TTL
+
+    def _store(self, key, data, now):
+        previous = self.entries.get(key)
+        if data.get('error') or not data.get('winning_numbers'):
+            # Keep serving the last good result; retry soon
+            if previous:
+                previous['expires_at'] = now + ERROR_TTL
+                return previous
+            entry = {'data': data, 'cached_at': now, 'expires_at': now + ERROR_TTL,
+                     'draw_due': self._next_draw(key[1], now)}
+        else:
+            draw_due = self._next_draw(key[1], now)
+            expires_at = draw_due
+            # Same numbers as before a draw that just happened: the page
+            # hasn't posted it yet, so keep polling for it
+            if (previous and previous['draw_due'] <= now < previous['draw_due'] + PENDING_WINDOW
+                    and previous['data'].get('winning_numbers') == data['winning_numbers']):
+                draw_due = previous['draw_due']
+                expires_at = now + PENDING_TTL
+            entry = {'data': data, 'cached_at': now, 'expires_at': expires_at, 'draw_due': draw_due}
+        self.entries[key] = entry
+        return entry
+
+    def _fetch(self, key, limit, deadline=None):
+        return FLIGHTS.do(("latest",) + key, lambda: self.fetch(key[0], key[1], limit, deadline=deadline))
+
+    def _refresh(self, key, limit):
+        data = None
+        try:
+            data = self._fetch(key, limit)
+        finally:
+            self.finish_refresh(key, data)
+
+    def finish_refresh(self, key, data):
+        with self.lock:
+            if data is not None:
+                self._store(key, data, time.time())
+                self.stats["refreshes"] += 1
+            self.refreshing.discard(key)
+
+    def lookup(self, state, game_slug):
+        """(key, cached response or None, whether the caller should start a refresh)."""
+        key = (state.lower(), game_slug)
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and now < entry['expires_at']:
+                self.stats["hits"] += 1
+                return key, self._response(entry, now, "hit"), False
+            if entry and entry['data'].get('winning_numbers') and now - entry['cached_at'] < MAX_STALE:
+                self.stats["stale_hits"] += 1
+                refresh = key not in self.refreshing
+                self.refreshing.add(key)
+                return key, self._response(entry, now, "stale"), refresh
+            self.stats["misses"] += 1
+        return key, None, False
+
+    def store(self, key, data):
+        with self.lock:
+            entry = self._store(key, data, time.time())
+        # A failed fetch keeps the last good entry: say it is stale
+        return self._response(entry, time.time(), "miss" if entry['data'] is data else "stale")
+
+    def get(self, state, game_slug, limit, deadline=None):
+        key, response, refresh = self.lookup(state, game_slug)
+        if refresh:
+            threading.Thread(target=self._refresh, args=(key, limit), daemon=True).start()
+        if response is not None:
+            return response
+        return self.store(key, self._fetch(key, limit, deadline))
+
+    def _response(self, entry, now, status):
+        data = dict(entry['data'])
+        data['cache'] = status
+        data['cached_at'] = datetime.fromtimestamp(entry['cached_at'], timezone.utc).isoformat()
+        data['age'] = int(now - entry['cached_at'])
+        return data
+
+LATEST_CACHE = LatestCache(scrape_latest)
+
+# --- TIERED RESOLVER ---
+# Dated requests are answered from the first tier that has the draw:
+#   memory  the repository's data/florida_*.json history (api.registry)
+#   disk    year pages / exptkt files already scraped (YearPageCache, LegacyFileCache)
+#   live    the upstream sites
+# The first two never touch the network. `tier` records which one answered.
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+HISTORY = GameRegistry(DATA_DIR)
+NATIONAL_SLUGS = {"powerball", "mega-millions", "cash4life"}
+RESOLVER_STATS = {"memory": 0, "disk": 0, "live": 0}
+
+def history_game_id(state, clean_slug):
+    # National games draw the same numbers in every state
+    if clean_slug in NATIONAL_SLUGS:
+        return clean_slug
+    if state.lower() == "florida":
+        return SCHEDULE_IDS.get(clean_slug, clean_slug)
+    return None
+
+def history_result(state, clean_slug, date_obj, limit):
+    game_id = history_game_id(state, clean_slug)
+    game = HISTORY.get(game_id) if game_id else None
+    if game is None:
+        return None
+    found = game.index.lookup(date_obj.strftime("%Y-%m-%d"))
+    if not found:
+        return None
+    draws = []
+    for draw in sorted(found, key=lambda d: TIME_ORDER.get(d.get("draw_time"), 0)):
+        item = {"draw_time": draw.get("draw_time", "evening"), "winning_numbers": list(draw["numbers"][:limit])}
+        for field in ("fireball", "cashball"):
+            if field in draw:
+                item[field] = draw[field]
+        draws.append(item)
+    return {"source": f"local history ({game.meta['file']})", "tier": "memory",
+            "winning_numbers": draws[0]["winning_numbers"], "draws": draws}
+
+def cached_scrape_result(clean_slug, date_obj, limit, is_national):
+    if is_national:
+        dates = NATIONAL_PAGES.peek(clean_slug, date_obj.year)
+        if not dates or date_obj.strftime("%Y-%m-%d") not in dates:
+            return None
+        nums, _ = national_lookup(dates, date_obj, limit)
+        return {"source": "lottery.net (cached)", "tier": "disk", "winning_numbers": nums,
+                "debug_url": national_url(clean_slug, date_obj)}
+    index = FLORIDA_FILES.peek(clean_slug)
+    if not index or date_obj.strftime("%Y-%m-%d") not in index:
+        return None
+    draws, _ = legacy_lookup(index, date_obj, limit)
+    data = {"source": "flalottery.com (Text, cached)", "tier": "disk", "winning_numbers": [],
+            "debug_url": legacy_url(clean_slug)}
+    return legacy_result(data, draws, None)
+
+def latest_fallback(state, clean_slug, limit, result):
+    """
+    When the latest fetch failed (source down, circuit open, budget spent)
+    and nothing was cached, answer with the newest draw in local history.
+    """
+    if result.get('winning_numbers') or not result.get('error'):
+        return result
+    game_id = history_game_id(state, clean_slug)
+    game = HISTORY.get(game_id) if game_id else None
+    if game is None or not len(game.draws):
+        return result
+    local = history_result(state, clean_slug, datetime.strptime(game.draws[0]["date"], "%Y-%m-%d"), limit)
+    if local is None:
+        return result
+    local['upstream_error'] = result['error']
+    return local
+
+def resolve_local(state, clean_slug, date_obj, limit, is_national):
+    """The memory or disk tier's answer for a dated request, or None to go live."""
+    result = history_result(state, clean_slug, date_obj, limit)
+    scrapeable = is_national or state.lower() == "florida"
+    if result is None and scrapeable:
+        result = cached_scrape_result(clean_slug, date_obj, limit, is_national)
+    if result is not None or scrapeable:
+        RESOLVER_STATS[result["tier"] if result else "live"] += 1
+    return result
+
 # --- CONTROLLER ---
-def get_lotto_data(state, game, date_str=None):
+def get_lotto_data(state, game, date_str=None, budget=None):
     clean_slug, limit, is_national = get_game_config(game)
+    deadline = deadline_for(budget)
     data = {"state": state.upper(), "game": clean_slug, "date_requested": date_str if date_str else "Latest", "limit_applied": limit}
     
     if date_str:
         try:
             dt_obj = datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            data['error'] = "Invalid format. Use YYYY-MM-DD"
+            return data
+        result = resolve_local(state, clean_slug, dt_obj, limit, is_national)
+        if result is None:
             if is_national:
-                result = scrape_national_history(clean_slug, dt_obj, limit)
+                result = scrape_national_history(clean_slug, dt_obj, limit, deadline)
             elif state.lower() == "florida":
-                result = scrape_florida_legacy(clean_slug, dt_obj, limit)
+                result = scrape_florida_legacy(clean_slug, dt_obj, limit, deadline)
             else:
                 data['error'] = "History only supported for Florida State Games currently"
-            data.update(result)
-        except ValueError: data['error'] = "Invalid format. Use YYYY-MM-DD"
-    else:
-        result = scrape_latest(state, clean_slug, limit)
+                return data
+            result['tier'] = "live"
         data.update(result)
+    else:
+        result = LATEST_CACHE.get(state, clean_slug, limit, deadline)
+        data.update(latest_fallback(state, clean_slug, limit, result))
     return data
+
+def scraper_stats():
+    return {"connections": connection_stats(), "latest_cache": LATEST_CACHE.stats,
+            "year_pages": NATIONAL_PAGES.stats, "legacy_files": FLORIDA_FILES.stats,
+            "single_flight": FLIGHTS.snapshot(), "resolver_tiers": RESOLVER_STATS,
+            "breakers": breaker_stats()}
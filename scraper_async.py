@@ -0,0 +1,198 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+import httpx
+
+from scraper import (
+    FLIGHTS, FLORIDA_FILES, HEADERS, LATEST_CACHE, LEGACY_HOSTS, LEGACY_SSL_CONTEXT,
+    NATIONAL_PAGES, POOL_SIZE, SUPPORTED_GAMES,
+    breaker_for, budget_timeout, deadline_for, get_game_config, latest_fallback,
+    latest_url, legacy_url, national_url, legacy_lookup, legacy_result, national_lookup,
+    parse_latest, parse_national_year, resolve_local,
+)
+
+# Async counterpart of scraper.py for the FastAPI app: same sources, URLs
+# and parse_* functions, fetched with httpx so a slow upstream only holds
+# a coroutine instead of a worker thread. Parsing is CPU-bound and runs in
+# the default thread pool.
+
+# Upper bound for each game in a /latest fan-out; the game is cancelled
+# and reported as timed out after this
+FANOUT_TIMEOUT = float(os.environ.get("SCRAPER_FANOUT_TIMEOUT", "20"))
+
+# --- CLIENTS ---
+# One keep-alive client per (event loop, host); httpx connections belong
+# to the loop that opened them.
+_CLIENTS = {}
+_BACKGROUND = set()
+
+def get_client(host):
+    loop = asyncio.get_running_loop()
+    client = _CLIENTS.get((id(loop), host))
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers=HEADERS,
+            verify=LEGACY_SSL_CONTEXT if host in LEGACY_HOSTS else True,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+        )
+        _CLIENTS[(id(loop), host)] = client
+    return client
+
+async def aclose():
+    loop_id = id(asyncio.get_running_loop())
+    for key in [k for k in _CLIENTS if k[0] == loop_id]:
+        await _CLIENTS.pop(key).aclose()
+
+async def fetch(url, timeout=10, headers=None, deadline=None):
+    host = urlparse(url).hostname
+    # Per-call timeout, cut to the request's remaining budget; connecting
+    # gets at most 5 s of it
+    timeout = budget_timeout(timeout, deadline)
+    limits = httpx.Timeout(timeout, connect=min(timeout, 5))
+    breaker = breaker_for(host)
+    probe = breaker.check()
+    start = time.monotonic()
+    try:
+        response = await get_client(host).get(url, timeout=limits, headers=headers)
+    except BaseException as e:
+        # A cancelled caller says nothing about the host; if it held the
+        # half-open probe, the next call may probe instead
+        if not isinstance(e, asyncio.CancelledError):
+            breaker.record(False, time.monotonic() - start)
+        elif probe:
+            breaker.release()
+        raise
+    breaker.record(response.status_code < 500, time.monotonic() - start)
+    return response
+
+# --- SOURCES ---
+async def scrape_latest(state, game_slug, limit, deadline=None):
+    data = {"source": "lotteryusa.com", "winning_numbers": [], "debug_url": ""}
+    url = latest_url(state, game_slug)
+    data['debug_url'] = url
+    try:
+        response = await fetch(url, timeout=10, deadline=deadline)
+        data['winning_numbers'] = await asyncio.to_thread(parse_latest, response.content, limit)
+    except Exception as e:
+        data['error'] = str(e) or type(e).__name__
+    return data
+
+async def national_year(game_slug, year, url, deadline=None):
+    response = await fetch(url, timeout=10, deadline=deadline)
+    dates = await asyncio.to_thread(parse_national_year, response.content, year)
+    NATIONAL_PAGES.put(game_slug, year, dates)
+    return dates
+
+async def scrape_national_history(game_slug, date_obj, limit, deadline=None):
+    data = {"source": "lottery.net", "winning_numbers": [], "debug_url": ""}
+    url = national_url(game_slug, date_obj)
+    data['debug_url'] = url
+    try:
+        dates = await asyncio.to_thread(NATIONAL_PAGES.get, game_slug, date_obj.year)
+        if dates is None:
+            dates = await FLIGHTS.do_async(("national", game_slug, date_obj.year),
+                                           lambda: national_year(game_slug, date_obj.year, url, deadline))
+        nums, error = national_lookup(dates, date_obj, limit)
+        data['winning_numbers'] = nums
+        if error: data['error'] = error
+    except Exception as e:
+        data['error'] = str(e) or type(e).__name__
+    return data
+
+async def revalidate_florida_file(code, deadline=None):
+    response = await fetch(legacy_url(code), timeout=15, headers=FLORIDA_FILES.conditional_headers(code),
+                           deadline=deadline)
+    return await asyncio.to_thread(FLORIDA_FILES.apply, code, response.status_code,
+                                   response.headers, response.text)
+
+async def florida_index(code, deadline=None):
+    # The first lookup after a restart reads and indexes the file on disk
+    index = await asyncio.to_thread(FLORIDA_FILES.fresh, code)
+    if index is not None:
+        return index
+    try:
+        return await FLIGHTS.do_async(("legacy", code), lambda: revalidate_florida_file(code, deadline))
+    except Exception:
+        index = await asyncio.to_thread(FLORIDA_FILES.stale, code)
+        if index is None:
+            raise
+        return index
+
+async def scrape_florida_legacy(code, date_obj, limit, deadline=None):
+    data = {"source": "flalottery.com (Text)", "winning_numbers": [], "debug_url": ""}
+    url = legacy_url(code)
+    data['debug_url'] = url
+    try:
+        draws, error = legacy_lookup(await florida_index(code, deadline), date_obj, limit)
+        legacy_result(data, draws, error)
+    except Exception as e:
+        data['error'] = f"Legacy Error: {str(e) or type(e).__name__}"
+    return data
+
+# --- LATEST (shares scraper.LATEST_CACHE) ---
+def _fetch_latest(key, limit, deadline=None):
+    return FLIGHTS.do_async(("latest",) + key, lambda: scrape_latest(key[0], key[1], limit, deadline))
+
+async def _refresh(key, limit):
+    data = None
+    try:
+        data = await _fetch_latest(key, limit)
+    finally:
+        LATEST_CACHE.finish_refresh(key, data)
+
+async def cached_latest(state, game_slug, limit, deadline=None):
+    key, response, refresh = LATEST_CACHE.lookup(state, game_slug)
+    if refresh:
+        task = asyncio.create_task(_refresh(key, limit))
+        _BACKGROUND.add(task)
+        task.add_done_callback(_BACKGROUND.discard)
+    if response is not None:
+        return response
+    return LATEST_CACHE.store(key, await _fetch_latest(key, limit, deadline))
+
+# --- CONTROLLER ---
+async def get_lotto_data(state, game, date_str=None, budget=None):
+    clean_slug, limit, is_national = get_game_config(game)
+    deadline = deadline_for(budget)
+    data = {"state": state.upper(), "game": clean_slug, "date_requested": date_str if date_str else "Latest", "limit_applied": limit}
+
+    if date_str:
+        try:
+            dt_obj = datetime.strptime(date_str, "%Y-%m-%d")
+        except ValueError:
+            data['error'] = "Invalid format. Use YYYY-MM-DD"
+            return data
+        # Memory/disk tiers never touch the network, but a game's first
+        # lookup loads its history file: keep that off the event loop
+        result = await asyncio.to_thread(resolve_local, state, clean_slug, dt_obj, limit, is_national)
+        if result is None:
+            if is_national:
+                result = await scrape_national_history(clean_slug, dt_obj, limit, deadline)
+            elif state.lower() == "florida":
+                result = await scrape_florida_legacy(clean_slug, dt_obj, limit, deadline)
+            else:
+                data['error'] = "History only supported for Florida State Games currently"
+                return data
+            result['tier'] = "live"
+        data.update(result)
+    else:
+        result = await cached_latest(state, clean_slug, limit, deadline)
+        data.update(await asyncio.to_thread(latest_fallback, state, clean_slug, limit, result))
+    return data
+
+async def get_all_latest(state, timeout=FANOUT_TIMEOUT):
+    """Latest results for every supported game, fetched concurrently."""
+    async def one(game):
+        try:
+            return await asyncio.wait_for(get_lotto_data(state, game, budget=timeout), timeout)
+        except asyncio.TimeoutError:
+            clean_slug, limit, _ = get_game_config(game)
+            return {"state": state.upper(), "game": clean_slug, "date_requested": "Latest",
+                    "limit_applied": limit, "winning_numbers": [], "error": f"Timed out after {timeout:g}s"}
+
+    results = await asyncio.gather(*(one(game) for game in SUPPORTED_GAMES))
+    return {"state": state.upper(), "games": dict(zip(SUPPORTED_GAMES, results))}
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Measure API cold start: import api/index.py in a fresh interpreter and
+serve one /api/florida/{game} request, with the lazy registry (default)
+and with every game loaded eagerly at import (LOTTO_EAGER_LOAD=1).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+import api.index as index
+t1 = time.perf_counter()
+game = index.REGISTRY.get(sys.argv[1])
+game.index.lookup(game.draws[-1]["date"])
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "first_request_ms": (t2 - t1) * 1000,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+"""
+
+
+def run_probe(game: str, eager: bool) -> dict:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop("LOTTO_EAGER_LOAD", None)
+    if eager:
+        env["LOTTO_EAGER_LOAD"] = "1"
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE, game],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    return {
+        key: round(statistics.median(s[key] for s in samples), 1)
+        for key in samples[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare lazy vs eager cold start")
+    parser.add_argument("--game", type=str, default="mega-millions", help="Game for the first request")
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters per mode")
+    args = parser.parse_args()
+
+    print(f"Cold start, first request for {args.game} (median of {args.runs} runs)")
+    for label, eager in (("eager", True), ("lazy", False)):
+        result = summarize([run_probe(args.game, eager) for _ in range(args.runs)])
+        total = result["import_ms"] + result["first_request_ms"]
+        print(f"  {label:5s}  import {result['import_ms']:7.1f} ms  "
+              f"first request {result['first_request_ms']:6.1f} ms  "
+              f"total {total:7.1f} ms  max RSS {result['max_rss_kb'] / 1024:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Compare the parse time and peak memory of the early-exit latest-results
+parser (parse_latest_stream) with the BeautifulSoup path (parse_latest_soup).
+
+    python scripts/bench_latest_parser.py --record       # save lotteryusa pages
+    python scripts/bench_latest_parser.py                # benchmark
+
+Pages are read from benchmarks/fixtures/lotteryusa/*.html, plus synthetic
+pages so it also runs without recorded fixtures. That both parsers pick
+the same numbers on these pages and on edge-case markup is checked by
+tests/test_latest_parser.py.
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scraper
+
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures", "lotteryusa")
+def synthetic_page(rows: int = 40, nav_items: int = 400) -> str:
+    """Roughly the shape of a lotteryusa game page: big nav, then results."""
+    names = ["alabama", "florida", "georgia", "kentucky", "ohio", "texas"]
+    nav = "".join(f'<li><a href="/{names[i % 6]}/">{names[i % 6].title()}</a></li>' for i in range(nav_items))
+    script = "<script>window.__DATA__ = {" + ",".join(f'"k{i}": {i}' for i in range(2000)) + "}</script>"
+    results = "".join(
+        f'<tr><td><time>Oct {1 + i % 28}, 2024</time></td>'
+        f'<td><ul class="c-ball-list">{"".join(f"<li>{(i * 7 + j * 11) % 69 + 1}</li>" for j in range(6))}</ul></td>'
+        f'<td>$ {i * 3},000,000</td></tr>'
+        for i in range(rows)
+    )
+    footer = "<footer>" + "".join(f"<p>Footer paragraph {i} about responsible play.</p>" for i in range(300)) + "</footer>"
+    return (f"<html><head><title>Results</title>{script}</head><body><nav><ul>{nav}</ul></nav>"
+            f"<main><table><tbody>{results}</tbody></table></main>{footer}</body></html>")
+
+
+def record():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for game in scraper.SUPPORTED_GAMES:
+        slug, _, _ = scraper.get_game_config(game)
+        url = scraper.latest_url("florida", slug)
+        try:
+            response = scraper.fetch(url, timeout=15)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"  {game}: {e}")
+            continue
+        path = os.path.join(FIXTURE_DIR, f"{game}.html")
+        with open(path, "wb") as f:
+            f.write(response.content)
+        print(f"  {game}: {len(response.content)} bytes -> {os.path.relpath(path, ROOT)}")
+
+
+def load_pages():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        with open(path, "rb") as f:
+            pages.append((os.path.basename(path), f.read()))
+    pages.append(("synthetic", synthetic_page().encode("utf-8")))
+    pages.append(("synthetic-late", synthetic_page(rows=5, nav_items=3000).encode("utf-8")))
+    return pages
+
+
+def measure(parse, content, limit, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        parse(content, limit)
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    parse(content, limit)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify and benchmark the latest-results parsers")
+    parser.add_argument("--record", action="store_true", help="Fetch lotteryusa pages into the fixture directory")
+    parser.add_argument("--runs", type=int, default=15, help="Timed parses per page and parser")
+    parser.add_argument("--limit", type=int, default=6, help="Ball count used for the benchmark")
+    args = parser.parse_args()
+
+    if args.record:
+        record()
+        return
+
+    pages = load_pages()
+    print(f"Parse time (median of {args.runs}) and tracemalloc peak, limit={args.limit}")
+    for name, content in pages:
+        soup_ms, soup_peak = measure(scraper.parse_latest_soup, content, args.limit, args.runs)
+        stream_ms, stream_peak = measure(scraper.parse_latest_stream, content, args.limit, args.runs)
+        print(f"  {name:24s} {len(content) / 1024:7.1f} KB  "
+              f"soup {soup_ms:7.2f} ms {soup_peak / 1024:8.1f} KB  "
+              f"stream {stream_ms:7.2f} ms {stream_peak / 1024:8.1f} KB  "
+              f"({soup_ms / stream_ms:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of the scraper parsers on recorded pages.
+
+    python scripts/bench_scrapers.py --synthesize   # build fixtures from data/
+    python scripts/bench_scrapers.py --record       # re-fetch fixture URLs live
+    python scripts/bench_scrapers.py                # replay + benchmark
+    python scripts/bench_scrapers.py --compare benchmarks/results/abc1234.json
+
+Fixtures live in benchmarks/fixtures/, listed in index.json with the URL
+each one was (or would be) fetched from. --record overwrites them with the
+live pages; --synthesize writes stand-ins in the same shapes, built from
+the draw history in data/, so the suite also runs without network access.
+
+For each parser the runner reports pages/s, rows/s, the tracemalloc peak
+and two allocation counts per parse, both taken with gc disabled so the
+cyclic garbage a parse leaves behind (soup trees) is still counted:
+
+    alloc_blocks    tracemalloc blocks allocated during the parse and
+                    alive when it returns (its result included), from a
+                    snapshot filtered to exclude tracemalloc and the
+                    import machinery
+    heap_blocks     the sys.getallocatedblocks() delta over a second parse
+                    made without tracemalloc running
+
+Blocks freed by reference counting before the parse returns show up in
+neither. Everything is written to benchmarks/results/<commit>.json (not
+tracked by git), together with the origin of every fixture: recorded
+pages are the real thing, synthetic ones only approximate their shape.
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scraper
+from scripts import scraper_local
+
+FIXTURE_DIR = os.path.join(ROOT, "benchmarks", "fixtures")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DATA_DIR = os.path.join(ROOT, "data")
+INDEX_FILE = "index.json"
+
+# Fixture pages: which parser reads them, where they come from, and the
+# game/year/limit the parser is called with
+FIXTURES = [
+    {"kind": "lotteryusa", "file": "lotteryusa/powerball.html", "game": "powerball", "limit": 6,
+     "url": "https://www.lotteryusa.com/florida/powerball/"},
+    {"kind": "lotteryusa", "file": "lotteryusa/pick-3.html", "game": "pick-3", "limit": 3,
+     "url": "https://www.lotteryusa.com/florida/pick-3/"},
+    {"kind": "lottery_net", "file": "lottery_net/powerball_2025.html", "game": "powerball", "year": 2025, "limit": 6,
+     "url": "https://www.lottery.net/powerball/numbers/2025"},
+    {"kind": "lottery_net", "file": "lottery_net/florida-lotto_2025.html", "game": "florida-lotto", "year": 2025, "limit": 6,
+     "url": "https://www.lottery.net/florida/lotto/numbers/2025"},
+    {"kind": "exptkt", "file": "exptkt/p3.html", "game": "pick-3", "limit": 3,
+     "url": "https://www.flalottery.com/exptkt/p3.html"},
+    {"kind": "exptkt", "file": "exptkt/l6.html", "game": "florida-lotto", "limit": 6,
+     "url": "https://www.flalottery.com/exptkt/l6.html"},
+]
+
+
+# --- Fixtures ---
+
+def load_history(game: str) -> list:
+    with open(os.path.join(DATA_DIR, f"florida_{game}.json"), "r") as f:
+        return json.load(f)["draws"]
+
+
+def ball_list(numbers, cls: str) -> str:
+    return "".join(f"\n  <li class={cls}>{n}</li>" for n in numbers) + "\n"
+
+
+def synth_lotteryusa(fixture: dict) -> str:
+    draws = load_history(fixture["game"])[:30]
+    nav = "".join(f'<li><a href="/{s}/">{s.title()}</a></li>'
+                  for s in ["florida", "georgia", "texas", "ohio", "new-york"] * 60)
+    rows = "".join(
+        f'<tr class="c-results-table__item"><td><time datetime="{d["date"]}">'
+        f'{date.fromisoformat(d["date"]):%a, %b %-d, %Y}</time> <span>{d["draw_time"].title()}</span></td>'
+        f'<td><ul class="c-ball-list">{ball_list(d["numbers"], "c-ball")}</ul></td></tr>\n'
+        for d in draws
+    )
+    return (f"<!DOCTYPE html><html><head><title>{fixture['game']} results</title>"
+            f"<script>window.dataLayer=[];</script></head><body><header><nav><ul>{nav}</ul></nav></header>"
+            f"<main><h1>Florida {fixture['game']}</h1><table class=\"c-results-table\"><tbody>{rows}</tbody></table></main>"
+            f"<footer><p>Must be 18 or older to play.</p></footer></body></html>")
+
+
+def synth_lottery_net(fixture: dict) -> str:
+    year = str(fixture["year"])
+    draws = [d for d in load_history(fixture["game"]) if d["date"].startswith(year)]
+    if not draws:
+        # History doesn't cover the year: shift the newest year into it
+        newest = load_history(fixture["game"])[0]["date"][:4]
+        draws = [dict(d, date=year + d["date"][4:]) for d in load_history(fixture["game"])
+                 if d["date"].startswith(newest) and d["date"][5:] != "02-29"]
+    rows = "".join(
+        f'<tr><td><a href="/{fixture["game"]}/numbers/{d["date"]}">'
+        f'{date.fromisoformat(d["date"]):%A}<br>\n{date.fromisoformat(d["date"]):%B %-d, %Y}</a></td>'
+        f'<td><ul class="multi results">{ball_list(d["numbers"], "ball")}</ul></td>'
+        f'<td>$ {(i % 40 + 1) * 10} Million</td></tr>\n'
+        for i, d in enumerate(draws)
+    )
+    return (f"<html><head><title>{fixture['game']} numbers {year}</title></head><body>"
+            f"<h1>{fixture['game']} Winning Numbers {year}</h1>"
+            f"<table class=\"prizes archive\"><thead><tr><th>Date</th><th>Result</th><th>Jackpot</th></tr></thead>"
+            f"<tbody>{rows}</tbody></table></body></html>")
+
+
+def synth_exptkt(fixture: dict) -> str:
+    lines = [f"<html><body><pre>\n{fixture['game'].upper()} WINNING NUMBERS\n\n"]
+    # Newest first, so a date's evening draw precedes its midday one
+    draws = load_history(fixture["game"])[:2000]
+    draws.sort(key=lambda d: (d["date"], d.get("draw_time") != "midday"), reverse=True)
+    for d in draws:
+        code = "M" if d.get("draw_time") == "midday" else "E"
+        balls = "- ".join(d["numbers"])
+        fireball = f"   FB {d['fireball']}" if "fireball" in d else ""
+        lines.append(f"{date.fromisoformat(d['date']):%m/%d/%y}   {code}   {balls}{fireball}\n")
+    lines.append("</pre></body></html>\n")
+    return "".join(lines)
+
+
+SYNTHESIZERS = {"lotteryusa": synth_lotteryusa, "lottery_net": synth_lottery_net, "exptkt": synth_exptkt}
+
+
+def write_fixture(fixture: dict, content: bytes, origin: str):
+    path = os.path.join(FIXTURE_DIR, fixture["file"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+    print(f"  {origin:11s} {len(content) / 1024:7.1f} KB  {fixture['file']}")
+
+
+def write_index(origins: dict):
+    entries = [dict(f, origin=origins.get(f["file"], "missing")) for f in FIXTURES]
+    with open(os.path.join(FIXTURE_DIR, INDEX_FILE), "w") as f:
+        json.dump({"fixtures": entries}, f, indent=2)
+
+
+def read_origins() -> dict:
+    try:
+        with open(os.path.join(FIXTURE_DIR, INDEX_FILE), "r") as f:
+            return {e["file"]: e.get("origin") for e in json.load(f)["fixtures"]}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def synthesize():
+    origins = read_origins()
+    for fixture in FIXTURES:
+        write_fixture(fixture, SYNTHESIZERS[fixture["kind"]](fixture).encode("utf-8"), "synthetic")
+        origins[fixture["file"]] = "synthetic"
+    write_index(origins)
+
+
+def record():
+    origins = read_origins()
+    for fixture in FIXTURES:
+        try:
+            response = scraper.fetch(fixture["url"], timeout=30)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"  failed      {fixture['file']}: {e}")
+            continue
+        write_fixture(fixture, response.content, "recorded")
+        origins[fixture["file"]] = f"recorded {datetime.now():%Y-%m-%d}"
+    write_index(origins)
+
+
+# --- Parsers under test ---
+# Each returns (rows, result): the number of draws it extracted from the
+# page, and the parse result itself so allocation counts can hold on to it.
+
+def run_latest_stream(content, fixture):
+    result = scraper.parse_latest_stream(content, fixture["limit"])
+    return (1 if result else 0), result
+
+
+def run_latest_soup(content, fixture):
+    result = scraper.parse_latest_soup(content, fixture["limit"])
+    return (1 if result else 0), result
+
+
+def run_national_year(content, fixture):
+    result = scraper.parse_national_year(content, fixture["year"])
+    return len(result), result
+
+
+def run_florida_file(content, fixture):
+    index = scraper.parse_florida_file(content.decode("utf-8", errors="replace"))
+    return sum(len(draws) for draws in index.values()), index
+
+
+def local_features():
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+def run_local_year(content, fixture):
+    html = content.decode("utf-8", errors="replace")
+    result = scraper_local.parse_lottery_net_year(html, fixture["limit"], features=local_features())
+    return len(result), result
+
+
+BENCHMARKS = [
+    ("scrape_latest[stream]", "lotteryusa", run_latest_stream),
+    ("scrape_latest[soup]", "lotteryusa", run_latest_soup),
+    ("scrape_national_history", "lottery_net", run_national_year),
+    ("scrape_florida_legacy", "exptkt", run_florida_file),
+    ("scraper_local.scrape_lottery_net_year", "lottery_net", run_local_year),
+]
+
+
+# Allocations made by tracemalloc itself and by lazy imports are not the parser's
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+def count_allocations(run, content, fixture) -> tuple:
+    """(alloc_blocks, heap_blocks, peak bytes) for one page, over two parses."""
+    gc.collect()
+    gc.disable()
+    try:
+        # Without tracemalloc running, so its own bookkeeping isn't counted
+        heap_before = sys.getallocatedblocks()
+        result = run(content, fixture)
+        heap_blocks = sys.getallocatedblocks() - heap_before
+        del result
+        gc.collect()
+
+        tracemalloc.start()
+        result = run(content, fixture)
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del result
+    finally:
+        gc.enable()
+    stats = snapshot.filter_traces(SNAPSHOT_FILTERS).statistics("filename")
+    return sum(stat.count for stat in stats), heap_blocks, peak
+
+
+def measure(run, pages, repeat: int) -> dict:
+    """Parse every page `repeat` times; memory is measured on one extra pass."""
+    rows = 0
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = sum(run(content, fixture)[0] for fixture, content in pages)
+        times.append(time.perf_counter() - start)
+    seconds = statistics.median(times)
+
+    allocs, heap, peaks = 0, 0, []
+    for fixture, content in pages:
+        alloc_blocks, heap_blocks, peak = count_allocations(run, content, fixture)
+        allocs += alloc_blocks
+        heap += heap_blocks
+        peaks.append(peak)
+
+    return {
+        "pages": len(pages),
+        "rows": rows,
+        "seconds": round(seconds, 6),
+        "pages_per_s": round(len(pages) / seconds, 1),
+        "rows_per_s": round(rows / seconds, 1),
+        "peak_kb": round(max(peaks) / 1024, 1),
+        "alloc_blocks": allocs,
+        "heap_blocks": heap,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, path: str):
+    with open(path, "r") as f:
+        baseline = json.load(f)
+    print(f"\nvs {baseline.get('commit')} ({os.path.relpath(path, ROOT)})")
+    for name, result in current["benchmarks"].items():
+        old = baseline["benchmarks"].get(name)
+        if not old:
+            continue
+        speed = result["pages_per_s"] / old["pages_per_s"] if old["pages_per_s"] else 0
+        line = f"  {name:40s} {speed:5.2f}x pages/s  peak {old['peak_kb']:8.1f} -> {result['peak_kb']:8.1f} KB"
+        if "alloc_blocks" in old:
+            line += f"  allocs {old['alloc_blocks']:7d} -> {result['alloc_blocks']:7d}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper parser benchmarks")
+    parser.add_argument("--record", action="store_true", help="Fetch the fixture URLs live and save them")
+    parser.add_argument("--synthesize", action="store_true", help="Write stand-in fixtures built from data/")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes per benchmark")
+    parser.add_argument("--only", type=str, help="Run benchmarks whose name contains this")
+    parser.add_argument("--output", type=str, help="Results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=str, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    if args.synthesize or args.record:
+        synthesize() if args.synthesize else record()
+        return
+
+    origins = read_origins()
+    synthetic = [f["file"] for f in FIXTURES if not str(origins.get(f["file"], "")).startswith("recorded")]
+    if synthetic:
+        print(f"note: {len(synthetic)} of {len(FIXTURES)} fixtures are not recorded pages "
+              f"(run --record where the sources are reachable): {', '.join(synthetic)}")
+    results = {"commit": git_commit(), "generated": datetime.now().isoformat(),
+               "python": sys.version.split()[0], "local_parser": local_features(), "benchmarks": {}}
+    print(f"Scraper parse benchmarks ({results['commit']}, median of {args.repeat})")
+    for name, kind, run in BENCHMARKS:
+        if args.only and args.only not in name:
+            continue
+        pages = []
+        for fixture in FIXTURES:
+            path = os.path.join(FIXTURE_DIR, fixture["file"])
+            if fixture["kind"] == kind and os.path.exists(path):
+                with open(path, "rb") as f:
+                    pages.append((fixture, f.read()))
+        if not pages:
+            print(f"  {name:40s} no fixtures (run --synthesize or --record)")
+            continue
+        result = measure(run, pages, args.repeat)
+        result["fixtures"] = {f["file"]: origins.get(f["file"], "unknown") for f, _ in pages}
+        results["benchmarks"][name] = result
+        print(f"  {name:40s} {result['pages_per_s']:8.1f} pages/s {result['rows_per_s']:10.1f} rows/s  "
+              f"peak {result['peak_kb']:8.1f} KB  {result['alloc_blocks']:7d} alloc blocks")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved {os.path.relpath(output, ROOT)}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Convert data/florida_*.json draw history into the columnar .lotc format
+that api/index.py memory-maps instead of parsing JSON.
+
+    python scripts/build_columnar.py            # every game
+    python scripts/build_columnar.py --game pick-3 --verify
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api import columnar
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def verify(data: dict, path: str) -> bool:
+    """Round-trip check: every draw read back from the mmap equals the JSON draw."""
+    loaded = columnar.load(path)
+    draws = data.get("draws", [])
+    if len(loaded["draws"]) != len(draws):
+        print(f"  MISMATCH: {len(loaded['draws'])} draws, expected {len(draws)}")
+        return False
+    for slot, (expected, actual) in enumerate(zip(draws, loaded["draws"])):
+        if expected != actual:
+            print(f"  MISMATCH at slot {slot}: {actual} != {expected}")
+            return False
+    meta = {k: v for k, v in data.items() if k != "draws"}
+    if {k: v for k, v in loaded.items() if k != "draws"} != meta:
+        print("  MISMATCH in game metadata")
+        return False
+    return True
+
+
+def convert(filename: str, check: bool) -> bool:
+    json_path = os.path.join(DATA_DIR, filename)
+    out_path = columnar.columnar_path(json_path)
+
+    with open(json_path, "r") as f:
+        data = json.load(f)
+
+    try:
+        size = columnar.write(json_path, data)
+    except columnar.ColumnarFormatError as e:
+        print(f"  {filename}: skipped ({e})")
+        return False
+
+    json_size = os.path.getsize(json_path)
+    print(f"  {filename}: {len(data.get('draws', []))} draws, "
+          f"{json_size / 1024:.0f} KB -> {size / 1024:.0f} KB")
+
+    if check:
+        if not verify(data, out_path):
+            return False
+        start = time.perf_counter()
+        with open(json_path, "r") as f:
+            json.load(f)
+        json_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        columnar.load(out_path)
+        lotc_ms = (time.perf_counter() - start) * 1000
+        print(f"    round-trip OK, load {json_ms:.1f} ms (json) vs {lotc_ms:.2f} ms (mmap)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build columnar draw history files")
+    parser.add_argument("--game", type=str, help="Single game to convert")
+    parser.add_argument("--verify", action="store_true", help="Read each file back and compare with the JSON")
+    args = parser.parse_args()
+
+    files = sorted(f for f in os.listdir(DATA_DIR) if f.startswith("florida_") and f.endswith(".json"))
+    if args.game:
+        files = [f for f in files if f == f"florida_{args.game}.json"]
+        if not files:
+            print(f"Unknown game: {args.game}")
+            sys.exit(1)
+
+    print("Building columnar history")
+    ok = all([convert(f, args.verify) for f in files])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
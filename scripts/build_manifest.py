@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Rebuild data/manifest.json, the per-game summary the API serves
+/api/games and /api/health from without loading any draw history.
+Run after any script that rewrites data/florida_*.json.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.registry import write_manifest
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def main():
+    manifest = write_manifest(DATA_DIR)
+    for game_id, entry in manifest["games"].items():
+        print(f"  {game_id}: {entry.get('total_draws', 0)} draws ({entry['file']})")
+    print(f"Wrote manifest for {len(manifest['games'])} games")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Polite concurrent page fetching for history backfills.
+
+FetchScheduler runs a batch of (key, url) jobs on a small thread pool.
+Each host has a token bucket, so the request rate to a site stays within
+its politeness budget however many workers are running. Failed requests
+are retried with exponential backoff. Completed pages are appended to a
+JSON-lines checkpoint, so an interrupted backfill resumes where it
+stopped instead of starting over.
+
+    SCHEDULER_WORKERS      concurrent requests overall (default 4)
+    SCHEDULER_RATE         requests per second per host (default 1.0)
+    SCHEDULER_BURST        requests a host may get back to back (default 2)
+    SCHEDULER_RETRIES      retries per page after the first attempt (default 3)
+    SCHEDULER_CHECKPOINT   checkpoint file (default ~/.cache/lotto-api/history_checkpoint.jsonl)
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+WORKERS = int(os.environ.get("SCHEDULER_WORKERS", "4"))
+RATE = float(os.environ.get("SCHEDULER_RATE", "1.0"))
+BURST = int(os.environ.get("SCHEDULER_BURST", "2"))
+RETRIES = int(os.environ.get("SCHEDULER_RETRIES", "3"))
+BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+CHECKPOINT = os.environ.get("SCHEDULER_CHECKPOINT",
+                            os.path.expanduser("~/.cache/lotto-api/history_checkpoint.jsonl"))
+
+# Responses worth another try; anything else is final
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# A checkpointed page for a year that hasn't ended is reused for this long
+CURRENT_YEAR_TTL = 3600
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`; acquire() blocks for one."""
+
+    def __init__(self, rate: float, burst: int):
+        if rate <= 0:
+            raise ValueError(f"Rate must be greater than 0, got {rate}")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.waited = 0.0
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+                self.waited += wait
+            time.sleep(wait)
+
+
+class Checkpoint:
+    """Append-only record of finished pages: one JSON line per page, last line wins."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries: Dict[str, dict] = {}
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self.entries[entry["key"]] = entry
+                    except (ValueError, KeyError):
+                        continue  # torn last line from an interrupted run
+
+    def get(self, key: str, year: Optional[int] = None):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        # Pages of years that had ended when fetched never change
+        if year is not None and datetime.fromtimestamp(entry["fetched_at"]).year <= year:
+            if time.time() - entry["fetched_at"] > CURRENT_YEAR_TTL:
+                return None
+        return entry["result"]
+
+    def record(self, key: str, result):
+        entry = {"key": key, "fetched_at": time.time(), "result": result}
+        with self.lock:
+            self.entries[key] = entry
+            if not self.path:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+            if self.path and os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class FetchScheduler:
+    def __init__(self, workers: int = WORKERS, rate: float = RATE, burst: int = BURST,
+                 retries: int = RETRIES, checkpoint: Optional[str] = CHECKPOINT,
+                 headers: Optional[dict] = None, timeout: float = 30):
+        if rate <= 0:
+            raise ValueError(f"Rate must be greater than 0, got {rate}")
+        self.workers = max(1, workers)
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.checkpoint = Checkpoint(checkpoint)
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.sessions: Dict[str, requests.Session] = {}
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "resumed": 0, "failed": 0, "done": 0}
+
+    def _host(self, host: str) -> Tuple[TokenBucket, requests.Session]:
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst)
+                session = requests.Session()
+                session.headers.update(self.headers)
+                session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.workers))
+                session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=self.workers))
+                self.sessions[host] = session
+            return self.buckets[host], self.sessions[host]
+
+    def _count(self, name: str):
+        with self.lock:
+            self.stats[name] += 1
+
+    def _backoff(self, attempt: int, response=None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_BACKOFF)
+        return min(BACKOFF * 2 ** attempt, MAX_BACKOFF) + random.uniform(0, BACKOFF)
+
+    def fetch(self, url: str) -> requests.Response:
+        """GET `url` within its host's rate limit, retrying transient failures."""
+        bucket, session = self._host(urlparse(url).hostname)
+        for attempt in range(self.retries + 1):
+            bucket.acquire()
+            self._count("requests")
+            response = None
+            try:
+                response = session.get(url, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response
+                error = requests.HTTPError(f"{response.status_code} for {url}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt == self.retries:
+                raise error
+            self._count("retries")
+            time.sleep(self._backoff(attempt, response))
+
+    def run(self, jobs: List[tuple], parse: Callable[[object, str], object]) -> Tuple[Dict, Dict]:
+        """
+        Fetch and parse every (key, url[, year]) job. `parse(key, text)`
+        turns a page into a JSON-serialisable result. Returns
+        ({key: result}, {key: error message}); pages already in the
+        checkpoint are not fetched again. Empty results are returned but
+        not checkpointed.
+        """
+        results, errors = {}, {}
+        pending = []
+        for job in jobs:
+            key, url = job[0], job[1]
+            cached = self.checkpoint.get(key, job[2] if len(job) > 2 else None)
+            if cached is not None:
+                results[key] = cached
+                self.stats["resumed"] += 1
+            else:
+                pending.append((key, url))
+
+        def one(key, url):
+            return parse(key, self.fetch(url).text)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(one, key, url): (key, url) for key, url in pending}
+            for future in as_completed(futures):
+                key, url = futures[future]
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    errors[key] = str(e) or type(e).__name__
+                    self._count("failed")
+                    print(f"    Failed: {url} ({errors[key]})")
+                    continue
+                # A page with no draws is more likely a layout change or a
+                # placeholder than a final answer: fetch it again next run
+                if results[key]:
+                    self.checkpoint.record(key, results[key])
+                self._count("done")
+        return results, errors
+
+    def report(self) -> str:
+        waited = sum(bucket.waited for bucket in self.buckets.values())
+        s = self.stats
+        return (f"{s['done']} fetched, {s['resumed']} from checkpoint, {s['failed']} failed; "
+                f"{s['requests']} requests, {s['retries']} retries, {waited:.1f}s rate-limit wait")
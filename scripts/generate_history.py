@@ -1,5 +1,4 @@
 #!/usr/bin/env python3
-import json
 import os
 import sys
 import argparse
@@ -7,25 +6,30 @@ from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from scripts import ingest
 from scripts.config import GAMES
-from scripts.scraper_local import scrape_game_history
+from scripts.fetch_scheduler import BURST, CHECKPOINT, RATE, RETRIES, WORKERS, FetchScheduler
+from scripts.scraper_local import HEADERS, scrape_games_history
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
 
 
-def generate_game_history(game_id: str, game_config: dict, months_back: int = 6) -> bool:
+def game_filepath(game_id: str, game_config: dict) -> str:
+    return os.path.join(DATA_DIR, f"{game_config['state']}_{game_id}.json")
+
+
+def save_game_history(game_id: str, game_config: dict, draws, head=None) -> bool:
     print(f"\n{'='*50}")
     print(f"Processing: {game_config['name']}")
     print(f"{'='*50}")
     
-    slug = game_config["lottery_net_slug"]
-    numbers_count = game_config["numbers_count"]
+    filepath = game_filepath(game_id, game_config)
+    filename = os.path.basename(filepath)
     
-    try:
-        draws = scrape_game_history(slug, numbers_count, months_back)
-    except Exception as e:
-        print(f"  Error: {e}")
-        return False
+    if head is not None:
+        added = ingest.prepend_draws(filepath, ingest.newer_draws(head, draws))
+        print(f"  Added {added} new draws to {filename} (newest stored: {head['date']})")
+        return True
     
     if not draws:
         print(f"  No results found")
@@ -35,28 +39,86 @@ def generate_game_history(game_id: str, game_config: dict, months_back: int = 6)
         "game": game_id,
         "game_name": game_config["name"],
         "state": game_config["state"],
-        "numbers_count": numbers_count,
+        "numbers_count": game_config["numbers_count"],
         "draw_times": game_config["draw_times"],
         "last_updated": datetime.now().isoformat() + "Z",
         "total_draws": len(draws),
         "draws": draws
     }
     
-    os.makedirs(DATA_DIR, exist_ok=True)
-    filename = f"{game_config['state']}_{game_id}.json"
-    filepath = os.path.join(DATA_DIR, filename)
-    
-    with open(filepath, 'w') as f:
-        json.dump(output, f, indent=2)
+    ingest.write_data_file(filepath, output)
     
     print(f"  Saved {len(draws)} draws to {filename}")
     return True
 
 
+def generate_histories(games: dict, months_back: int = 6, incremental: bool = False,
+                       scheduler: FetchScheduler = None) -> bool:
+    """
+    Fetch every (game, year) page in one scheduled batch, then write each
+    game. A game with a failed page is left as it is on disk; the pages
+    that did arrive stay in the checkpoint for the next run.
+    """
+    scheduler = scheduler or FetchScheduler(headers=HEADERS)
+    heads = {}
+    if incremental:
+        for game_id, config in games.items():
+            head = ingest.stored_head(game_filepath(game_id, config))
+            if head is not None:
+                heads[game_id] = head
+    
+    try:
+        history, errors = scrape_games_history(
+            {game_id: (config["lottery_net_slug"], config["numbers_count"]) for game_id, config in games.items()},
+            months_back,
+            {game_id: head["date"] for game_id, head in heads.items()},
+            scheduler,
+        )
+    except Exception as e:
+        print(f"  Error: {e}")
+        return False
+    
+    complete = True
+    for game_id, config in games.items():
+        if errors[game_id]:
+            complete = False
+            print(f"\nSkipping {config['name']}: {len(errors[game_id])} page(s) failed")
+            for error in errors[game_id]:
+                print(f"  {error}")
+            continue
+        save_game_history(game_id, config, history[game_id], heads.get(game_id))
+    
+    if complete:
+        scheduler.checkpoint.clear()
+    else:
+        print(f"\nRe-run to resume; finished pages are in {scheduler.checkpoint.path}")
+    return complete
+
+
+def generate_game_history(game_id: str, game_config: dict, months_back: int = 6,
+                          incremental: bool = False) -> bool:
+    return generate_histories({game_id: game_config}, months_back, incremental)
+
+
+def positive_float(value: str) -> float:
+    rate = float(value)
+    if rate <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return rate
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate lottery history")
     parser.add_argument("--game", type=str, help="Single game to generate")
     parser.add_argument("--months", type=int, default=6, help="Months of history")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only fetch and add draws newer than the existing data file (ignores --months)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Concurrent page fetches")
+    parser.add_argument("--rate", type=positive_float, default=RATE, help="Requests per second per host")
+    parser.add_argument("--burst", type=int, default=BURST, help="Back-to-back requests allowed per host")
+    parser.add_argument("--retries", type=int, default=RETRIES, help="Retries per page")
+    parser.add_argument("--checkpoint", default=CHECKPOINT, help="Checkpoint file for resuming")
+    parser.add_argument("--fresh", action="store_true", help="Ignore and discard an existing checkpoint")
     args = parser.parse_args()
     
     print("Lottery History Generator")
@@ -67,10 +129,20 @@ def main():
             print(f"Unknown game: {args.game}")
             print(f"Available: {', '.join(GAMES.keys())}")
             sys.exit(1)
-        generate_game_history(args.game, GAMES[args.game], args.months)
+        games = {args.game: GAMES[args.game]}
     else:
-        for game_id, config in GAMES.items():
-            generate_game_history(game_id, config, args.months)
+        games = GAMES
+    
+    scheduler = FetchScheduler(workers=args.workers, rate=args.rate, burst=args.burst,
+                               retries=args.retries, checkpoint=args.checkpoint, headers=HEADERS)
+    if args.fresh:
+        scheduler.checkpoint.clear()
+    elif scheduler.checkpoint.entries:
+        print(f"Resuming: {len(scheduler.checkpoint.entries)} pages in {args.checkpoint}")
+    
+    complete = generate_histories(games, args.months, args.incremental, scheduler)
+    
+    sys.exit(0 if complete else 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+"""
+Writes to data/florida_*.json.
+
+Every writer goes through write_data_file() or prepend_draws(), which also
+update the file's .lotc and its manifest.json entry, so the API never
+serves a stale columnar copy or manifest.
+
+Incremental updates:
+
+The data files are written by json.dump(indent=2) with draws newest first,
+so new draws only ever land at the head of the "draws" array. Instead of
+loading and re-serializing the whole history, these helpers decode just the
+draws of the newest stored date, splice the new ones in front of them as
+text, and patch total_draws/last_updated in the header. The rest of the
+file is copied through byte for byte, and the .lotc likewise only gets the
+new head rows in front of its existing columns.
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from api import columnar
+from api.registry import update_manifest
+
+DRAWS_OPEN = re.compile(r'"draws":\s*\[')
+TOTAL_DRAWS = re.compile(r'"total_draws":\s*\d+')
+LAST_UPDATED = re.compile(r'"last_updated":\s*"[^"]*"')
+
+_decoder = json.JSONDecoder()
+
+
+def _skip_ws(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def _head_block(text: str):
+    """
+    (draws_match, start, end, draws): the draws sharing the newest stored
+    date and the text span [start, end) they occupy. start is None when
+    the draws array is empty.
+    """
+    match = DRAWS_OPEN.search(text)
+    if match is None:
+        raise ValueError("no draws array")
+    draws: List[Dict] = []
+    start = end = None
+    pos = _skip_ws(text, match.end())
+    while pos < len(text) and text[pos] != "]":
+        draw, after = _decoder.raw_decode(text, pos)
+        if draws and draw["date"] != draws[0]["date"]:
+            break
+        if start is None:
+            start = pos
+        draws.append(draw)
+        end = after
+        pos = _skip_ws(text, after)
+        if pos < len(text) and text[pos] == ",":
+            pos = _skip_ws(text, pos + 1)
+    return match, start, end, draws
+
+
+def _sort_key(draw: Dict):
+    return (draw["date"], draw.get("draw_time", "evening"))
+
+
+def stored_head(path: str) -> Optional[dict]:
+    """Newest stored date and the (date, draw_time) keys on it, or None for a missing/empty file."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        text = f.read()
+    _, start, _, draws = _head_block(text)
+    if start is None:
+        return None
+    return {"date": draws[0]["date"], "keys": {_sort_key(d) for d in draws}}
+
+
+def newer_draws(head: Optional[dict], draws: List[Dict]) -> List[Dict]:
+    """The draws not already covered by a stored head."""
+    if head is None:
+        return list(draws)
+    return [d for d in draws
+            if d["date"] > head["date"] or (d["date"] == head["date"] and _sort_key(d) not in head["keys"])]
+
+
+def _items_text(draws: List[Dict]) -> str:
+    # Serialize inside the same nesting json.dump(data, indent=2) uses for
+    # the draws array, so the spliced text matches a full rewrite
+    blob = json.dumps({"draws": draws}, indent=2)
+    return blob[blob.index("[") + 1:blob.rindex("]")].strip()
+
+
+def refresh_derived(path: str, data: dict, source: dict):
+    """
+    Rebuild the .lotc and manifest entry of the data file just written to
+    `path`, from the `data` and content signature the writer already holds.
+    """
+    try:
+        columnar.write(path, data, source)
+    except columnar.ColumnarFormatError as e:
+        # The registry ignores the old .lotc now that the JSON differs
+        print(f"  {os.path.basename(path)}: no columnar copy ({e})")
+    update_manifest(os.path.dirname(path), data, os.path.basename(path))
+
+
+def write_data_file(path: str, data: dict):
+    """Write a full data file, atomically, and refresh what is built from it."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    content = json.dumps(data, indent=2).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    refresh_derived(path, data, columnar.content_signature(content))
+
+
+def prepend_draws(path: str, draws: List[Dict]) -> int:
+    """
+    Splice draws newer than the stored head into the file at `path` and
+    update its header. Returns the number of draws added.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    text = raw.decode("utf-8")
+    match, start, end, head = _head_block(text)
+    known = {_sort_key(d) for d in head}
+    added = []
+    for draw in draws:
+        key = _sort_key(draw)
+        if key not in known and (not head or draw["date"] >= head[0]["date"]):
+            known.add(key)
+            added.append(draw)
+    if not added:
+        return 0
+
+    updated = datetime.now().isoformat() + "Z"
+    if start is None:
+        data = json.loads(text)
+        data["draws"] = sorted(added, key=_sort_key, reverse=True)
+        data["total_draws"] = len(data["draws"])
+        data["last_updated"] = updated
+        body = json.dumps(data, indent=2)
+    else:
+        header = text[:match.start()]
+        total = TOTAL_DRAWS.search(header)
+        if total:
+            count = int(total.group(0).rsplit(":", 1)[1]) + len(added)
+            header = header[:total.start()] + f'"total_draws": {count}' + header[total.end():]
+        header = LAST_UPDATED.sub(lambda m: f'"last_updated": {json.dumps(updated)}', header, count=1)
+        block = sorted(added + head, key=_sort_key, reverse=True)
+        body = header + text[match.start():start] + _items_text(block) + text[end:]
+
+    content = body.encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+    source = columnar.content_signature(content)
+    if start is None:
+        refresh_derived(path, data, source)
+        return len(added)
+    # Header fields come from the patched header alone; the .lotc gets the
+    # new head rows in front of its existing columns
+    fields = json.loads(header + '"draws": []}')
+    updates = {k: fields[k] for k in ("total_draws", "last_updated") if k in fields}
+    if columnar.prepend(path, block, len(head), updates, columnar.content_signature(raw), source):
+        update_manifest(os.path.dirname(path), fields, os.path.basename(path))
+    else:
+        # No .lotc built from the old file to extend: build one in full
+        refresh_derived(path, json.loads(body), source)
+    return len(added)
@@ -0,0 +1,213 @@
+"""
+On-disk cache of extracted PDF page text, keyed by page content.
+
+An updated Florida Lottery PDF mostly repeats the previous version's
+pages byte for byte, and pdfplumber's extract_text() is the expensive
+part of a parse. Each page is keyed by a SHA-256 of its decoded content
+streams plus what else decides the extracted text (page box, rotation,
+fonts), so a page only needs extracting when it actually changed.
+
+Entries are one small text file each. The cache is bounded by total size
+and evicts least recently used entries first (file mtime is the access
+time; hits touch it). Processes sharing the directory (pdf_parallel
+workers) defer eviction to their parent, which enforces the bound once
+they are done, so they neither each rescan the directory nor each evict
+against their own stale view of it.
+
+    PDF_PAGE_CACHE_DIR   cache directory (default ~/.cache/lotto-api/pdf-pages)
+    PDF_PAGE_CACHE_MB    size bound in MB (default 64; 0 disables the cache)
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pdfplumber
+from pdfminer.pdftypes import PDFStream, resolve1, stream_value
+
+PAGE_CACHE_DIR = os.environ.get("PDF_PAGE_CACHE_DIR", os.path.expanduser("~/.cache/lotto-api/pdf-pages"))
+PAGE_CACHE_MB = float(os.environ.get("PDF_PAGE_CACHE_MB", "64"))
+
+# Bumped when the extraction call or key layout changes
+KEY_VERSION = f"1:pdfplumber-{getattr(pdfplumber, '__version__', '?')}:extract_text()"
+
+
+def _font_fingerprint(resources, digest):
+    fonts = resolve1((resolve1(resources) or {}).get("Font")) or {}
+    for name in sorted(fonts, key=str):
+        font = resolve1(fonts[name]) or {}
+        encoding = resolve1(font.get("Encoding"))
+        if isinstance(encoding, dict):
+            encoding = sorted((str(k), repr(resolve1(v))) for k, v in encoding.items())
+        digest.update(repr((name, resolve1(font.get("BaseFont")), resolve1(font.get("Subtype")),
+                            encoding)).encode("utf-8"))
+        to_unicode = resolve1(font.get("ToUnicode"))
+        if isinstance(to_unicode, PDFStream):
+            digest.update(to_unicode.get_data())
+
+
+def page_key(page):
+    """SHA-256 of a pdfplumber page's content streams and text-relevant attributes."""
+    digest = hashlib.sha256(KEY_VERSION.encode("utf-8"))
+    page_obj = page.page_obj
+    digest.update(repr((tuple(page.bbox), page.rotation)).encode("utf-8"))
+    contents = page_obj.contents or []
+    if not isinstance(contents, list):
+        contents = [contents]
+    for stream in contents:
+        data = stream_value(stream).get_data()
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    _font_fingerprint(page_obj.resources, digest)
+    return digest.hexdigest()
+
+
+class PageTextCache:
+    def __init__(self, cache_dir=PAGE_CACHE_DIR, max_mb=PAGE_CACHE_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.entries = None  # key -> size, least recently used first
+        self.total = 0
+        self.lock = threading.Lock()
+        self.deferred = False
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+    @property
+    def enabled(self):
+        return bool(self.cache_dir) and self.max_bytes > 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".txt")
+
+    def _scan(self):
+        # Index what earlier runs left behind, oldest access first
+        if self.entries is not None:
+            return
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".txt"):
+                    try:
+                        st = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    found.append((st.st_mtime, name[:-4], st.st_size))
+        found.sort()
+        self.entries = OrderedDict((key, size) for _, key, size in found)
+        self.total = sum(self.entries.values())
+        # The bound may have been lowered since those runs
+        self._evict()
+
+    def _evict(self):
+        while self.total > self.max_bytes and self.entries:
+            key, size = self.entries.popitem(last=False)
+            self.total -= size
+            self.stats["evictions"] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.utime(path)
+        except OSError:
+            with self.lock:
+                self.stats["misses"] += 1
+            return None
+        with self.lock:
+            self.stats["hits"] += 1
+            if not self.deferred:
+                self._scan()
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+        return text
+
+    def put(self, key, text):
+        if not self.enabled:
+            return
+        path = self._path(key)
+        data = text.encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.stats["errors"] += 1
+            print(f"Page cache write failed: {e}")
+            return
+        with self.lock:
+            self.stats["writes"] += 1
+            if self.deferred:
+                return
+            self._scan()
+            self.total += len(data) - self.entries.pop(key, 0)
+            self.entries[key] = len(data)
+            self._evict()
+
+    def defer_eviction(self):
+        """Only read and write entries; another process calls enforce_bound()."""
+        with self.lock:
+            self.deferred = True
+            self.entries = None
+            self.total = 0
+
+    def enforce_bound(self):
+        """Re-index the directory, with whatever other processes wrote, and evict down to the bound."""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.entries = None
+            self._scan()
+
+    def extract(self, page):
+        """page.extract_text(), from the cache when this page's content was seen before."""
+        if not self.enabled:
+            return page.extract_text() or ""
+        try:
+            key = page_key(page)
+        except Exception as e:
+            # Unusual page structure: extract without caching
+            self.stats["errors"] += 1
+            print(f"Page cache key failed: {e}")
+            return page.extract_text() or ""
+        text = self.get(key)
+        if text is None:
+            text = page.extract_text() or ""
+            self.put(key, text)
+        return text
+
+    def merge_stats(self, stats):
+        """Add counters reported by another process (pdf_parallel workers)."""
+        for name, value in stats.items():
+            self.stats[name] = self.stats.get(name, 0) + value
+
+    def snapshot(self):
+        with self.lock:
+            if self.enabled:
+                self._scan()
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else None,
+                "entries": len(self.entries or ()),
+                "size_kb": round(self.total / 1024, 1),
+                "max_kb": round(self.max_bytes / 1024, 1),
+            }
+
+    def report(self):
+        s = self.snapshot()
+        rate = f"{s['hit_rate']:.0%}" if s["hit_rate"] is not None else "-"
+        return (f"Page cache: {s['hits']} hits, {s['misses']} misses ({rate}), {s['evictions']} evicted, "
+                f"{s['entries']} pages / {s['size_kb']:.0f} of {s['max_kb']:.0f} KB")
+
+
+PAGE_CACHE = PageTextCache()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+One extraction pass for every Florida Lottery PDF parser.
+
+Each game is a row spec in GAME_SPECS (pattern, row builder, dedupe key,
+JSON header). Every PDF is opened and its text extracted once; each
+page's text then goes to every game read from that PDF. The parse_*.py
+scripts are thin wrappers over this module.
+
+    python scripts/pdf_engine.py                       # every game, default PDFs
+    python scripts/pdf_engine.py --game powerball --game powerball-double-play
+    python scripts/pdf_engine.py --pdf pick-3=~/Downloads/p3.pdf --game pick-3
+    python scripts/pdf_engine.py --incremental         # only draws newer than data/
+    python scripts/pdf_engine.py --no-cache            # bypass the page text cache
+"""
+
+import argparse
+import os
+import re
+import sys
+from datetime import datetime
+
+import pdfplumber
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import ingest
+from scripts.page_cache import PAGE_CACHE
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def parse_date(date_str, pivot=None):
+    """Parse '02/05/26' into '2026-02-05'; with a pivot, 2-digit years above it are 19xx."""
+    parts = date_str.split('/')
+    month = int(parts[0])
+    day = int(parts[1])
+    year = int(parts[2])
+
+    if year < 100:
+        year = 1900 + year if pivot is not None and year > pivot else 2000 + year
+
+    return f"{year}-{month:02d}-{day:02d}"
+
+
+# --- Row builders: regex groups -> draw dict (None skips the row) ---
+
+def pick_row(spec, match):
+    date_raw, draw_time_code, numbers_raw, fireball = match
+    date_str = parse_date(date_raw)
+    numbers = re.findall(r'\d+', numbers_raw)[:spec["numbers_count"]]
+    if len(numbers) < spec["numbers_count"]:
+        return None
+    return {
+        "date": date_str,
+        "draw_time": "evening" if draw_time_code == "E" else "midday",
+        "numbers": numbers,
+        "fireball": fireball
+    }
+
+
+def fantasy5_row(spec, match):
+    return {
+        "date": parse_date(match[0], pivot=50),
+        "draw_time": match[1].lower(),
+        "numbers": list(match[2:7])
+    }
+
+
+def cash4life_row(spec, match):
+    date_raw, numbers_raw, cashball = match
+    date_str = parse_date(date_raw)
+    numbers = re.findall(r'\d+', numbers_raw)[:5]
+    if len(numbers) < 5:
+        return None
+    # Cashball is also the 6th number (like Powerball's red ball)
+    return {
+        "date": date_str,
+        "draw_time": "evening",
+        "numbers": numbers + [cashball],
+        "cashball": cashball
+    }
+
+
+def evening_row(spec, match):
+    # Powerball-style rows: main balls, then the special ball as the last number
+    return {
+        "date": parse_date(match[0], pivot=spec.get("pivot")),
+        "draw_time": "evening",
+        "numbers": list(match[1:spec["numbers_count"] + 1])
+    }
+
+
+# --- Game specs ---
+#   pdf      default source PDF; games sharing one are parsed in one pass
+#   marker   literal every row contains; pages without it are skipped
+#   pattern  row regex, applied to a page's whole text (rows can wrap)
+#   row      builder for one regex match
+#   key      draw fields that identify a draw; the first occurrence wins
+#   header   game-level JSON fields besides game/state/counts/dates
+
+PICK_PATTERN = re.compile(r'(\d{2}/\d{2}/\d{2})\s+([EM])\s+([\d\-\s]+?)\s*FB\s*(\d+)')
+
+
+def pick_spec(n):
+    return {
+        "pdf": f"~/Downloads/pick{n}.pdf",
+        "marker": ("FB",),
+        "pattern": PICK_PATTERN,
+        "row": pick_row,
+        "numbers_count": n,
+        "key": ("date", "draw_time"),
+        "header": {"game_name": f"Pick {n}", "numbers_count": n, "draw_times": ["midday", "evening"],
+                   "has_fireball": True},
+    }
+
+
+GAME_SPECS = {
+    "pick-2": pick_spec(2),
+    "pick-3": pick_spec(3),
+    "pick-4": pick_spec(4),
+    "pick-5": pick_spec(5),
+    "fantasy-5": {
+        "pdf": "~/Downloads/test_ff.pdf",
+        "marker": ("EVENING", "MIDDAY"),
+        "pattern": re.compile(r'(\d{1,2}/\d{1,2}/\d{2})\s+(EVENING|MIDDAY)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)'),
+        "row": fantasy5_row,
+        "key": ("date", "draw_time"),
+        "header": {"game_name": "Fantasy 5", "numbers_count": 5, "draw_times": ["midday", "evening"]},
+    },
+    "florida-lotto": {
+        "pdf": "~/Downloads/test_l6.pdf",
+        "marker": ("LOTTO",),
+        "pattern": re.compile(
+            r'(\d{1,2}/\d{1,2}/\d{2})\s+(\d+)-\s*(\d+)-\s*(\d+)-\s*(\d+)-\s*(\d+)-\s*(\d+)\s+LOTTO(?!\s+DP)'),
+        "row": evening_row,
+        "numbers_count": 6,
+        "key": ("date",),
+        "header": {"game_name": "Florida Lotto", "numbers_count": 6, "draw_times": ["evening"]},
+    },
+    "cash4life": {
+        "pdf": "~/Downloads/cash4life.pdf",
+        "marker": ("CB",),
+        "pattern": re.compile(r'(\d{2}/\d{2}/\d{2})\s+([\d\-\s]+?)\s*CB\s*(\d+)'),
+        "row": cash4life_row,
+        "key": ("date",),
+        "header": {"game_name": "Cash4Life", "numbers_count": 6, "draw_times": ["evening"],
+                   "has_cashball": True},
+    },
+    "powerball": {
+        "pdf": "~/Downloads/test_pb.pdf",
+        "marker": ("POWERBALL",),
+        "pattern": re.compile(
+            r'(\d{1,2}/\d{1,2}/\d{2})\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+PB\s+(\d+)\s+X?\d*\s+POWERBALL(?!\s+DP)'),
+        "row": evening_row,
+        "numbers_count": 6,
+        "key": ("date",),
+        "header": {"game_name": "Powerball", "numbers_count": 6, "draw_times": ["evening"]},
+    },
+    "powerball-double-play": {
+        "pdf": "~/Downloads/test_pb.pdf",
+        "marker": ("POWERBALL",),
+        "pattern": re.compile(
+            r'(\d{1,2}/\d{1,2}/\d{2})\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+PB\s+(\d+)\s+POWERBALL\s+DP'),
+        "row": evening_row,
+        "numbers_count": 6,
+        "pivot": 50,
+        "key": ("date",),
+        "header": {"game_name": "Powerball Double Play", "numbers_count": 6, "draw_times": ["evening"]},
+    },
+}
+
+
+# --- Engine ---
+
+def parse_page(game, text):
+    """One game's draws on one page's text, in page order (duplicates kept)."""
+    spec = GAME_SPECS[game]
+    if not any(marker in text for marker in spec["marker"]):
+        return []
+    draws = []
+    for match in spec["pattern"].findall(text):
+        try:
+            draw = spec["row"](spec, match)
+        except Exception as e:
+            print(f"  Error parsing: {match} - {e}")
+            continue
+        if draw is not None:
+            draws.append(draw)
+    return draws
+
+
+def merge_draws(game, pages):
+    """Combine per-page draws in page order: first occurrence of a key wins, newest first."""
+    fields = GAME_SPECS[game]["key"]
+    draws = []
+    seen = set()
+    for page_draws in pages:
+        for draw in page_draws:
+            key = tuple(draw[f] for f in fields)
+            if key in seen:
+                continue
+            seen.add(key)
+            draws.append(draw)
+
+    draws.sort(key=lambda x: tuple(x[f] for f in fields), reverse=True)
+    return draws
+
+
+def iter_pages(pdf_path, cache=PAGE_CACHE):
+    """
+    Page texts, extracted lazily so a caller that stops early skips the
+    rest. Pages already in the page cache (page_cache.py) are not extracted.
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            yield cache.extract(page) if cache else page.extract_text() or ""
+
+
+def extract_pages(pdf_path, cache=PAGE_CACHE):
+    return list(iter_pages(pdf_path, cache))
+
+
+def parse_texts(pages, games, heads=None):
+    """
+    Run every game's spec over the same page texts. Returns {game: draws}.
+
+    With heads ({game: ingest.stored_head(...)}), only draws newer than the
+    stored head are kept. The PDFs list draws newest first, so a game is
+    done at the first page whose rows are all older than its head, and
+    extraction stops once every game is done.
+    """
+    heads = heads or {}
+    per_game = {game: [] for game in games}
+    done = set()
+    for text in pages:
+        for game in games:
+            if game in done:
+                continue
+            draws = parse_page(game, text)
+            head = heads.get(game)
+            if head is not None and draws:
+                if all(d["date"] < head["date"] for d in draws):
+                    done.add(game)
+                draws = ingest.newer_draws(head, draws)
+            per_game[game].append(draws)
+        if len(done) == len(games):
+            break
+    return {game: merge_draws(game, game_pages) for game, game_pages in per_game.items()}
+
+
+def parse_pdfs(sources, heads=None, cache=PAGE_CACHE):
+    """
+    Parse {game: pdf_path}. Each distinct PDF is extracted once and its
+    text matched against every game that reads from it.
+    """
+    by_pdf = {}
+    for game, pdf_path in sources.items():
+        by_pdf.setdefault(os.path.realpath(os.path.expanduser(pdf_path)), []).append(game)
+
+    results = {}
+    for pdf_path, games in by_pdf.items():
+        print(f"Parsing: {pdf_path} ({', '.join(games)})")
+        for game, draws in parse_texts(iter_pages(pdf_path, cache), games, heads).items():
+            print(f"  {game}: Found {len(draws)} {'new ' if heads and game in heads else ''}draws")
+            results[game] = draws
+    return results
+
+
+def create_game_json(game, draws):
+    header = GAME_SPECS[game]["header"]
+    data = {"game": game, "game_name": header["game_name"], "state": "florida"}
+    data.update(header)
+    data["last_updated"] = datetime.now().isoformat() + "Z"
+    data["total_draws"] = len(draws)
+    data["draws"] = draws
+    return data
+
+
+def output_path(game, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"florida_{game}.json")
+
+
+def write_game(game, draws, data_dir=DATA_DIR):
+    output_file = output_path(game, data_dir)
+    ingest.write_data_file(output_file, create_game_json(game, draws))
+    return output_file
+
+
+def run(sources, data_dir=DATA_DIR, incremental=False, cache=PAGE_CACHE):
+    """
+    Parse and write every game in {game: pdf_path} that has a PDF on disk.
+    Incremental runs splice new draws into existing data files (see
+    ingest.py); games without a data file yet are written in full.
+    """
+    present = {}
+    for game, pdf_path in sources.items():
+        if os.path.exists(os.path.expanduser(pdf_path)):
+            present[game] = pdf_path
+        else:
+            print(f"Skipping {game}: PDF not found ({pdf_path})")
+
+    heads = {}
+    if incremental:
+        for game in present:
+            head = ingest.stored_head(output_path(game, data_dir))
+            if head is not None:
+                heads[game] = head
+
+    written = {}
+    for game, draws in parse_pdfs(present, heads, cache).items():
+        if not draws:
+            continue
+        if game in heads:
+            added = ingest.prepend_draws(output_path(game, data_dir), draws)
+            print(f"  Added {added} draws to: {output_path(game, data_dir)}")
+            if not added:
+                continue
+            written[game] = output_path(game, data_dir)
+        else:
+            written[game] = write_game(game, draws, data_dir)
+            print(f"  Saved {game} to: {written[game]}")
+        latest = draws[0]
+        print(f"  Latest: {latest['date']} {latest['draw_time']} - {latest['numbers']}")
+    if cache and cache.enabled:
+        print(cache.report())
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse Florida Lottery PDFs for every game in one pass")
+    parser.add_argument("--game", action="append", choices=sorted(GAME_SPECS),
+                        help="Game to parse (repeatable; default all)")
+    parser.add_argument("--pdf", action="append", default=[], metavar="GAME=PATH",
+                        help="Use PATH instead of the game's default PDF")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only add draws newer than the existing data files")
+    parser.add_argument("--no-cache", action="store_true", help="Extract every page, bypassing the page cache")
+    args = parser.parse_args()
+
+    sources = {game: GAME_SPECS[game]["pdf"] for game in (args.game or GAME_SPECS)}
+    for override in args.pdf:
+        game, _, path = override.partition("=")
+        if game not in GAME_SPECS or not path:
+            parser.error(f"--pdf expects GAME=PATH, got {override!r}")
+        sources[game] = path
+
+    print("=" * 50)
+    print("Florida Lottery PDF Parser")
+    print("=" * 50)
+
+    run(sources, incremental=args.incremental, cache=None if args.no_cache else PAGE_CACHE)
+
+    print("\n" + "=" * 50)
+    print("Done!")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
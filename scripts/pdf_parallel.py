@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Parse a Florida Lottery PDF with a process pool: the pages are split into
+contiguous ranges, each worker extracts its range once and matches it
+against every requested game's spec (pdf_engine.GAME_SPECS), and the
+per-page draws are merged back in page order, so each game gets the same
+list pdf_engine.parse_pdfs() returns. Workers share the on-disk page text
+cache (page_cache.py); its size bound is enforced once, by the parent,
+after the pool is done.
+
+    python scripts/pdf_parallel.py fantasy-5 --workers 8
+    python scripts/pdf_parallel.py pick-3 --pdf ~/Downloads/pick3.pdf --check
+    python scripts/pdf_parallel.py powerball powerball-double-play --write
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import pdf_engine
+from scripts.page_cache import PAGE_CACHE
+
+# Ranges per worker: small enough that a slow range doesn't leave the rest idle
+CHUNKS_PER_WORKER = 4
+
+
+def page_ranges(page_count, workers):
+    if page_count <= 0:
+        return []
+    chunks = min(page_count, max(1, workers * CHUNKS_PER_WORKER))
+    size, extra = divmod(page_count, chunks)
+    ranges, start = [], 0
+    for i in range(chunks):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def init_worker():
+    PAGE_CACHE.defer_eviction()
+
+
+def parse_range(pdf_path, games, start, end, use_cache=True):
+    """
+    Worker: extract pages [start, end) and match them.
+    Returns (start, {game: per-page draws}, seconds, page cache counters).
+    """
+    began = time.perf_counter()
+    before = dict(PAGE_CACHE.stats)
+    pages = {game: [] for game in games}
+    with pdfplumber.open(pdf_path, pages=list(range(start + 1, end + 1))) as pdf:
+        for page in pdf.pages:
+            text = PAGE_CACHE.extract(page) if use_cache else page.extract_text() or ""
+            for game in games:
+                pages[game].append(pdf_engine.parse_page(game, text))
+    counters = {name: value - before.get(name, 0) for name, value in PAGE_CACHE.stats.items()}
+    return start, pages, time.perf_counter() - began, counters
+
+
+def parse_parallel(pdf_path, games, workers, use_cache=True):
+    """{game: draws} for every game read from pdf_path, plus a timing report."""
+    with pdfplumber.open(pdf_path) as pdf:
+        page_count = len(pdf.pages)
+
+    began = time.perf_counter()
+    ranges = page_ranges(page_count, workers)
+    results = []
+    if ranges:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            futures = [pool.submit(parse_range, pdf_path, games, start, end, use_cache) for start, end in ranges]
+            results = sorted((future.result() for future in futures), key=lambda r: r[0])
+
+    draws = {}
+    for game in games:
+        pages = [page for _, range_pages, _, _ in results for page in range_pages[game]]
+        draws[game] = pdf_engine.merge_draws(game, pages)
+    wall = time.perf_counter() - began
+    chunk_times = [seconds for _, _, seconds, _ in results] or [0.0]
+    for _, _, _, counters in results:
+        PAGE_CACHE.merge_stats(counters)
+    if use_cache:
+        PAGE_CACHE.enforce_bound()
+    report = {
+        "pages": page_count,
+        "workers": workers,
+        "chunks": len(ranges),
+        "draws": {game: len(game_draws) for game, game_draws in draws.items()},
+        "wall_s": round(wall, 3),
+        "pages_per_s": round(page_count / wall, 1) if wall else None,
+        "chunk_s": {"min": round(min(chunk_times), 3), "max": round(max(chunk_times), 3),
+                    "sum": round(sum(chunk_times), 3)},
+    }
+    return draws, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse a lottery PDF across a process pool")
+    parser.add_argument("games", nargs="+", choices=sorted(pdf_engine.GAME_SPECS), metavar="game",
+                        help="Games read from the PDF")
+    parser.add_argument("--pdf", help="PDF to parse (default: the first game's usual ~/Downloads file)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--check", action="store_true", help="Also run the serial engine and compare")
+    parser.add_argument("--write", action="store_true", help="Write data/florida_<game>.json for each game")
+    parser.add_argument("--no-cache", action="store_true", help="Extract every page, bypassing the page cache")
+    args = parser.parse_args()
+
+    pdf_path = os.path.expanduser(args.pdf or pdf_engine.GAME_SPECS[args.games[0]]["pdf"])
+    if not os.path.exists(pdf_path):
+        print(f"PDF not found: {pdf_path}")
+        sys.exit(1)
+
+    draws, report = parse_parallel(pdf_path, args.games, max(1, args.workers), not args.no_cache)
+    print(f"{pdf_path}: {report['pages']} pages")
+    for game, count in report["draws"].items():
+        print(f"  {game}: {count} draws")
+    print(f"  {report['workers']} workers, {report['chunks']} ranges: {report['wall_s']} s wall, "
+          f"{report['pages_per_s']} pages/s")
+    print(f"  range time min {report['chunk_s']['min']} s, max {report['chunk_s']['max']} s, "
+          f"total {report['chunk_s']['sum']} s")
+    if not args.no_cache and PAGE_CACHE.enabled:
+        print(f"  {PAGE_CACHE.report()}")
+
+    failed = False
+    if args.check:
+        began = time.perf_counter()
+        # Serial reference extracts every page itself, so a bad cache entry can't hide
+        expected = pdf_engine.parse_texts(pdf_engine.extract_pages(pdf_path, cache=None), args.games)
+        serial = time.perf_counter() - began
+        failed = expected != draws
+        speedup = f"{serial / report['wall_s']:.1f}x" if report["wall_s"] else "-"
+        print(f"  serial: {serial:.3f} s ({speedup} speedup), "
+              f"output {'MISMATCH' if failed else 'identical'}")
+
+    if args.write and not failed:
+        for game, game_draws in draws.items():
+            if game_draws:
+                print(f"  Saved to: {pdf_engine.write_game(game, game_draws)}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
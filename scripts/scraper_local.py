@@ -1,9 +1,10 @@
 import requests
 from bs4 import BeautifulSoup
 import re
-import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+from scripts.fetch_scheduler import FetchScheduler
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -65,18 +66,8 @@ def extract_numbers_from_row(row, limit: int) -> List[str]:
     return numbers[:limit]
 
 
-def scrape_lottery_net_year(game_slug: str, year: int, numbers_count: int) -> List[Dict]:
-    url = f"https://www.lottery.net/{game_slug}/numbers/{year}"
-    print(f"    Fetching: {url}")
-    
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-    except Exception as e:
-        print(f"    Error: {e}")
-        return []
-    
-    soup = BeautifulSoup(response.text, 'lxml')
+def parse_lottery_net_year(html: str, numbers_count: int, features: str = "lxml") -> List[Dict]:
+    soup = BeautifulSoup(html, features)
     results = []
     
     tables = soup.find_all('table')
@@ -102,15 +93,41 @@ def scrape_lottery_net_year(game_slug: str, year: int, numbers_count: int) -> Li
                     "numbers": numbers
                 })
     
+    return results
+
+
+def lottery_net_url(game_slug: str, year: int) -> str:
+    return f"https://www.lottery.net/{game_slug}/numbers/{year}"
+
+
+def scrape_lottery_net_year(game_slug: str, year: int, numbers_count: int) -> List[Dict]:
+    url = lottery_net_url(game_slug, year)
+    print(f"    Fetching: {url}")
+    
+    try:
+        response = requests.get(url, headers=HEADERS, timeout=30)
+        response.raise_for_status()
+    except Exception as e:
+        print(f"    Error: {e}")
+        return []
+    
+    results = parse_lottery_net_year(response.text, numbers_count)
     print(f"    Found {len(results)} draws for {year}")
     return results
 
 
-def scrape_game_history(game_slug: str, numbers_count: int, months_back: int = 6) -> List[Dict]:
-    all_results = []
+def history_window(months_back: int, since: Optional[str] = None) -> Tuple[List[int], str]:
+    """
+    Year pages to fetch (newest first) and the earliest date to keep. With
+    `since` (the newest stored draw) the window runs from that date to now
+    whatever `months_back` says, so a long gap is filled rather than skipped.
+    """
     current_year = datetime.now().year
     current_month = datetime.now().month
     
+    if since:
+        return list(range(current_year, int(since[:4]) - 1, -1)), since
+    
     years_to_scrape = {current_year}
     check_month = current_month - months_back
     check_year = current_year
@@ -119,11 +136,6 @@ def scrape_game_history(game_slug: str, numbers_count: int, months_back: int = 6
         check_year -= 1
         years_to_scrape.add(check_year)
     
-    for year in sorted(years_to_scrape, reverse=True):
-        year_results = scrape_lottery_net_year(game_slug, year, numbers_count)
-        all_results.extend(year_results)
-        time.sleep(1)
-    
     cutoff_year = current_year
     cutoff_month = current_month - months_back
     while cutoff_month <= 0:
@@ -131,6 +143,10 @@ def scrape_game_history(game_slug: str, numbers_count: int, months_back: int = 6
         cutoff_year -= 1
     cutoff_str = f"{cutoff_year}-{cutoff_month:02d}-01"
     
+    return sorted(years_to_scrape, reverse=True), cutoff_str
+
+
+def filter_history(all_results: List[Dict], cutoff_str: str) -> List[Dict]:
     filtered = [r for r in all_results if r["date"] >= cutoff_str]
     filtered.sort(key=lambda x: x["date"], reverse=True)
     
@@ -143,3 +159,55 @@ def scrape_game_history(game_slug: str, numbers_count: int, months_back: int = 6
             unique.append(r)
     
     return unique
+
+
+def scrape_games_history(games: Dict[str, Tuple[str, int]], months_back: int = 6,
+                         since: Optional[Dict[str, str]] = None,
+                         scheduler: Optional[FetchScheduler] = None) -> Tuple[Dict[str, List[Dict]], Dict[str, List[str]]]:
+    """
+    History for several games ({game_id: (lottery_net_slug, numbers_count)})
+    in one batch: every (game, year) page goes through one FetchScheduler,
+    so pages are fetched concurrently within the per-host rate limit.
+    `since` maps game ids to the newest stored date (incremental runs).
+    Returns ({game_id: draws newest first}, {game_id: [page errors]}).
+    """
+    scheduler = scheduler or FetchScheduler(headers=HEADERS)
+    since = since or {}
+    jobs, pages, cutoffs = [], {}, {}
+    for game_id, (slug, numbers_count) in games.items():
+        years, cutoffs[game_id] = history_window(months_back, since.get(game_id))
+        for year in years:
+            key = f"{slug}/{year}"
+            jobs.append((key, lottery_net_url(slug, year), year))
+            pages[key] = (game_id, numbers_count)
+    
+    def parse(key, html):
+        results = parse_lottery_net_year(html, pages[key][1])
+        print(f"    Found {len(results)} draws for {key}")
+        return results
+    
+    print(f"  Fetching {len(jobs)} year pages ({scheduler.workers} workers, {scheduler.rate:g} req/s per host)")
+    results, failed = scheduler.run(jobs, parse)
+    print(f"  {scheduler.report()}")
+    
+    history, errors = {}, {}
+    for game_id in games:
+        # Year pages newest first, as the serial scraper read them
+        keys = [key for key, _, _ in jobs if pages[key][0] == game_id]
+        all_results = [r for key in keys for r in results.get(key, [])]
+        history[game_id] = filter_history(all_results, cutoffs[game_id])
+        errors[game_id] = [f"{key}: {failed[key]}" for key in keys if key in failed]
+    return history, errors
+
+
+def scrape_game_history(game_slug: str, numbers_count: int, months_back: int = 6,
+                        since: Optional[str] = None) -> List[Dict]:
+    """
+    Draws from the last `months_back` months, newest first. With `since`
+    (YYYY-MM-DD), every draw from that date on instead, however long ago
+    it was.
+    """
+    history, _ = scrape_games_history({game_slug: (game_slug, numbers_count)}, months_back,
+                                      {game_slug: since} if since else None,
+                                      FetchScheduler(checkpoint=None, headers=HEADERS))
+    return history[game_slug]
@@ -0,0 +1,343 @@
+import json
+import os
+import shutil
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import index as api_index
+from api.columnar import ColumnarDraws
+from api.draw_index import date_to_ordinal
+from api.http_cache import IMMUTABLE, PENDING_TTL, cache_control
+from api.registry import GameRegistry
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+@pytest.fixture(scope="module")
+def history():
+    def load(game):
+        with open(os.path.join(DATA_DIR, f"florida_{game}.json")) as f:
+            return json.load(f)["draws"]
+    return {game: load(game) for game in ("pick-3", "fantasy-5", "powerball")}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    path = tmp_path / "data"
+    shutil.copytree(DATA_DIR, path)
+    return str(path)
+
+
+@pytest.fixture
+def client(data_dir, monkeypatch):
+    monkeypatch.setattr(api_index, "REGISTRY", GameRegistry(data_dir))
+    return TestClient(api_index.app)
+
+
+# --- Historical lookups (DrawIndex) ---
+
+@pytest.mark.parametrize("date", ["2026-02-18", "2024-02-29", "2021-01-18", "2023-07-04"])
+def test_date_lookup_matches_linear_scan(client, history, date):
+    expected = [d for d in history["pick-3"] if d["date"] == date]
+    body = client.get(f"/api/florida/pick-3?date={date}").json()
+    assert body["date_drawn"] == date
+    assert body["winning_numbers"] == expected[0]["numbers"]
+    assert body["all_draws_on_date"] == expected
+
+    evening = client.get(f"/api/florida/pick-3?date={date}&draw_time=evening").json()
+    assert evening["winning_numbers"] == next(d["numbers"] for d in expected if d["draw_time"] == "evening")
+    assert "all_draws_on_date" not in evening
+
+
+def test_missing_date_reports_neighbours(client, history):
+    # Powerball draws three days a week; 2025-01-02 is a Thursday
+    dates = sorted({d["date"] for d in history["powerball"]})
+    response = client.get("/api/florida/powerball?date=2025-01-02")
+    assert response.status_code == 404
+    detail = response.json()["detail"]
+    assert detail["previous_date"] == max(d for d in dates if d < "2025-01-02")
+    assert detail["next_date"] == min(d for d in dates if d > "2025-01-02")
+    target = date_to_ordinal("2025-01-02")
+    nearest = sorted(dates, key=lambda d: abs(date_to_ordinal(d) - target))
+    assert set(detail["closest_dates"]) == set(nearest[:5])
+    assert detail["closest_dates"] == sorted(detail["closest_dates"], reverse=True)
+
+
+def test_latest_and_unknown_game(client, history):
+    body = client.get("/api/florida/fantasy-5").json()
+    assert body["date_requested"] == "latest"
+    assert body["winning_numbers"] == history["fantasy-5"][0]["numbers"]
+    assert client.get("/api/florida/no-such-game").status_code == 404
+    assert client.get("/api/florida/pick-3?date=2024-13-01").status_code == 404
+    assert client.get("/api/florida/pick-3?date=24-01-01").status_code == 422
+
+
+# --- Lazy loading ---
+
+def test_games_load_on_first_request(client):
+    registry = api_index.REGISTRY
+    assert registry.loaded_ids() == []
+    listed = client.get("/api/games").json()["games"]
+    assert {g["id"] for g in listed} == set(registry.game_ids())
+    assert registry.loaded_ids() == []
+
+    client.get("/api/florida/pick-3")
+    assert registry.loaded_ids() == ["pick-3"]
+    assert client.get("/api/health").json()["games_in_memory"] == ["pick-3"]
+    # Served from the mmap'd columnar copy, not the JSON
+    assert isinstance(registry.get("pick-3").draws, ColumnarDraws)
+
+
+# --- HTTP caching ---
+
+def test_etag_revalidation(client):
+    first = client.get("/api/florida/pick-3?date=2025-06-01")
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    again = client.get("/api/florida/pick-3?date=2025-06-01", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+    other = client.get("/api/florida/pick-3?date=2025-06-02", headers={"If-None-Match": etag})
+    assert other.status_code == 200 and other.headers["etag"] != etag
+    assert client.get("/api/florida/pick-3?date=2025-06-01", headers={"If-None-Match": "*"}).status_code == 304
+
+
+def test_past_dates_are_immutable(client):
+    assert client.get("/api/florida/pick-3?date=2025-06-01").headers["cache-control"] == IMMUTABLE
+    ranged = client.get("/api/florida/pick-3/draws?from=2025-06-01&to=2025-06-30")
+    assert ranged.headers["cache-control"] == IMMUTABLE
+    # A miss may still be filled in later
+    missing = client.get("/api/florida/powerball?date=2025-01-02")
+    assert missing.status_code == 404 and missing.headers["cache-control"] != IMMUTABLE
+    assert client.get("/api/florida/pick-3").headers["cache-control"] != IMMUTABLE
+
+
+def test_latest_ttl_runs_to_next_draw(client):
+    game = api_index.REGISTRY.get("pick-3")
+    assert game.draws[0]["date"] == "2026-02-18"
+    # Noon Eastern the next day: both 2026-02-18 draws are in, midday is at 13:30
+    now = datetime(2026, 2, 19, 17, 0, tzinfo=timezone.utc)
+    assert cache_control(game, now=now) == "public, max-age=3600, s-maxage=5400, stale-while-revalidate=60"
+    soon = datetime(2026, 2, 19, 18, 20, tzinfo=timezone.utc)
+    assert cache_control(game, now=soon) == "public, max-age=600, s-maxage=600, stale-while-revalidate=60"
+    # The midday draw is past but not in the data yet
+    late = datetime(2026, 2, 19, 19, 0, tzinfo=timezone.utc)
+    assert cache_control(game, now=late) == f"public, max-age={PENDING_TTL}, s-maxage={PENDING_TTL}, stale-while-revalidate=60"
+    assert cache_control(game, "2026-02-18", now=now) == cache_control(game, now=now)
+
+
+# --- Range queries ---
+
+def walk(client, url, limit):
+    draws, cursor, pages = [], None, 0
+    while True:
+        body = client.get(url + f"&limit={limit}" + (f"&cursor={cursor}" if cursor else "")).json()
+        assert body["count"] == len(body["draws"]) <= limit
+        draws += body["draws"]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return draws, pages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7])
+def test_cursor_pages_cover_the_range(client, history, limit):
+    # Every date has a midday and an evening draw: odd limits split them across pages
+    expected = [d for d in history["pick-3"] if "2025-03-01" <= d["date"] <= "2025-03-10"]
+    assert len(expected) == 20
+    draws, pages = walk(client, "/api/florida/pick-3/draws?from=2025-03-01&to=2025-03-10", limit)
+    assert draws == expected
+    assert pages == -(-len(expected) // limit)
+
+
+def test_cursor_pages_with_draw_time(client, history):
+    expected = [d for d in history["pick-3"]
+                if "2025-03-01" <= d["date"] <= "2025-03-10" and d["draw_time"] == "evening"]
+    draws, _ = walk(client, "/api/florida/pick-3/draws?from=2025-03-01&to=2025-03-10&draw_time=evening", 3)
+    assert draws == expected
+
+
+def test_range_without_bounds_and_bad_cursor(client, history):
+    body = client.get("/api/florida/fantasy-5/draws?limit=5000").json()
+    assert body["draws"] == history["fantasy-5"][:5000]
+    assert client.get("/api/florida/pick-3/draws?cursor=!!").status_code == 400
+    assert client.get("/api/florida/pick-3/draws?from=2025-02-30").status_code == 400
+
+
+# --- Frequency statistics ---
+
+def naive_stats(draws, main, field, last=None, date_from=None, date_to=None, draw_time=None):
+    window = [d for d in draws
+              if (not date_from or d["date"] >= date_from) and (not date_to or d["date"] <= date_to)
+              and (not draw_time or d.get("draw_time", "evening") == draw_time)]
+    # Newest first by draw time: files list a date's midday draw before its evening one
+    window.sort(key=lambda d: (d["date"], d.get("draw_time", "evening") == "evening"), reverse=True)
+    if last is not None:
+        window = window[:last]
+    numbers = Counter(n for d in window for n in map(int, d["numbers"][:main]))
+    positions = [Counter(int(d["numbers"][p]) for d in window) for p in range(main)]
+    if field:
+        specials = Counter(int(d[field]) for d in window if d.get(field) is not None)
+    else:
+        specials = Counter(int(d["numbers"][main]) for d in window if len(d["numbers"]) > main)
+    return window, numbers, positions, specials
+
+
+def nonzero(counts):
+    return {int(k): v for k, v in counts.items() if v}
+
+
+@pytest.mark.parametrize("game,main,field,special", [
+    ("pick-3", 3, "fireball", "fireball"),
+    ("powerball", 5, None, "powerball"),
+    ("fantasy-5", 5, None, None),
+])
+@pytest.mark.parametrize("query", [
+    {"last": 1}, {"last": 37}, {"last": 100000},
+    {"from": "2023-01-01", "to": "2023-12-31"},
+    {"from": "2024-02-29", "to": "2024-02-29"},
+    {"to": "2022-06-30", "last": 10},
+    {"from": "2025-01-01", "draw_time": "midday"},
+    {"last": 15, "draw_time": "evening"},
+])
+def test_stats_match_naive_count(client, history, game, main, field, special, query):
+    url = f"/api/florida/{game}/stats?" + "&".join(f"{k}={v}" for k, v in query.items())
+    body = client.get(url).json()
+    window, numbers, positions, specials = naive_stats(
+        history[game], main, field, query.get("last"), query.get("from"), query.get("to"), query.get("draw_time"))
+
+    assert body["draws_counted"] == len(window)
+    assert body["last_date"] == (window[0]["date"] if window else None)
+    assert body["first_date"] == (window[-1]["date"] if window else None)
+    assert nonzero(body["numbers"]) == dict(numbers)
+    assert [nonzero(p) for p in body["positions"]] == [dict(c) for c in positions]
+    if special:
+        assert nonzero(body[special]) == dict(specials)
+    ranked = sorted(body["numbers"], key=lambda v: (-body["numbers"][v], int(v)))
+    assert body["hot"] == ranked[:5]
+
+
+# --- Combination search ---
+
+def contains(draw, wanted, main):
+    have = Counter(int(n) for n in draw["numbers"][:main])
+    return all(have[n] >= k for n, k in Counter(wanted).items())
+
+
+@pytest.mark.parametrize("game,main,numbers", [
+    ("pick-3", 3, [7]),
+    ("pick-3", 3, [7, 7]),
+    ("pick-3", 3, [0, 0, 0]),
+    ("pick-3", 3, [1, 7, 1]),
+    ("pick-3", 3, [3, 3, 2]),
+    ("fantasy-5", 5, [3, 11]),
+    ("fantasy-5", 5, [3, 11, 19]),
+])
+def test_search_matches_naive_scan(client, history, game, main, numbers):
+    draws = history[game]
+    body = client.get(f"/api/florida/{game}/search?numbers={','.join(map(str, numbers))}&limit=1000").json()
+    containing = [d for d in draws if contains(d, numbers, main)]
+    assert body["draws_containing"] == len(containing)
+    assert body["draws"] == containing[:1000]
+    if len(numbers) == main:
+        exact = [d for d in draws if sorted(map(int, d["numbers"][:main])) == sorted(numbers)]
+        assert body["ever_drawn"] == bool(exact)
+        assert body["exact_matches"] == exact
+    else:
+        assert "ever_drawn" not in body
+
+
+def test_search_with_special(client, history):
+    draws = history["pick-3"]
+    body = client.get("/api/florida/pick-3/search?numbers=3,3&special=0").json()
+    expected = [d for d in draws if contains(d, [3, 3], 3) and d.get("fireball") == "0"]
+    assert expected and body["draws"] == expected[:50]
+    assert client.get("/api/florida/pick-3/search?numbers=1,2,3,4").status_code == 400
+
+
+# --- Bulk lookup ---
+
+def test_bulk_lookup_matches_single_lookups(client):
+    items = [
+        {"game": "pick-3", "date": "2025-06-01", "draw_time": "evening"},
+        {"game": "Powerball", "date": "2025-01-01"},
+        {"game": "powerball", "date": "2025-01-02"},
+        {"game": "fantasy-5"},
+        {"game": "no-such-game", "date": "2025-01-01"},
+    ]
+    body = client.post("/api/florida/lookup", json={"items": items}).json()
+    assert body["count"] == len(items)
+    results = body["results"]
+
+    for i in (0, 1, 3):
+        query = "&".join(f"{k}={v}" for k, v in items[i].items() if k != "game")
+        single = client.get(f"/api/florida/{items[i]['game'].lower()}?{query}").json()
+        assert results[i] == dict(single, status=200)
+
+    missing = client.get("/api/florida/powerball?date=2025-01-02").json()["detail"]
+    assert results[2] == dict(missing, game="powerball", date_requested="2025-01-02", status=404)
+    assert results[4]["status"] == 404 and results[4]["error"] == "Game not found: no-such-game"
+    # Only the games asked for were loaded
+    assert sorted(api_index.REGISTRY.loaded_ids()) == ["fantasy-5", "pick-3", "powerball"]
+
+
+def test_bulk_lookup_limits(client, monkeypatch):
+    monkeypatch.setattr(api_index, "MAX_LOOKUPS", 2)
+    items = [{"game": "pick-3"}] * 3
+    assert client.post("/api/florida/lookup", json={"items": items}).status_code == 413
+    assert client.post("/api/florida/lookup", json={"items": [{"game": "pick-3", "date": "1/1/25"}]}).status_code == 422
+
+
+# --- Hot reload ---
+
+def prepend_draw(data_dir, game, draw):
+    path = os.path.join(data_dir, f"florida_{game}.json")
+    with open(path) as f:
+        data = json.load(f)
+    data["draws"].insert(0, draw)
+    data["total_draws"] = len(data["draws"])
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def test_reload_swaps_loaded_game(client, data_dir):
+    registry = api_index.REGISTRY
+    before = client.get("/api/florida/pick-3")
+    client.get("/api/florida/pick-3/stats?last=1")
+    old = registry.get("pick-3")
+    old_latest = old.draws[0]
+
+    draw = {"date": "2026-02-19", "draw_time": "midday", "numbers": ["4", "4", "0"], "fireball": "6"}
+    prepend_draw(data_dir, "pick-3", draw)
+    assert registry.check_for_changes() == ["pick-3"]
+
+    # Requests still holding the old game see it unchanged
+    assert old.draws[0] == old_latest and len(old.index) == len(registry.get("pick-3").index) - 1
+    after = client.get("/api/florida/pick-3", headers={"If-None-Match": before.headers["etag"]})
+    assert after.status_code == 200
+    assert after.json()["winning_numbers"] == ["4", "4", "0"]
+    assert after.headers["etag"] != before.headers["etag"]
+    # Derived structures were carried over to the new version
+    stats = client.get("/api/florida/pick-3/stats?last=1").json()
+    assert stats["last_date"] == "2026-02-19" and nonzero(stats["numbers"]) == {4: 2, 0: 1}
+    assert api_index.REGISTRY.reload_status["reloads"] == 1
+
+
+def test_reload_of_unloaded_game_and_unchanged_content(client, data_dir):
+    registry = api_index.REGISTRY
+    prepend_draw(data_dir, "powerball", {"date": "2026-02-21", "draw_time": "evening",
+                                         "numbers": ["1", "2", "3", "4", "5", "6"]})
+    assert registry.check_for_changes() == ["powerball"]
+    assert "powerball" not in registry.loaded_ids()
+    assert registry.meta("powerball")["total_draws"] == 2023
+    # The .lotc is now stale, so the first load reads the new JSON
+    assert client.get("/api/florida/powerball").json()["date_drawn"] == "2026-02-21"
+
+    # Touched without a content change: nothing to reload
+    path = os.path.join(data_dir, "florida_powerball.json")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert registry.check_for_changes() == []
@@ -0,0 +1,154 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+import scraper
+import scraper_async
+from scraper import BudgetExceededError, CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture
+def breakers(monkeypatch):
+    monkeypatch.setattr(scraper, "_BREAKERS", {})
+    monkeypatch.setattr(scraper, "BREAKER_MIN_CALLS", 5)
+    monkeypatch.setattr(scraper, "BREAKER_FAILURE_RATE", 0.5)
+    monkeypatch.setattr(scraper, "BREAKER_SLOW_CALL", 1.0)
+    monkeypatch.setattr(scraper, "BREAKER_COOLDOWN", 0.1)
+    return scraper._BREAKERS
+
+
+def trip(breaker):
+    for _ in range(scraper.BREAKER_MIN_CALLS):
+        breaker.check()
+        breaker.record(False, 0.01)
+
+
+def test_opens_after_failure_threshold(breakers):
+    breaker = CircuitBreaker("example.com")
+    for _ in range(scraper.BREAKER_MIN_CALLS - 1):
+        breaker.check()
+        breaker.record(False, 0.01)
+    # Too few calls to judge yet
+    assert breaker.state == "closed"
+    breaker.check()
+    breaker.record(False, 0.01)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    assert breaker.snapshot()["rejected"] == 1
+    assert breaker.snapshot()["opened"] == 1
+
+
+def test_stays_closed_below_failure_rate(breakers):
+    breaker = CircuitBreaker("example.com")
+    for ok in (True, False, True, False, True, True):
+        breaker.check()
+        breaker.record(ok, 0.01)
+    assert breaker.state == "closed"
+
+
+def test_slow_calls_count_as_failures(breakers):
+    breaker = CircuitBreaker("example.com")
+    for _ in range(scraper.BREAKER_MIN_CALLS):
+        breaker.check()
+        breaker.record(True, scraper.BREAKER_SLOW_CALL)
+    assert breaker.state == "open"
+    assert breaker.snapshot()["slow"] == scraper.BREAKER_MIN_CALLS
+
+
+def test_half_open_probe_closes_on_success(breakers):
+    breaker = CircuitBreaker("example.com")
+    trip(breaker)
+    time.sleep(scraper.BREAKER_COOLDOWN)
+    breaker.check()
+    assert breaker.state == "half_open"
+    # Only one probe goes out at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.record(True, 0.01)
+    assert breaker.state == "closed"
+    breaker.check()
+
+
+def test_half_open_probe_reopens_on_failure(breakers):
+    breaker = CircuitBreaker("example.com")
+    trip(breaker)
+    time.sleep(scraper.BREAKER_COOLDOWN)
+    breaker.check()
+    breaker.record(False, 0.01)
+    assert breaker.state == "open"
+    assert breaker.snapshot()["opened"] == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_released_probe_lets_the_next_call_probe(breakers):
+    breaker = CircuitBreaker("example.com")
+    assert breaker.check() is False
+    trip(breaker)
+    time.sleep(scraper.BREAKER_COOLDOWN)
+    assert breaker.check() is True
+    breaker.release()
+    assert breaker.check() is True
+    assert breaker.state == "half_open"
+
+
+def test_cancelled_call_keeps_another_calls_probe(site, breakers):
+    def slow(headers):
+        time.sleep(1)
+        return 200, {}, "late"
+
+    site.routes["/slow"] = slow
+    breaker = scraper.breaker_for("127.0.0.1")
+
+    async def main():
+        # Goes out while the breaker is closed, so it is not the probe
+        call = asyncio.create_task(scraper_async.fetch(site.url("/slow")))
+        await asyncio.sleep(0.2)
+        trip(breaker)
+        await asyncio.sleep(scraper.BREAKER_COOLDOWN)
+        assert breaker.check() is True
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        await scraper_async.aclose()
+
+    asyncio.run(main())
+    # The probe taken above is still out
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_fetch_stops_calling_a_failing_host(site, breakers):
+    site.routes["/latest"] = lambda headers: (503, {}, "unavailable")
+    for _ in range(scraper.BREAKER_MIN_CALLS):
+        assert scraper.fetch(site.url("/latest")).status_code == 503
+    with pytest.raises(CircuitOpenError):
+        scraper.fetch(site.url("/latest"))
+    assert len(site.requests) == scraper.BREAKER_MIN_CALLS
+
+
+def test_budget_cuts_a_slow_upstream_short(site, breakers):
+    def slow(headers):
+        time.sleep(2)
+        return 200, {}, "late"
+
+    site.routes["/slow"] = slow
+    deadline = scraper.deadline_for(0.3)
+    start = time.monotonic()
+    with pytest.raises(requests.Timeout):
+        scraper.fetch(site.url("/slow"), timeout=10, deadline=deadline)
+    assert time.monotonic() - start < 1.5
+    # Nothing left of the budget: the next call is refused before it goes out
+    time.sleep(max(0, deadline - time.monotonic()))
+    with pytest.raises(BudgetExceededError):
+        scraper.fetch(site.url("/slow"), timeout=10, deadline=deadline)
+    assert len(site.requests) == 1
+
+
+def test_budget_timeout_never_exceeds_the_call_timeout():
+    assert scraper.budget_timeout(5, None) == 5
+    assert scraper.budget_timeout(5, time.monotonic() + 60) == 5
+    assert scraper.budget_timeout(5, time.monotonic() + 1) <= 1
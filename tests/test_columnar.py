@@ -0,0 +1,110 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from api import columnar
+from api.registry import GameRegistry, write_manifest
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+GAME_FILES = sorted(f for f in os.listdir(DATA_DIR) if f.startswith("florida_") and f.endswith(".json"))
+
+
+def write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def sample():
+    # Fireball is missing from the oldest draw, as in histories predating it
+    return {
+        "game": "pick-3", "game_name": "Pick 3", "numbers_count": 3, "total_draws": 4,
+        "draws": [
+            {"date": "2024-03-02", "draw_time": "evening", "numbers": ["0", "0", "9"], "fireball": "0"},
+            {"date": "2024-03-02", "draw_time": "midday", "numbers": ["4", "1", "7"], "fireball": "5"},
+            {"date": "2024-03-01", "draw_time": "evening", "numbers": ["9", "9", "9"], "fireball": "9"},
+            {"date": "2019-12-31", "draw_time": "midday", "numbers": ["1", "2", "3"]},
+        ],
+    }
+
+
+@pytest.mark.parametrize("filename", GAME_FILES)
+def test_round_trip_matches_json(tmp_path, filename):
+    json_path = str(tmp_path / filename)
+    shutil.copy(os.path.join(DATA_DIR, filename), json_path)
+    with open(json_path) as f:
+        data = json.load(f)
+    columnar.write(json_path, data)
+
+    loaded = columnar.load(columnar.columnar_path(json_path))
+    assert list(loaded["draws"]) == data["draws"]
+    assert {k: v for k, v in loaded.items() if k != "draws"} == {k: v for k, v in data.items() if k != "draws"}
+
+
+def test_missing_extras_and_views(tmp_path):
+    json_path = str(tmp_path / "florida_pick-3.json")
+    data = sample()
+    write_json(json_path, data)
+    columnar.write(json_path, data)
+
+    draws = columnar.load(columnar.columnar_path(json_path))["draws"]
+    assert draws.meta["extras"] == ["fireball"]
+    assert draws[-1] == data["draws"][-1] and "fireball" not in draws[-1]
+    assert draws[1:3] == data["draws"][1:3]
+    assert draws.numbers(0) == [0, 0, 9]
+    assert list(draws.ordinals) == sorted(draws.ordinals, reverse=True)
+    with pytest.raises(IndexError):
+        draws[len(data["draws"])]
+
+
+def test_unencodable_ball_is_rejected(tmp_path):
+    data = sample()
+    data["draws"][0]["numbers"] = ["07", "1", "2"]
+    with pytest.raises(columnar.ColumnarFormatError):
+        columnar.encode(data)
+
+
+def test_source_matches(tmp_path, monkeypatch):
+    json_path = str(tmp_path / "florida_pick-3.json")
+    data = sample()
+    write_json(json_path, data)
+    columnar.write(json_path, data)
+    source = columnar.load(columnar.columnar_path(json_path))["draws"].meta["source"]
+    assert source == dict(columnar.source_signature(json_path))
+
+    # Unchanged size and mtime: no hashing at all
+    with monkeypatch.context() as m:
+        m.setattr(columnar, "_file_sha1", lambda path: pytest.fail("hashed an unchanged file"))
+        assert columnar.source_matches(source, json_path)
+
+    # Same bytes under a new mtime (a fresh checkout) still match, via the hash
+    st = os.stat(json_path)
+    os.utime(json_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert columnar.source_matches(source, json_path)
+
+    # Same size, different bytes
+    with open(json_path, "rb") as f:
+        content = f.read()
+    with open(json_path, "wb") as f:
+        f.write(content.replace(b'"9"', b'"8"', 1))
+    os.utime(json_path, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10 ** 9))
+    assert os.path.getsize(json_path) == source["size"]
+    assert not columnar.source_matches(source, json_path)
+    assert not columnar.source_matches(None, json_path)
+
+
+def test_registry_ignores_stale_columnar(tmp_path):
+    json_path = str(tmp_path / "florida_pick-3.json")
+    data = sample()
+    write_json(json_path, data)
+    columnar.write(json_path, data)
+    write_manifest(str(tmp_path))
+    assert isinstance(GameRegistry(str(tmp_path)).get("pick-3").draws, columnar.ColumnarDraws)
+
+    # The JSON changes without the .lotc being rebuilt: the registry reads the JSON
+    data["draws"].insert(0, {"date": "2024-03-03", "draw_time": "midday", "numbers": ["5", "5", "5"]})
+    write_json(json_path, data)
+    game = GameRegistry(str(tmp_path)).get("pick-3")
+    assert not isinstance(game.draws, columnar.ColumnarDraws)
+    assert game.draws[0]["date"] == "2024-03-03"
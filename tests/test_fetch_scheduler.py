@@ -0,0 +1,103 @@
+import argparse
+import json
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from scripts.fetch_scheduler import CURRENT_YEAR_TTL, Checkpoint, FetchScheduler, TokenBucket
+from scripts.generate_history import positive_float
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=50, burst=2)
+    start = time.monotonic()
+    stamps = []
+    for _ in range(7):
+        bucket.acquire()
+        stamps.append(time.monotonic() - start)
+    assert stamps[1] < 0.01
+    # Five tokens beyond the burst at 50/s
+    assert stamps[-1] >= 5 / 50 * 0.9
+    assert stamps[-1] < 1.0
+    assert bucket.waited > 0
+
+
+def test_token_bucket_is_shared_between_threads():
+    bucket = TokenBucket(rate=40, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(3)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 11 / 40 * 0.9
+
+
+def test_non_positive_rate_is_rejected():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, burst=1)
+    with pytest.raises(ValueError):
+        FetchScheduler(rate=0, checkpoint=None)
+    with pytest.raises(argparse.ArgumentTypeError):
+        positive_float("0")
+    with pytest.raises(argparse.ArgumentTypeError):
+        positive_float("-2")
+    assert positive_float("0.5") == 0.5
+
+
+def upper(key, text):
+    return text.upper()
+
+
+def test_resume_from_partial_checkpoint(site, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    site.routes["/game/2024"] = lambda headers: (200, {}, "page 2024")
+    site.routes["/game/2023"] = lambda headers: (404, {}, "gone")
+    jobs = [(f"game/{year}", site.url(f"/game/{year}"), year) for year in (2024, 2023)]
+
+    first = FetchScheduler(workers=2, rate=100, burst=10, retries=0, checkpoint=checkpoint)
+    results, errors = first.run(jobs, upper)
+    assert results == {"game/2024": "PAGE 2024"}
+    assert list(errors) == ["game/2023"]
+
+    site.routes["/game/2023"] = lambda headers: (200, {}, "page 2023")
+    site.requests.clear()
+    second = FetchScheduler(workers=2, rate=100, burst=10, retries=0, checkpoint=checkpoint)
+    results, errors = second.run(jobs, upper)
+    assert results == {"game/2024": "PAGE 2024", "game/2023": "PAGE 2023"}
+    assert errors == {}
+    assert site.paths() == ["/game/2023"]
+    assert second.stats["resumed"] == 1
+    assert second.stats["done"] == 1
+
+
+def test_checkpoint_refetches_expired_current_year(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    year = datetime.now().year
+    old = time.time() - CURRENT_YEAR_TTL - 1
+    with open(path, "w") as f:
+        f.write(json.dumps({"key": "past", "fetched_at": old, "result": [1]}) + "\n")
+        f.write(json.dumps({"key": "current", "fetched_at": old, "result": [2]}) + "\n")
+        f.write('{"key": "torn", "fetch')
+    checkpoint = Checkpoint(str(path))
+    assert checkpoint.get("past", year - 1) == [1]
+    assert checkpoint.get("current", year) is None
+    assert checkpoint.get("torn") is None
+
+
+def test_empty_results_are_not_checkpointed(site, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    site.routes["/game/2024"] = lambda headers: (200, {}, "")
+    jobs = [("game/2024", site.url("/game/2024"), 2024)]
+
+    first = FetchScheduler(workers=1, rate=100, burst=10, retries=0, checkpoint=checkpoint)
+    assert first.run(jobs, upper) == ({"game/2024": ""}, {})
+    assert first.stats["done"] == 1
+
+    site.routes["/game/2024"] = lambda headers: (200, {}, "page 2024")
+    second = FetchScheduler(workers=1, rate=100, burst=10, retries=0, checkpoint=checkpoint)
+    assert second.run(jobs, upper) == ({"game/2024": "PAGE 2024"}, {})
+    assert site.paths() == ["/game/2024", "/game/2024"]
+    assert second.stats["resumed"] == 0
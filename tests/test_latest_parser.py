@@ -0,0 +1,46 @@
+import glob
+import os
+
+import pytest
+
+import scraper
+from scripts.bench_latest_parser import FIXTURE_DIR, synthetic_page
+
+LIMITS = (2, 3, 4, 5, 6)
+
+# Markup the two parsers must agree on beyond well-formed pages
+EDGE_CASES = [
+    "<table><tr><td>1 2</td></tr><tr><td>10 20 30 40 50 60</td></tr></table>",
+    "<tr><td>Draw</td><ul><li>4</li><li>8</li><li>15</li></ul><td>16 23 42</td></tr>",
+    "<ul><li>Jan 5, 2024<ul><li>3</li><li>7</li></ul></li></ul><ul><li>1 2 3 4 5 6</li></ul>",
+    "<tr><script>var x = 123456789;</script><td>11 22</td></tr><tr><td>5 6 7 8 9 10</td></tr>",
+    "<table><tr><td>1 2 3<td>4 5 6</table><tr><td>7 8 9 10 11 12</td></tr>",
+    "<div><tr><td>12 34 56</div><p>78 90</p></tr>",
+    "<tr><td>1&nbsp;2&#51; 44 55 66 77</td></tr>",
+    "<ul><li>2024</li><li>123 456</li></ul><ul><li>9-8-7-6-5-4</li></ul>",
+    "<tr><td>1 2 3 4 5 6",
+    "<p>no rows 1 2 3 4 5 6</p>",
+]
+
+
+def pages():
+    cases = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html"))):
+        with open(path, "rb") as f:
+            cases.append(pytest.param(f.read(), id=os.path.basename(path)))
+    cases.append(pytest.param(synthetic_page().encode("utf-8"), id="synthetic"))
+    cases.append(pytest.param(synthetic_page(rows=5, nav_items=3000).encode("utf-8"), id="synthetic-late"))
+    cases.extend(pytest.param(html.encode("utf-8"), id=f"edge-{i}") for i, html in enumerate(EDGE_CASES))
+    return cases
+
+
+@pytest.mark.parametrize("limit", LIMITS)
+@pytest.mark.parametrize("content", pages())
+def test_stream_matches_soup(content, limit):
+    assert scraper.parse_latest_stream(content, limit) == scraper.parse_latest_soup(content, limit)
+
+
+def test_fixture_pages_yield_numbers():
+    for path in glob.glob(os.path.join(FIXTURE_DIR, "*.html")):
+        with open(path, "rb") as f:
+            assert scraper.parse_latest_stream(f.read(), 3), path
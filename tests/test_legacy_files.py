@@ -0,0 +1,129 @@
+import asyncio
+import threading
+from datetime import date
+
+import pytest
+
+import scraper
+import scraper_async
+
+# Newest draw first, as the scraper has always assumed of exptkt files
+EXPTKT = """<html><body><pre>
+PICK-3 WINNING NUMBERS
+
+02/18/26   E   3- 3- 2   FB 0
+02/18/26   M   7- 1- 6   FB 2
+02/17/26   E   1- 3- 1   FB 8
+02/17/26   M   7- 0- 7   FB 9
+</pre></body></html>
+"""
+ETAG = '"p3-v1"'
+LAST_MODIFIED = "Wed, 18 Feb 2026 23:30:00 GMT"
+
+
+def serve_exptkt(headers):
+    if headers.get("If-None-Match") == ETAG:
+        return 304, {"ETag": ETAG}, b""
+    return 200, {"ETag": ETAG, "Last-Modified": LAST_MODIFIED, "Content-Type": "text/html"}, EXPTKT
+
+
+@pytest.fixture
+def files(site, tmp_path, monkeypatch):
+    """A fresh FLORIDA_FILES that revalidates on every lookup, served by `site`."""
+    cache = scraper.LegacyFileCache(cache_dir=str(tmp_path), revalidate_after=0)
+    monkeypatch.setattr(scraper, "FLORIDA_FILES", cache)
+    monkeypatch.setattr(scraper, "_BREAKERS", {})
+    monkeypatch.setattr(scraper, "legacy_url", lambda code: site.url(f"/exptkt/{code}.html"))
+    site.routes["/exptkt/p3.html"] = serve_exptkt
+    return cache
+
+
+def test_download_builds_index(site, files):
+    index = scraper.florida_index("p3")
+    assert sorted(index) == ["2026-02-17", "2026-02-18"]
+    # Every number on the line is kept; the game's limit is applied on lookup
+    assert index["2026-02-18"][1] == {"draw_time": "midday", "numbers": ["7", "1", "6", "2"], "fireball": "2"}
+    assert files.stats["downloads"] == 1
+    _, headers = site.requests[0]
+    assert "If-None-Match" not in headers and "If-Modified-Since" not in headers
+
+
+def test_not_modified_reuses_index(site, files):
+    first = scraper.florida_index("p3")
+    second = scraper.florida_index("p3")
+    assert second is first
+    assert files.stats == {"hits": 0, "not_modified": 1, "downloads": 1, "stale_served": 0}
+    _, headers = site.requests[1]
+    assert headers["If-None-Match"] == ETAG
+    assert headers["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_index_and_validators_persist_on_disk(site, files, tmp_path):
+    scraper.florida_index("p3")
+    reopened = scraper.LegacyFileCache(cache_dir=str(tmp_path), revalidate_after=0)
+    assert reopened.peek("p3") == files.peek("p3")
+    assert reopened.conditional_headers("p3") == {"If-None-Match": ETAG, "If-Modified-Since": LAST_MODIFIED}
+
+
+def test_network_error_serves_stale_copy(site, files):
+    index = scraper.florida_index("p3")
+    site.stop()
+    assert scraper.florida_index("p3") == index
+    assert files.stats["stale_served"] == 1
+
+
+def test_network_error_without_copy_raises(site, files):
+    site.stop()
+    with pytest.raises(Exception):
+        scraper.florida_index("p3")
+    result = scraper.scrape_florida_legacy("p3", date(2026, 2, 18), 3)
+    assert result["error"].startswith("Legacy Error")
+
+
+def test_every_draw_on_a_date_is_returned(site, files):
+    result = scraper.scrape_florida_legacy("p3", date(2026, 2, 18), 3)
+    assert "error" not in result
+    assert result["winning_numbers"] == ["3", "3", "2"]
+    assert result["draws"] == [
+        {"draw_time": "evening", "winning_numbers": ["3", "3", "2"], "fireball": "0"},
+        {"draw_time": "midday", "winning_numbers": ["7", "1", "6"], "fireball": "2"},
+    ]
+
+
+def test_draw_order_does_not_depend_on_the_file():
+    midday_first = "02/18/26   M   7- 1- 6   FB 2\n02/18/26   E   3- 3- 2   FB 0\n"
+    for text in (EXPTKT, midday_first):
+        draws, _ = scraper.legacy_lookup(scraper.parse_florida_file(text), date(2026, 2, 18), 3)
+        assert [d["draw_time"] for d in draws] == ["evening", "midday"]
+
+
+def test_live_and_history_tiers_agree():
+    # data/florida_pick-3.json lists the midday draw of a date first
+    live, _ = scraper.legacy_lookup(scraper.parse_florida_file(EXPTKT), date(2026, 2, 18), 3)
+    local = scraper.history_result("florida", "p3", date(2026, 2, 18), 3)
+    assert local["draws"] == live
+    assert local["winning_numbers"] == live[0]["winning_numbers"] == ["3", "3", "2"]
+
+
+def test_missing_date_reports_error(site, files):
+    result = scraper.scrape_florida_legacy("p3", date(2026, 2, 1), 3)
+    assert result["error"] == "Date 02/01/26 not found in file."
+    assert result["winning_numbers"] == []
+
+
+def test_async_resolver_runs_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def resolve_local(*args):
+        threads.append(threading.get_ident())
+        return {"source": "stub", "tier": "memory", "winning_numbers": ["1", "2", "3"]}
+
+    monkeypatch.setattr(scraper_async, "resolve_local", resolve_local)
+
+    async def main():
+        data = await scraper_async.get_lotto_data("florida", "pick-3", "2026-02-18")
+        return data, threading.get_ident()
+
+    data, loop_thread = asyncio.run(main())
+    assert data["winning_numbers"] == ["1", "2", "3"]
+    assert threads and threads[0] != loop_thread
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from scripts.page_cache import PageTextCache  # noqa: E402
+
+ENTRY = "x" * 1000
+
+
+def cache_for(path, deferred=False):
+    cache = PageTextCache(cache_dir=str(path), max_mb=4500 / (1024 * 1024))
+    if deferred:
+        cache.defer_eviction()
+    return cache
+
+
+def on_disk(path):
+    return sorted(name[:-4] for _, _, names in os.walk(path) for name in names if name.endswith(".txt"))
+
+
+def test_bound_holds_in_one_process(tmp_path):
+    cache = cache_for(tmp_path)
+    for i in range(6):
+        cache.put(f"{i:02d}key", ENTRY)
+    assert on_disk(tmp_path) == ["02key", "03key", "04key", "05key"]
+    assert cache.stats["evictions"] == 2
+
+
+def test_deferred_writers_leave_eviction_to_the_parent(tmp_path):
+    # Two "workers" with their own views of the directory
+    workers = [cache_for(tmp_path, deferred=True) for _ in range(2)]
+    for i in range(8):
+        workers[i % 2].put(f"{i:02d}key", ENTRY)
+        os.utime(workers[i % 2]._path(f"{i:02d}key"), (i, i))
+    assert workers[0].get("00key") == ENTRY and workers[0].entries is None
+    assert len(on_disk(tmp_path)) == 8 and all(w.stats["evictions"] == 0 for w in workers)
+
+    parent = cache_for(tmp_path)
+    parent.enforce_bound()
+    # Least recently used first; the hit on 00key made it the newest
+    assert on_disk(tmp_path) == ["00key", "05key", "06key", "07key"]
+    assert parent.stats["evictions"] == 4
+    assert parent.snapshot()["entries"] == 4
@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+
+from scraper import SingleFlight
+
+CALLERS = 8
+
+
+def wait_for(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.005)
+
+
+def run_callers(flights, fn):
+    """CALLERS threads calling flights.do() on one key; returns their results or exceptions."""
+    outcomes = [None] * CALLERS
+
+    def call(i):
+        try:
+            outcomes[i] = flights.do(("latest", "fl", "pick-3"), fn)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def test_concurrent_callers_share_one_fetch():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"winning_numbers": ["1", "2", "3"]}
+
+    threads, outcomes = run_callers(flights, slow_fetch)
+    # Hold the fetch until every other caller is waiting on it
+    wait_for(lambda: flights.stats["coalesced"] == CALLERS - 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    assert outcomes[0] == {"winning_numbers": ["1", "2", "3"]}
+    assert flights.snapshot() == {"leaders": 1, "coalesced": CALLERS - 1, "in_flight": 0,
+                                  "by_source": {"latest": {"leaders": 1, "coalesced": CALLERS - 1}}}
+
+
+def test_error_reaches_every_waiter():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def failing_fetch():
+        calls.append(1)
+        release.wait(5)
+        raise ConnectionError("upstream down")
+
+    threads, outcomes = run_callers(flights, failing_fetch)
+    wait_for(lambda: flights.stats["coalesced"] == CALLERS - 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(isinstance(outcome, ConnectionError) for outcome in outcomes)
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+
+
+def test_next_call_after_completion_fetches_again():
+    flights = SingleFlight()
+    calls = []
+    for _ in range(2):
+        flights.do(("legacy", "p3"), lambda: calls.append(1))
+    assert len(calls) == 2
+    assert flights.snapshot()["in_flight"] == 0
+
+
+def test_async_callers_share_one_task():
+    flights = SingleFlight()
+    calls = []
+
+    async def slow_fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async(("national", "powerball"), slow_fetch)
+                                      for _ in range(CALLERS)))
+
+    assert asyncio.run(main()) == ["result"] * CALLERS
+    assert len(calls) == 1
+
+
+def test_async_error_reaches_every_waiter():
+    flights = SingleFlight()
+
+    async def failing_fetch():
+        await asyncio.sleep(0.01)
+        raise TimeoutError("slow upstream")
+
+    async def main():
+        return await asyncio.gather(*(flights.do_async(("national", "powerball"), failing_fetch)
+                                      for _ in range(CALLERS)), return_exceptions=True)
+
+    outcomes = asyncio.run(main())
+    assert all(isinstance(outcome, TimeoutError) for outcome in outcomes)
+    assert flights.snapshot()["in_flight"] == 0
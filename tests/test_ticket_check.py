@@ -0,0 +1,137 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from api.registry import GameRegistry
+from api.ticket_check import TicketError, check_tickets, draw_matrix, encode_balls, popcount
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return GameRegistry(DATA_DIR)
+
+
+def ticket(numbers, special=None, date=None, date_from=None, date_to=None, draw_time=None):
+    return SimpleNamespace(numbers=numbers, special=special, date=date, date_from=date_from,
+                           date_to=date_to, draw_time=draw_time)
+
+
+def naive(game, numbers, min_matches, date_from, date_to, draw_time=None):
+    """(date, draw_time, matched) for every covered draw, the slow way."""
+    rules = draw_matrix(game).rules
+    found = []
+    for draw in game.draws:
+        if not date_from <= draw["date"] <= date_to:
+            continue
+        if draw_time and draw.get("draw_time", "evening") != draw_time:
+            continue
+        drawn = [int(n) for n in draw["numbers"][:rules["main"]]]
+        if rules["ordered"]:
+            count = sum(a == b for a, b in zip(numbers, drawn))
+        else:
+            count = len(set(numbers) & set(drawn))
+        if count >= min_matches:
+            found.append((draw["date"], draw.get("draw_time", "evening"), count))
+    return found
+
+
+@pytest.mark.parametrize("game_id,numbers", [
+    ("fantasy-5", [3, 11, 19, 27, 36]),
+    ("powerball", [7, 14, 21, 35, 62]),
+    ("pick-3", [7, 7, 1]),
+    ("pick-5", [0, 1, 2, 3, 4]),
+])
+@pytest.mark.parametrize("min_matches", [0, 1, 2, 3])
+def test_bitset_matching_equals_naive_count(registry, game_id, numbers, min_matches):
+    game = registry.get(game_id)
+    result = check_tickets(game, [ticket(numbers, date_from="2021-01-01", date_to="2024-12-31")], min_matches)[0]
+    got = [(d["date"], d["draw_time"], d["matched"]) for d in result["draws"]]
+    assert got == naive(game, numbers, min_matches, "2021-01-01", "2024-12-31")
+    assert result["draws_checked"] == len(naive(game, numbers, 0, "2021-01-01", "2024-12-31"))
+
+
+def test_draw_time_filter(registry):
+    game = registry.get("pick-3")
+    result = check_tickets(game, [ticket([1, 2, 3], date_from="2025-01-01", date_to="2025-12-31",
+                                         draw_time="midday")], 1)[0]
+    got = [(d["date"], d["draw_time"], d["matched"]) for d in result["draws"]]
+    assert got == naive(game, [1, 2, 3], 1, "2025-01-01", "2025-12-31", "midday")
+    assert {d["draw_time"] for d in result["draws"]} == {"midday"}
+
+
+def test_at_least_counts_past_the_top_bit(registry):
+    matrix = draw_matrix(registry.get("fantasy-5"))
+    slot = 10
+    mask = matrix.masks[slot]
+    everything = matrix.all_slots
+    assert matrix.at_least(mask, 5, everything) >> slot & 1
+    for threshold in range(6):
+        bits = matrix.at_least(mask, threshold, everything)
+        expected = sum(1 << s for s, m in enumerate(matrix.masks) if popcount(m & mask) >= threshold)
+        assert bits == expected
+
+
+def test_entry_details(registry):
+    game = registry.get("pick-3")
+    draw = next(d for d in game.draws if d["fireball"] != d["numbers"][2])
+    digits = [int(n) for n in draw["numbers"]]
+    # The fireball standing in for the missed digit makes a straight
+    numbers = digits[:2] + [int(draw["fireball"])]
+    result = check_tickets(game, [ticket(numbers, date=draw["date"], draw_time=draw["draw_time"])])[0]
+    entry = next(d for d in result["draws"] if d["draw_time"] == draw["draw_time"])
+    assert entry["matched"] == 2
+    assert entry["matched_positions"] == [0, 1]
+    assert entry["fireball_hit"] is True
+
+
+def test_lotto_entry_lists_shared_numbers(registry):
+    game = registry.get("powerball")
+    draw = game.draws[0]
+    numbers = [int(n) for n in draw["numbers"][:2]] + [n for n in range(1, 70) if str(n) not in draw["numbers"]][:3]
+    entry = check_tickets(game, [ticket(numbers, special=int(draw["numbers"][5]))])[0]["draws"][0]
+    assert entry["matched_numbers"] == sorted(numbers[:2])
+    assert entry["powerball_hit"] is True
+
+
+@pytest.mark.parametrize("numbers,error", [
+    ([1, 2], "Expected 3 numbers"),
+    ([-1, 2, 3], "out of range"),
+    ([10, 2, 3], "out of range"),
+])
+def test_bad_digits_are_ticket_errors(registry, numbers, error):
+    result = check_tickets(registry.get("pick-3"), [ticket(numbers)])[0]
+    assert error in result["error"]
+
+
+def test_lotto_range_and_repeats(registry):
+    game = registry.get("fantasy-5")
+    results = check_tickets(game, [ticket([1, 2, 3, 4, 10 ** 8]), ticket([1, 1, 2, 3, 4]),
+                                   ticket([1, 2, 3, 4, 5], date="1990-01-01")])
+    assert "out of range" in results[0]["error"]
+    assert results[1]["error"] == "Numbers must not repeat"
+    assert results[2]["error"] == "No draw on 1990-01-01"
+
+
+def test_pair_limit(registry):
+    game = registry.get("fantasy-5")
+    with pytest.raises(TicketError):
+        check_tickets(game, [ticket([1, 2, 3, 4, 5], date_from="1990-01-01")] * 3, max_pairs=1000)
+
+
+def test_digit_groups_do_not_overlap():
+    # Only the shared 0 in the last position overlaps, not the 9s
+    assert encode_balls([9, 0, 0], True) & encode_balls([0, 9, 0], True) == 1 << 20
+    assert popcount(encode_balls([9, 9, 9], True) & encode_balls([9, 0, 9], True)) == 2
+
+
+def test_entry_budget_spans_tickets(registry):
+    game = registry.get("fantasy-5")
+    tickets = [ticket([3, 11, 19, 27, 36], date_from="2021-01-01", date_to="2024-12-31")] * 3
+    full = check_tickets(game, tickets, 0)[0]
+    capped = check_tickets(game, tickets, 0, max_draws=full["draws_checked"] + 5)
+    assert capped[0]["draws"] == full["draws"] and "truncated" not in capped[0]
+    assert len(capped[1]["draws"]) == 5 and capped[1]["truncated"]
+    assert capped[2]["draws"] == [] and capped[2]["draws_matched"] == full["draws_checked"]